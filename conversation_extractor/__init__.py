@@ -5,11 +5,23 @@ A module for extracting context around keywords in text conversations.
 """
 
 from .extractor import load_conversation, extract_context, print_results
-from .topic_extractor import extract_topics, print_topic_results, DEFAULT_TOPIC_CATEGORIES
-from .dynamic_keywords import generate_dynamic_keywords, KeywordTracker
+from .topic_extractor import (
+    extract_topics, extract_topics_batch, print_topic_results, TopicMatch, DEFAULT_TOPIC_CATEGORIES
+)
+from .categories import TopicCategorySet
+from .dynamic_keywords import (
+    generate_dynamic_keywords, KeywordGenerator, IncrementalKeywordModel, KeywordTracker
+)
+from .keyword_tracker import KeywordSnapshot
+from .sqlite_tracker import SQLiteKeywordTracker
+from .cache import TopicResultCache
 
 __all__ = [
     'load_conversation', 'extract_context', 'print_results',
-    'extract_topics', 'print_topic_results', 'DEFAULT_TOPIC_CATEGORIES',
-    'generate_dynamic_keywords', 'KeywordTracker'
+    'extract_topics', 'extract_topics_batch', 'print_topic_results', 'TopicMatch',
+    'DEFAULT_TOPIC_CATEGORIES',
+    'TopicCategorySet',
+    'generate_dynamic_keywords', 'KeywordGenerator', 'IncrementalKeywordModel', 'KeywordTracker',
+    'KeywordSnapshot', 'SQLiteKeywordTracker',
+    'TopicResultCache'
 ]
@@ -0,0 +1,198 @@
+"""
+Topic Result Cache Module
+
+Persist topic extraction results on disk, keyed by conversation content and configuration.
+"""
+import os
+import json
+import hashlib
+import tempfile
+from collections import defaultdict
+from .categories import TopicCategorySet
+from .topic_extractor import TopicMatch
+
+# Bump whenever the cached result layout or the extraction logic changes
+CACHE_VERSION = 2
+
+# Eviction frees space down to this fraction of max_bytes, so that the puts
+# that follow do not each have to scan the cache directory again
+LOW_WATER_MARK = 0.9
+
+
+def hash_text(text):
+    """
+    Compute the content hash of a conversation.
+
+    Args:
+        text: The conversation text
+
+    Returns:
+        Hex digest of the SHA-256 hash of the UTF-8 encoded text
+    """
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def hash_config(topic_categories, context_lines, enable_dynamic, threshold, generator_config=None):
+    """
+    Compute a hash of the extraction configuration.
+
+    Args:
+        topic_categories: TopicCategorySet or dictionary mapping topic categories to lists of keywords
+        context_lines: Number of context lines to include
+        enable_dynamic: Whether dynamic keyword generation is enabled
+        threshold: Importance threshold for dynamic keywords
+        generator_config: Optional dictionary of keyword generator settings
+
+    Returns:
+        Hex digest of the SHA-256 hash of the canonical configuration
+    """
+    config = {
+        'version': CACHE_VERSION,
+        'categories': TopicCategorySet.coerce(topic_categories).fingerprint,
+        'context_lines': context_lines,
+        'enable_dynamic': bool(enable_dynamic),
+        'threshold': float(threshold),
+        'generator': generator_config,
+    }
+    encoded = json.dumps(config, separators=(',', ':'), ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class TopicResultCache:
+    """Content-addressed, size-bounded on-disk cache for topic extraction results."""
+
+    def __init__(self, cache_dir, max_bytes=64 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory to store cached results in (created if missing)
+            max_bytes: Maximum total size of the cache; once it is exceeded, least
+                       recently used entries are evicted down to 90% of it
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._total_bytes = None  # Computed lazily from the directory contents
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def make_key(self, conversation_text, topic_categories, context_lines, enable_dynamic, threshold,
+                 generator_config=None):
+        """
+        Build the cache key for a conversation and extraction configuration.
+
+        Arguments are as for hash_config(), plus the conversation text.
+
+        Returns:
+            Cache key string
+        """
+        config_hash = hash_config(topic_categories, context_lines, enable_dynamic, threshold, generator_config)
+        return f"{hash_text(conversation_text)}-{config_hash[:16]}"
+
+    def get(self, key):
+        """
+        Look up cached topic results.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Topic results dictionary, or None on a cache miss
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # Mark the entry as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        topic_results = defaultdict(list)
+        for category, matches in data.items():
+            topic_results[category] = [TopicMatch(*match) for match in matches]
+        return topic_results
+
+    def put(self, key, topic_results):
+        """
+        Store topic results in the cache.
+
+        Args:
+            key: Cache key from make_key()
+            topic_results: Dictionary mapping topic categories to their extracted contexts
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = {category: [[match.keywords, match.line_number, match.matched_line, match.context]
+                           for match in matches]
+                for category, matches in topic_results.items()}
+
+        # Write to a temporary file first so readers never see a partial entry
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            # An overwritten entry no longer counts towards the total
+            replaced_size = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+        if self._total_bytes is not None:
+            self._total_bytes += os.path.getsize(path) - replaced_size
+        if self._get_total_bytes() > self.max_bytes:
+            self._evict()
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        for path, _, _ in self._entries():
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        self._total_bytes = 0
+
+    def _path(self, key):
+        """Get the file path for a cache key."""
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _entries(self):
+        """List cache entries as (path, last used time, size) tuples."""
+        entries = []
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith('.json'):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((entry.path, stat.st_mtime_ns, stat.st_size))
+        return entries
+
+    def _get_total_bytes(self):
+        """Get the total size of the cache, scanning the directory on first use."""
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, _, size in self._entries())
+        return self._total_bytes
+
+    def _evict(self):
+        """Evict least recently used entries until the cache is down to its low-water mark."""
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        target = self.max_bytes * LOW_WATER_MARK
+        for path, _, size in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+        self._total_bytes = total
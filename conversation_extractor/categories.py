@@ -0,0 +1,197 @@
+"""
+Topic Category Set Module
+
+Normalize, precompile and serialize topic category definitions.
+"""
+import re
+import json
+import hashlib
+
+# Identifies files written by TopicCategorySet.save()
+FORMAT_NAME = "topic-category-set"
+FORMAT_VERSION = 1
+
+
+def compile_keyword(keyword):
+    """
+    Compile the matcher used to find a keyword in a line of text.
+
+    Args:
+        keyword: The keyword to match
+
+    Returns:
+        Compiled case-insensitive, word-bounded regular expression
+    """
+    return re.compile(rf'\b{re.escape(keyword)}\b', re.IGNORECASE)
+
+
+class TopicCategorySet:
+    """Normalized topic categories with precomputed keyword lookups and matchers."""
+
+    def __init__(self, topic_categories):
+        """
+        Initialize the category set.
+
+        Keywords are deduplicated case-insensitively within each category (matching
+        is case-insensitive, so e.g. "Debug" and "debug" find the same lines) and
+        empty keywords are dropped. The first spelling of a keyword is kept.
+
+        Args:
+            topic_categories: Dictionary mapping topic categories to lists of keywords
+        """
+        self.categories = {}  # Maps categories to tuples of normalized keywords
+        keyword_categories = {}
+        for category, keywords in topic_categories.items():
+            seen = set()
+            normalized = []
+            for keyword in keywords:
+                key = keyword.lower()
+                if not keyword or key in seen:
+                    continue
+                seen.add(key)
+                normalized.append(keyword)
+                keyword_categories.setdefault(key, []).append(category)
+            self.categories[category] = tuple(normalized)
+
+        # Maps lowercased keywords to tuples of the categories they belong to
+        self.keyword_categories = {key: tuple(categories) for key, categories in keyword_categories.items()}
+
+        # All unique keywords, in first-seen order
+        self.keywords = tuple(self.keyword_categories)
+
+        self._patterns = None
+        self._combined_pattern = None
+        self._fingerprint = None
+
+    @classmethod
+    def coerce(cls, topic_categories):
+        """
+        Get a category set from a category set or a plain category dictionary.
+
+        Args:
+            topic_categories: TopicCategorySet or dictionary mapping categories to keywords
+
+        Returns:
+            TopicCategorySet instance
+        """
+        if isinstance(topic_categories, cls):
+            return topic_categories
+        return cls(topic_categories)
+
+    @property
+    def patterns(self):
+        """Dictionary mapping lowercased keywords to their compiled matchers."""
+        if self._patterns is None:
+            self._patterns = {key: compile_keyword(key) for key in self.keywords}
+        return self._patterns
+
+    @property
+    def combined_pattern(self):
+        """Compiled matcher that finds lines containing any keyword of the set."""
+        if self._combined_pattern is None:
+            body = '|'.join(rf'\b{re.escape(key)}\b' for key in self.keywords)
+            self._combined_pattern = re.compile(f'(?:{body})' if body else r'(?!)', re.IGNORECASE)
+        return self._combined_pattern
+
+    @property
+    def fingerprint(self):
+        """SHA-256 hex digest identifying the normalized category definitions."""
+        if self._fingerprint is None:
+            encoded = json.dumps(self._to_data(), separators=(',', ':'), ensure_ascii=False)
+            self._fingerprint = hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+        return self._fingerprint
+
+    def match_lines(self, lines):
+        """
+        Find the lines that contain each keyword of the set.
+
+        Args:
+            lines: List of lines to search
+
+        Returns:
+            Dictionary mapping lowercased keywords to lists of matching line indices
+        """
+        patterns = self.patterns
+        keyword_lines = {}
+
+        # Only lines containing at least one keyword need the per-keyword matchers
+        combined = self.combined_pattern
+        candidates = [(i, line) for i, line in enumerate(lines) if combined.search(line)]
+        for key in self.keywords:
+            pattern = patterns[key]
+            matches = [i for i, line in candidates if pattern.search(line)]
+            if matches:
+                keyword_lines[key] = matches
+        return keyword_lines
+
+    def to_dict(self):
+        """
+        Get the normalized categories as a plain dictionary.
+
+        Returns:
+            Dictionary mapping topic categories to lists of keywords
+        """
+        return {category: list(keywords) for category, keywords in self.categories.items()}
+
+    def save(self, file_path):
+        """
+        Save the category set to a compact JSON file.
+
+        Args:
+            file_path: Path of the file to write
+        """
+        data = {'format': FORMAT_NAME, 'version': FORMAT_VERSION, 'categories': self._to_data()}
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Load a category set saved with save().
+
+        Args:
+            file_path: Path of the file to read
+
+        Returns:
+            TopicCategorySet instance
+        """
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('format') != FORMAT_NAME or data.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported topic category file: {file_path}")
+        return cls(dict(data['categories']))
+
+    def _to_data(self):
+        """Get the categories as an ordered list of [category, keywords] pairs."""
+        return [[category, list(keywords)] for category, keywords in self.categories.items()]
+
+    def __getstate__(self):
+        # Compiled matchers are rebuilt lazily rather than pickled
+        state = self.__dict__.copy()
+        state['_patterns'] = None
+        state['_combined_pattern'] = None
+        return state
+
+    def __len__(self):
+        return len(self.categories)
+
+    def __iter__(self):
+        return iter(self.categories)
+
+    def __contains__(self, category):
+        return category in self.categories
+
+    def __getitem__(self, category):
+        return self.categories[category]
+
+    def items(self):
+        """Iterate over (category, keywords) pairs."""
+        return self.categories.items()
+
+    def __eq__(self, other):
+        if not isinstance(other, TopicCategorySet):
+            return NotImplemented
+        return self._to_data() == other._to_data()
+
+    def __repr__(self):
+        return f"TopicCategorySet({len(self.categories)} categories, {len(self.keywords)} keywords)"
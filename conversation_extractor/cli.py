@@ -3,7 +3,10 @@ Command-line interface for the conversation context extractor.
 """
 import os
 import argparse
-from .extractor import load_conversation, extract_context, print_results
+from .extractor import load_conversation, extract_context, print_results, find_conversation_files
+from .categories import TopicCategorySet
+from .cooccurrence import count_corpus_cooccurrences, DEFAULT_WINDOW_LINES
+from .corpus import DocumentFrequencyStore
 
 
 def main():
@@ -45,7 +48,8 @@ def main():
     if not conversation:
         return 1
     
-    print(f"Loaded conversation ({len(conversation)} characters, {len(conversation.split('\\n'))} lines)")
+    line_count = len(conversation.split('\n'))
+    print(f"Loaded conversation ({len(conversation)} characters, {line_count} lines)")
     print(f"Searching for keywords: {', '.join(keywords)}")
     print(f"Context lines: {args.context}")
     
@@ -56,5 +60,102 @@ def main():
     return 0
 
 
+def cooccurrence_main():
+    """Entry point for the corpus topic co-occurrence job."""
+    parser = argparse.ArgumentParser(
+        description="Count topic category and keyword co-occurrences across conversation files."
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        help="Conversation files or directories to search for *.txt files"
+    )
+    parser.add_argument(
+        "-o", "--output",
+        required=True,
+        help="Path of the compressed co-occurrence file to write"
+    )
+    parser.add_argument(
+        "--categories",
+        help="Topic category file saved with TopicCategorySet.save() (default: built-in categories)"
+    )
+    parser.add_argument(
+        "-w", "--window",
+        type=int,
+        default=DEFAULT_WINDOW_LINES,
+        help=f"Number of lines per co-occurrence window (default: {DEFAULT_WINDOW_LINES})"
+    )
+    parser.add_argument(
+        "-j", "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes (default: number of CPUs)"
+    )
+
+    args = parser.parse_args()
+
+    # Check that all inputs exist
+    missing = [path for path in args.paths if not os.path.exists(path)]
+    if missing:
+        print(f"Error: Path '{missing[0]}' not found.")
+        return 1
+
+    topic_categories = TopicCategorySet.load(args.categories) if args.categories else None
+
+    counts = count_corpus_cooccurrences(
+        find_conversation_files(args.paths),
+        topic_categories=topic_categories,
+        window_lines=args.window,
+        workers=args.workers
+    )
+    counts.save(args.output)
+
+    print(f"Counted co-occurrences in {counts.documents} conversations")
+    for (a, b), count in counts.most_common(5):
+        print(f"  {a} + {b}: {count} lines")
+    print(f"Results written to {args.output}")
+
+    return 0
+
+
+def document_frequency_main():
+    """Entry point for building a corpus document frequency store."""
+    parser = argparse.ArgumentParser(
+        description="Count word document frequencies across conversation files for TF-IDF/BM25 keyword scoring."
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        help="Conversation files or directories to search for *.txt files"
+    )
+    parser.add_argument(
+        "-o", "--output",
+        required=True,
+        help="Path of the document frequency file to write"
+    )
+    parser.add_argument(
+        "-j", "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes (default: number of CPUs)"
+    )
+
+    args = parser.parse_args()
+
+    # Check that all inputs exist
+    missing = [path for path in args.paths if not os.path.exists(path)]
+    if missing:
+        print(f"Error: Path '{missing[0]}' not found.")
+        return 1
+
+    store = DocumentFrequencyStore.build(find_conversation_files(args.paths), workers=args.workers)
+    store.save(args.output)
+
+    print(f"Counted {len(store)} words in {store.documents} conversations")
+    print(f"Results written to {args.output}")
+
+    return 0
+
+
 if __name__ == "__main__":
     exit(main())
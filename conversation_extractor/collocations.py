@@ -0,0 +1,173 @@
+"""
+Collocation Scoring Module
+
+Vectorized bigram and trigram collocation scoring over token ID streams (requires NumPy).
+"""
+from itertools import combinations
+import numpy as np
+
+# Supported association measures, named like nltk.metrics.NgramAssocMeasures
+MEASURES = ('pmi', 'likelihood_ratio', 'student_t')
+
+# Small constant guarding divisions and logarithms, as in NLTK
+_SMALL = 1e-20
+
+
+def _as_ids(ids):
+    """Get a token ID stream as a NumPy uint32 array without copying arrays."""
+    if isinstance(ids, np.ndarray):
+        return ids.astype(np.uint32, copy=False)
+    if len(ids) == 0:
+        return np.zeros(0, dtype=np.uint32)
+    return np.frombuffer(ids, dtype=np.uint32) if hasattr(ids, 'typecode') else np.asarray(ids, dtype=np.uint32)
+
+
+def _gapped_codes(ids, positions, size):
+    """Encode the tokens at the given offsets of every window as one integer per window."""
+    length = len(ids) - positions[-1]
+    codes = np.zeros(length, dtype=np.uint64)
+    for position in positions:
+        codes = codes * np.uint64(size) + ids[position:position + length].astype(np.uint64)
+    return codes
+
+
+def _count_ngrams(ids, order, size):
+    """Count the distinct n-grams of a stream, returning (ngrams array, counts)."""
+    if size ** order < 2 ** 64:
+        unique, counts = np.unique(_gapped_codes(ids, list(range(order)), size), return_counts=True)
+        ngrams = np.empty((len(unique), order), dtype=np.int64)
+        for position in reversed(range(order)):
+            ngrams[:, position] = (unique % np.uint64(size)).astype(np.int64)
+            unique = unique // np.uint64(size)
+        return ngrams, counts
+    # Codes would overflow, so compare the n-grams row by row
+    windows = np.stack([ids[i:len(ids) - order + 1 + i] for i in range(order)], axis=1)
+    ngrams, counts = np.unique(windows, axis=0, return_counts=True)
+    return ngrams.astype(np.int64), counts
+
+
+def _count_gapped_pairs(ids, ngrams, first, second, size):
+    """Count how often each n-gram's tokens at two positions occur at that distance."""
+    positions = [0, second - first]
+    unique, counts = np.unique(_gapped_codes(ids, positions, size), return_counts=True)
+    codes = ngrams[:, first].astype(np.uint64) * np.uint64(size) + ngrams[:, second].astype(np.uint64)
+    return counts[np.searchsorted(unique, codes)]
+
+
+def score_ngrams(ids, size, order=2, measure='pmi', min_count=1):
+    """
+    Score every bigram or trigram of a token ID stream.
+
+    The measures follow NLTK's BigramAssocMeasures and TrigramAssocMeasures, with
+    the stream length as the total count and unigram counts as the marginals.
+
+    Args:
+        ids: Token ID stream (array('I'), list or NumPy array)
+        size: Vocabulary size (one more than the largest ID)
+        order: N-gram length (2 or 3)
+        measure: Association measure: 'pmi', 'likelihood_ratio' or 'student_t'
+        min_count: Minimum number of occurrences of a scored n-gram
+
+    Returns:
+        Tuple of (n-gram ID array of shape (k, order), counts, scores)
+    """
+    if order not in (2, 3):
+        raise ValueError(f"Unsupported n-gram order {order}, expected 2 or 3")
+    if measure not in MEASURES:
+        raise ValueError(f"Unknown measure '{measure}', expected one of {MEASURES}")
+
+    ids = _as_ids(ids)
+    if len(ids) < order:
+        return np.zeros((0, order), dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+
+    ngrams, counts = _count_ngrams(ids, order, size)
+    frequent = counts >= min_count
+    ngrams, counts = ngrams[frequent], counts[frequent]
+
+    total = float(len(ids))
+    unigram_counts = np.bincount(ids, minlength=size)
+    unigrams = [unigram_counts[ngrams[:, position]].astype(np.float64) for position in range(order)]
+    ngram_counts = counts.astype(np.float64)
+    expected_count = np.prod(unigrams, axis=0) / total ** (order - 1)
+
+    if measure == 'pmi':
+        scores = np.log2(ngram_counts * total ** (order - 1)) - np.log2(np.prod(unigrams, axis=0))
+    elif measure == 'student_t':
+        scores = (ngram_counts - expected_count) / np.sqrt(ngram_counts + _SMALL)
+    else:
+        scores = _likelihood_ratio(ids, ngrams, ngram_counts, unigrams, total, size)
+    return ngrams, counts, scores
+
+
+def _likelihood_ratio(ids, ngrams, ngram_counts, unigrams, total, size):
+    """Score n-grams by Dunning's likelihood ratio over their full contingency tables."""
+    order = ngrams.shape[1]
+
+    # Counts of the n-gram's tokens at every subset of its positions
+    subset_counts = {(): np.full(len(ngrams), total), tuple(range(order)): ngram_counts}
+    for position in range(order):
+        subset_counts[(position,)] = unigrams[position]
+    for first, second in combinations(range(order), 2):
+        if (first, second) not in subset_counts:
+            subset_counts[(first, second)] = _count_gapped_pairs(ids, ngrams, first, second, size).astype(np.float64)
+
+    scores = np.zeros(len(ngrams))
+    for cell in range(2 ** order):
+        # Bit j of the cell is clear when token j is present, as in NLTK's contingency tables
+        present = tuple(j for j in range(order) if not cell & (1 << j))
+        observed = np.zeros(len(ngrams))
+        for subset, subset_count in subset_counts.items():
+            if set(present) <= set(subset):
+                observed += (-1) ** (len(subset) - len(present)) * subset_count
+        expected = np.prod([unigrams[j] if not cell & (1 << j) else total - unigrams[j]
+                            for j in range(order)], axis=0) / total ** (order - 1)
+        positive = observed > 0
+        scores[positive] += observed[positive] * np.log(observed[positive] / (expected[positive] + _SMALL) + _SMALL)
+    return 2 * scores
+
+
+def lexical_ranks(tokens):
+    """
+    Get the rank of each token in sorted order, for breaking score ties like NLTK.
+
+    Args:
+        tokens: List of tokens indexed by ID
+
+    Returns:
+        NumPy array mapping IDs to ranks
+    """
+    ranks = np.empty(len(tokens), dtype=np.int64)
+    ranks[sorted(range(len(tokens)), key=tokens.__getitem__)] = np.arange(len(tokens))
+    return ranks
+
+
+def nbest_ngrams(ids, size, n, order=2, measure='pmi', min_count=1, ranks=None):
+    """
+    Get the n best scoring bigrams or trigrams of a token ID stream.
+
+    Only the candidates scoring at least the n-th best score are sorted. Ties
+    are broken by the n-grams' token ranks, so passing lexical_ranks() orders
+    them like NLTK's nbest().
+
+    Args:
+        ids: Token ID stream (array('I'), list or NumPy array)
+        size: Vocabulary size (one more than the largest ID)
+        n: Number of n-grams to return
+        order: N-gram length (2 or 3)
+        measure: Association measure: 'pmi', 'likelihood_ratio' or 'student_t'
+        min_count: Minimum number of occurrences of a returned n-gram
+        ranks: Optional array mapping IDs to tie-breaking ranks (default: the IDs)
+
+    Returns:
+        List of ID tuples, best first
+    """
+    ngrams, _, scores = score_ngrams(ids, size, order, measure, min_count)
+    if len(scores) > n > 0:
+        nth_best = scores[np.argpartition(-scores, n - 1)[n - 1]]
+        candidates = np.flatnonzero(scores >= nth_best)
+        ngrams, scores = ngrams[candidates], scores[candidates]
+
+    ranked = ranks[ngrams] if ranks is not None else ngrams
+    keys = [ranked[:, position] for position in reversed(range(order))] + [-scores]
+    best = np.lexsort(keys)[:n]
+    return [tuple(ngram) for ngram in ngrams[best].tolist()]
@@ -0,0 +1,236 @@
+"""
+Topic Co-occurrence Module
+
+Count how often topic categories and keywords appear together across a corpus of conversations.
+"""
+import gzip
+import json
+from collections import Counter
+from .extractor import load_conversation, split_turns, map_file_chunks
+from .topic_extractor import _resolve_categories
+
+# Units within which co-occurrences are counted
+SCOPES = ('line', 'turn', 'window')
+
+# Kinds of items whose co-occurrences are counted
+KINDS = ('category', 'keyword')
+
+# Default number of lines per window
+DEFAULT_WINDOW_LINES = 10
+
+# Identifies files written by CooccurrenceCounts.save()
+FORMAT_NAME = "topic-cooccurrence"
+FORMAT_VERSION = 1
+
+
+class CooccurrenceCounts:
+    """
+    Sparse, mergeable co-occurrence counts for categories and keywords.
+
+    For each kind and scope, counts maps an (a, b) pair with a <= b to the number of
+    units (lines, turns or windows) containing both items. The (a, a) entries count
+    the units containing a at all. Only pairs that actually occur are stored.
+    """
+
+    def __init__(self):
+        """Initialize empty counts."""
+        self.documents = 0
+        self.counts = {kind: {scope: Counter() for scope in SCOPES} for kind in KINDS}
+
+    def add_unit(self, kind, scope, items):
+        """
+        Count the co-occurrences within one unit.
+
+        Args:
+            kind: 'category' or 'keyword'
+            scope: 'line', 'turn' or 'window'
+            items: Set of items present in the unit
+        """
+        if not items:
+            return
+        counter = self.counts[kind][scope]
+        ordered = sorted(items)
+        for i, a in enumerate(ordered):
+            for b in ordered[i:]:
+                counter[(a, b)] += 1
+
+    def merge(self, other):
+        """
+        Add the counts of another instance to this one.
+
+        Args:
+            other: CooccurrenceCounts to merge in
+
+        Returns:
+            This instance
+        """
+        self.documents += other.documents
+        for kind in KINDS:
+            for scope in SCOPES:
+                self.counts[kind][scope].update(other.counts[kind][scope])
+        return self
+
+    def get(self, a, b, kind='category', scope='line'):
+        """
+        Get the number of units in which two items co-occur.
+
+        Args:
+            a: First category or keyword
+            b: Second category or keyword (pass a again for its occurrence count)
+            kind: 'category' or 'keyword'
+            scope: 'line', 'turn' or 'window'
+
+        Returns:
+            Co-occurrence count
+        """
+        if kind == 'keyword':
+            a, b = a.lower(), b.lower()
+        key = (a, b) if a <= b else (b, a)
+        return self.counts[kind][scope][key]
+
+    def most_common(self, n=None, kind='category', scope='line'):
+        """
+        Get the most frequent pairs of distinct items.
+
+        Args:
+            n: Number of pairs to return (all if None)
+            kind: 'category' or 'keyword'
+            scope: 'line', 'turn' or 'window'
+
+        Returns:
+            List of ((a, b), count) tuples
+        """
+        pairs = [(pair, count) for pair, count in self.counts[kind][scope].items() if pair[0] != pair[1]]
+        pairs.sort(key=lambda item: (-item[1], item[0]))
+        return pairs if n is None else pairs[:n]
+
+    def save(self, file_path):
+        """
+        Save the counts to a gzip-compressed JSON file.
+
+        Items are stored once in a table and pairs as [index, index, count] triples.
+
+        Args:
+            file_path: Path of the file to write
+        """
+        data = {'format': FORMAT_NAME, 'version': FORMAT_VERSION, 'documents': self.documents}
+        for kind in KINDS:
+            items = sorted({item for counter in self.counts[kind].values() for pair in counter for item in pair})
+            index = {item: i for i, item in enumerate(items)}
+            data[kind] = {
+                'items': items,
+                'counts': {scope: [[index[a], index[b], count]
+                                   for (a, b), count in sorted(self.counts[kind][scope].items())]
+                           for scope in SCOPES},
+            }
+        with gzip.open(file_path, 'wt', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Load counts saved with save().
+
+        Args:
+            file_path: Path of the file to read
+
+        Returns:
+            CooccurrenceCounts instance
+        """
+        with gzip.open(file_path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('format') != FORMAT_NAME or data.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported co-occurrence file: {file_path}")
+
+        counts = cls()
+        counts.documents = data['documents']
+        for kind in KINDS:
+            items = data[kind]['items']
+            for scope in SCOPES:
+                counts.counts[kind][scope] = Counter(
+                    {(items[a], items[b]): count for a, b, count in data[kind]['counts'][scope]})
+        return counts
+
+
+def count_cooccurrences(conversation_text, topic_categories=None, window_lines=DEFAULT_WINDOW_LINES):
+    """
+    Count category and keyword co-occurrences in one conversation.
+
+    Args:
+        conversation_text: The conversation text to analyze
+        topic_categories: Dictionary mapping topic categories to lists of keywords, or a
+                         precompiled TopicCategorySet (defaults to DEFAULT_TOPIC_CATEGORIES if None)
+        window_lines: Number of lines per window; windows are consecutive, non-overlapping blocks
+
+    Returns:
+        CooccurrenceCounts for the conversation
+    """
+    category_set = _resolve_categories(topic_categories)
+    counts = CooccurrenceCounts()
+    counts.documents = 1
+
+    lines = conversation_text.split('\n')
+
+    # Invert the keyword -> lines map into the keywords found on each line
+    line_keywords = {}
+    for keyword, line_numbers in category_set.match_lines(lines).items():
+        for i in line_numbers:
+            line_keywords.setdefault(i, set()).add(keyword)
+
+    def add_span(scope, start, end):
+        keywords = set()
+        for i in range(start, end):
+            keywords.update(line_keywords.get(i, ()))
+        add_keywords(scope, keywords)
+
+    def add_keywords(scope, keywords):
+        categories = set()
+        for keyword in keywords:
+            categories.update(category_set.keyword_categories[keyword])
+        counts.add_unit('keyword', scope, keywords)
+        counts.add_unit('category', scope, categories)
+
+    for keywords in line_keywords.values():
+        add_keywords('line', keywords)
+    for start, end in split_turns(lines):
+        add_span('turn', start, end)
+    for start in range(0, len(lines), window_lines):
+        add_span('window', start, min(len(lines), start + window_lines))
+
+    return counts
+
+
+def _count_files(file_paths, options):
+    """Count co-occurrences over a group of files and return the partial counts."""
+    partial = CooccurrenceCounts()
+    for file_path in file_paths:
+        partial.merge(count_cooccurrences(load_conversation(file_path), **options))
+    return partial
+
+
+def count_corpus_cooccurrences(file_paths, topic_categories=None, window_lines=DEFAULT_WINDOW_LINES,
+                               workers=None, files_per_task=16):
+    """
+    Count category and keyword co-occurrences across many conversation files.
+
+    Each task counts a group of files into its own partial counts, which are merged
+    into the total as tasks complete. Only a bounded number of tasks is in flight.
+
+    Args:
+        file_paths: Iterable of conversation file paths
+        topic_categories: Dictionary mapping topic categories to lists of keywords, or a
+                         precompiled TopicCategorySet (defaults to DEFAULT_TOPIC_CATEGORIES if None)
+        window_lines: Number of lines per window
+        workers: Number of worker processes (None or 1 counts in the current process)
+        files_per_task: Number of files counted by each task
+
+    Returns:
+        CooccurrenceCounts for the whole corpus
+    """
+    options = {
+        'topic_categories': _resolve_categories(topic_categories),
+        'window_lines': window_lines,
+    }
+    total = CooccurrenceCounts()
+    map_file_chunks(_count_files, file_paths, options, total.merge, workers, files_per_task)
+    return total
@@ -0,0 +1,320 @@
+"""
+Corpus Document Frequency Module
+
+Build, store and query word document frequencies across a corpus of conversations.
+"""
+import math
+import mmap
+import hashlib
+import struct
+from bisect import bisect_left
+from collections import Counter
+from .extractor import load_conversation, map_file_chunks
+
+# File layout (little-endian):
+#   header: magic, version, documents, total words, term count, string blob size,
+#           content fingerprint
+#   offsets: (term count + 1) uint64 offsets of the sorted UTF-8 terms in the blob
+#   frequencies: term count uint32 document frequencies
+#   blob: the concatenated terms
+MAGIC = b'CXDF'
+FORMAT_VERSION = 2
+HEADER = struct.Struct('<4sIQQQQ16s')
+
+
+def _fingerprint(documents, total_words, items):
+    """
+    Hash the contents of a store.
+
+    Args:
+        documents: Number of documents in the corpus
+        total_words: Number of counted words in the corpus
+        items: Iterable of (UTF-8 term, document frequency) pairs, sorted by term
+
+    Returns:
+        16-byte digest
+    """
+    digest = hashlib.blake2b(struct.pack('<QQ', documents, total_words), digest_size=16)
+    for term, df in items:
+        digest.update(term + b'\0' + struct.pack('<I', df))
+    return digest.digest()
+
+
+def content_words(words, stop_words):
+    """
+    Get the words that keyword scoring counts.
+
+    Args:
+        words: List of word lists, one per sentence
+        stop_words: Set of words to skip
+
+    Returns:
+        List of lowercased words
+    """
+    return [word for word in (word.lower() for sentence in words for word in sentence
+                              if word.isalnum() and len(word) > 2)
+            if word not in stop_words]
+
+
+class DocumentFrequencyStore:
+    """
+    Document frequencies of words across a corpus.
+
+    Stores built in memory keep a dictionary; stores opened with load() memory-map
+    the file and binary-search its sorted term table, so opening is instant and
+    lookups never read the whole file.
+    """
+
+    def __init__(self, document_frequencies, documents, total_words=0):
+        """
+        Initialize the store.
+
+        Args:
+            document_frequencies: Dictionary mapping words to the number of documents containing them
+            documents: Number of documents in the corpus
+            total_words: Number of counted words in the corpus (for average document length)
+        """
+        self.documents = documents
+        self.total_words = total_words
+        self._frequencies = dict(document_frequencies)
+        self.file_path = None
+        self._file = None
+        self._mmap = None
+        self._offsets = None
+        self._frequency_array = None
+        self._fingerprint = None
+
+    @property
+    def fingerprint(self):
+        """Hex digest of the store's contents, identifying the corpus it was built from."""
+        if self._fingerprint is None:
+            items = sorted((word.encode('utf-8'), df) for word, df in self._frequencies.items())
+            self._fingerprint = _fingerprint(self.documents, self.total_words, items)
+        return self._fingerprint.hex()
+
+    @property
+    def average_length(self):
+        """Average number of counted words per document."""
+        return self.total_words / self.documents if self.documents else 0.0
+
+    def __len__(self):
+        if self._mmap is not None:
+            return self._term_count
+        return len(self._frequencies)
+
+    def df(self, word):
+        """
+        Get the number of documents containing a word.
+
+        Args:
+            word: Lowercased word
+
+        Returns:
+            Document frequency (0 for unknown words)
+        """
+        if self._mmap is None:
+            return self._frequencies.get(word, 0)
+
+        index = bisect_left(self._term_keys, word.encode('utf-8'))
+        if index < self._term_count and self._term(index) == word.encode('utf-8'):
+            return self._frequency_array[index]
+        return 0
+
+    def idf(self, word):
+        """
+        Get the smoothed inverse document frequency of a word.
+
+        Args:
+            word: Lowercased word
+
+        Returns:
+            log((N + 1) / (df + 1)) + 1
+        """
+        return math.log((self.documents + 1) / (self.df(word) + 1)) + 1
+
+    def bm25_idf(self, word):
+        """
+        Get the BM25 inverse document frequency of a word.
+
+        Args:
+            word: Lowercased word
+
+        Returns:
+            log(1 + (N - df + 0.5) / (df + 0.5))
+        """
+        df = self.df(word)
+        return math.log(1 + (self.documents - df + 0.5) / (df + 0.5))
+
+    @classmethod
+    def build(cls, file_paths, generator=None, workers=None, files_per_task=16):
+        """
+        Count document frequencies over conversation files.
+
+        Args:
+            file_paths: Iterable of conversation file paths
+            generator: KeywordGenerator providing the tokenizer and stopwords
+                       (defaults to the shared generator)
+            workers: Number of worker processes (None or 1 counts in the current process)
+            files_per_task: Number of files counted by each task
+
+        Returns:
+            DocumentFrequencyStore instance
+        """
+        from .dynamic_keywords import get_default_generator
+
+        generator = generator or get_default_generator()
+        total = _PartialFrequencies()
+
+        map_file_chunks(_count_files, file_paths, generator, total.merge, workers, files_per_task)
+        return cls(total.frequencies, total.documents, total.total_words)
+
+    def save(self, file_path):
+        """
+        Save the store in its compact, memory-mappable binary format.
+
+        Args:
+            file_path: Path of the file to write
+        """
+        items = sorted((word.encode('utf-8'), df) for word, df in self.items())
+        offsets = [0]
+        for term, _ in items:
+            offsets.append(offsets[-1] + len(term))
+
+        with open(file_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, self.documents, self.total_words,
+                                len(items), offsets[-1], _fingerprint(self.documents, self.total_words, items)))
+            f.write(struct.pack(f'<{len(offsets)}Q', *offsets))
+            f.write(struct.pack(f'<{len(items)}I', *(df for _, df in items)))
+            f.write(b''.join(term for term, _ in items))
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Open a store saved with save() by memory-mapping it.
+
+        Args:
+            file_path: Path of the file to open
+
+        Returns:
+            DocumentFrequencyStore instance
+        """
+        store = cls({}, 0)
+        store._open(file_path)
+        return store
+
+    def _open(self, file_path):
+        """Memory-map a saved store file."""
+        self.file_path = file_path
+        self._file = open(file_path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            self._file.close()
+            raise ValueError(f"Unsupported document frequency file: {file_path}")
+
+        if len(self._mmap) < HEADER.size:
+            self.close()
+            raise ValueError(f"Unsupported document frequency file: {file_path}")
+        magic, version, documents, total_words, count, blob_size, fingerprint = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported document frequency file: {file_path}")
+
+        self.documents = documents
+        self.total_words = total_words
+        self._fingerprint = fingerprint
+        self._term_count = count
+        view = memoryview(self._mmap)
+        offsets_start = HEADER.size
+        frequencies_start = offsets_start + (count + 1) * 8
+        self._blob_start = frequencies_start + count * 4
+        self._offsets = view[offsets_start:frequencies_start].cast('Q')
+        self._frequency_array = view[frequencies_start:self._blob_start].cast('I')
+        self._term_keys = _TermKeys(self)
+
+    def _term(self, index):
+        """Get the UTF-8 encoded term at an index of the sorted term table."""
+        start = self._blob_start + self._offsets[index]
+        end = self._blob_start + self._offsets[index + 1]
+        return self._mmap[start:end]
+
+    def items(self):
+        """Iterate over (word, document frequency) pairs."""
+        if self._mmap is None:
+            return iter(self._frequencies.items())
+        return ((self._term(i).decode('utf-8'), self._frequency_array[i]) for i in range(self._term_count))
+
+    def close(self):
+        """Release the memory-mapped file, if any."""
+        if self._mmap is not None:
+            # Views into the map must be released before it can be closed
+            for view in (self._offsets, self._frequency_array):
+                if view is not None:
+                    view.release()
+            self._mmap.close()
+            self._file.close()
+            self._mmap = None
+            self._frequencies = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getstate__(self):
+        # Memory-mapped stores are reopened from their file rather than pickled
+        if self._mmap is not None:
+            return {'file_path': self.file_path}
+        return {'frequencies': self._frequencies, 'documents': self.documents, 'total_words': self.total_words}
+
+    def __setstate__(self, state):
+        if 'file_path' in state:
+            self.__init__({}, 0)
+            self._open(state['file_path'])
+        else:
+            self.__init__(state['frequencies'], state['documents'], state['total_words'])
+
+
+class _TermKeys:
+    """Sequence view of a mapped store's sorted terms, for bisect."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def __len__(self):
+        return self.store._term_count
+
+    def __getitem__(self, index):
+        return self.store._term(index)
+
+
+class _PartialFrequencies:
+    """Mergeable document frequency counts of part of a corpus."""
+
+    def __init__(self):
+        self.frequencies = Counter()
+        self.documents = 0
+        self.total_words = 0
+
+    def add_document(self, words):
+        """Count the words of one document."""
+        self.frequencies.update(set(words))
+        self.documents += 1
+        self.total_words += len(words)
+
+    def merge(self, other):
+        """Add the counts of another partial count."""
+        self.frequencies.update(other.frequencies)
+        self.documents += other.documents
+        self.total_words += other.total_words
+
+
+def _count_files(file_paths, generator):
+    """Count document frequencies over a group of files."""
+    partial = _PartialFrequencies()
+    for file_path in file_paths:
+        _, words = generator.tokenize(load_conversation(file_path))
+        partial.add_document(content_words(words, generator.stop_words))
+    return partial
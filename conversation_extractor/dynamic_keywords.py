@@ -5,8 +5,503 @@ Analyze conversation to dynamically extract new potential keywords.
 """
 import os
 import re
-import json
+import heapq
+from array import array
 from collections import Counter
+from itertools import islice
+from operator import itemgetter
+from .tokenizers import (FastTokenizer, split_sentences, split_words, split_chunks, tokenize_parallel,
+                         tokenize_executor, DEFAULT_CHUNK_SIZE)
+from .corpus import DocumentFrequencyStore
+from .vocabulary import Vocabulary, filter_ids, count_ids, count_id_bigrams
+from .keyword_tracker import KeywordTracker  # noqa: F401 (re-exported)
+
+
+class NgramCounts:
+    """Unigram and bigram counts of a token stream."""
+
+    def __init__(self, unigrams, bigrams=None):
+        """
+        Initialize the counts.
+
+        Args:
+            unigrams: Counter mapping tokens to their counts
+            bigrams: Optional Counter mapping (w1, w2) tuples to their counts
+        """
+        self.unigrams = unigrams
+        self.bigrams = bigrams if bigrams is not None else Counter()
+        self.total = sum(unigrams.values())
+
+
+def count_ngrams(tokens, max_n=2):
+    """
+    Count the n-grams of a token stream in linear time.
+
+    Each n-gram order is counted in one sweep over the tokens, so the counts can be
+    reused for frequency lookups and collocation scoring without rescanning.
+
+    Args:
+        tokens: List of tokens
+        max_n: Longest n-gram to count (1 or 2)
+
+    Returns:
+        NgramCounts instance
+    """
+    bigrams = None
+    if max_n >= 2:
+        bigrams = Counter(zip(tokens, islice(tokens, 1, None)))
+    return NgramCounts(Counter(tokens), bigrams)
+
+
+# Fallback stopwords used when the NLTK stopword corpus is unavailable
+BASIC_STOPWORDS = frozenset({
+    'a', 'an', 'the', 'and', 'or', 'but', 'if', 'because', 'as', 'what',
+    'while', 'of', 'to', 'in', 'for', 'with', 'by', 'about', 'against',
+    'between', 'into', 'through', 'during', 'before', 'after', 'above',
+    'below', 'from', 'up', 'down', 'on', 'off', 'over', 'under', 'again',
+    'then', 'once', 'here', 'there', 'when', 'where', 'why', 'how', 'all',
+    'any', 'both', 'each', 'few', 'more', 'most', 'other', 'some', 'such',
+    'no', 'nor', 'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very',
+    'can', 'will', 'just', 'should', 'now'
+})
+
+# Phrases marking a sentence whose follow-up sentence likely holds key information
+IMPORTANCE_MARKERS = (
+    "important", "remember", "key", "crucial", "essential",
+    "don't forget", "note that", "keep in mind"
+)
+
+# BM25 term frequency saturation and document length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+class KeywordGenerator:
+    """
+    Reusable dynamic keyword generator.
+
+    The tokenizers, stopwords and collocation measures are loaded once, when the
+    generator is created, and fall back to simple regex-based equivalents when NLTK
+    or its data is unavailable. Generating keywords never downloads anything.
+    Generators can be pickled; unpickling loads the resources again in the new process.
+
+    Single words are ranked by their frequency in the conversation, or with
+    scoring='tfidf' or 'bm25' by weighting that frequency with their document
+    frequency in a corpus, so that words common to every conversation give way to
+    distinctive ones. Document frequencies are looked up in a DocumentFrequencyStore.
+
+    With workers > 1, texts longer than chunk_size are split into chunks that are
+    tokenized in a process pool, started on first use and kept until close().
+    Unpickled copies of the generator tokenize the same
+    chunks in their own process, so generators sent to worker processes produce the
+    same keywords without nesting pools.
+    """
+
+    # Supported tokenizer backends
+    TOKENIZERS = ('auto', 'nltk', 'fast')
+
+    # Supported single word scoring modes
+    SCORINGS = ('frequency', 'tfidf', 'bm25')
+
+    # Supported bigram collocation finders
+    COLLOCATIONS = ('nltk', 'numpy')
+
+    # Supported keyword extraction methods
+    METHODS = ('frequency', 'textrank')
+
+    def __init__(self, download=False, tokenizer='auto', scoring='frequency', df_store=None,
+                 collocations='nltk', method='frequency', workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Initialize the keyword generator.
+
+        Args:
+            download: Whether to download missing NLTK data while initializing
+            tokenizer: Tokenizer backend: 'nltk' (punkt and word_tokenize; raises
+                       LookupError if the data is missing), 'fast' (precompiled regexes
+                       tuned for chat text, no NLTK data needed) or 'auto' (NLTK when
+                       available, otherwise plain punctuation splitting)
+            scoring: Single word scoring: 'frequency', 'tfidf' or 'bm25'
+            df_store: DocumentFrequencyStore, or path of a saved store, used by the
+                      'tfidf' and 'bm25' scoring modes
+            collocations: Bigram finder: 'nltk' (BigramCollocationFinder, falling back to
+                          every distinct bigram without NLTK) or 'numpy' (vectorized
+                          scoring over token IDs; raises ImportError without NumPy)
+            method: Keyword extraction method: 'frequency' (frequent words, collocations
+                    and words following importance markers) or 'textrank' (keyphrases
+                    ranked by TextRank; raises ImportError without NumPy)
+            workers: Number of worker processes tokenizing texts longer than chunk_size
+                     (None or 1 tokenizes in the current process)
+            chunk_size: Size of the chunks tokenized in parallel, in characters; chunks
+                        are split at speaker turns or blank lines
+        """
+        if tokenizer not in self.TOKENIZERS:
+            raise ValueError(f"Unknown tokenizer '{tokenizer}', expected one of {self.TOKENIZERS}")
+        if scoring not in self.SCORINGS:
+            raise ValueError(f"Unknown scoring '{scoring}', expected one of {self.SCORINGS}")
+        if collocations not in self.COLLOCATIONS:
+            raise ValueError(f"Unknown collocations '{collocations}', expected one of {self.COLLOCATIONS}")
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown method '{method}', expected one of {self.METHODS}")
+        if scoring != 'frequency' and df_store is None:
+            raise ValueError(f"Scoring '{scoring}' requires a document frequency store")
+        if isinstance(df_store, (str, os.PathLike)):
+            df_store = DocumentFrequencyStore.load(df_store)
+        self.download = download
+        self.tokenizer = tokenizer
+        self.scoring = scoring
+        self.df_store = df_store
+        self.collocations = collocations
+        self.method = method
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._use_pool = True
+        self._executor = None
+        self._load_resources()
+
+    @property
+    def config(self):
+        """Dictionary describing the settings that affect the generated keywords."""
+        config = {'tokenizer': self.tokenizer_backend}
+        if self.scoring != 'frequency':
+            config['scoring'] = self.scoring
+            config['df_store'] = self.df_store.fingerprint
+        if self.collocations != 'nltk':
+            config['collocations'] = self.collocations
+        if self.method != 'frequency':
+            config['method'] = self.method
+        if self._chunking() and self.tokenizer_backend != 'fast':
+            # Only the fast tokenizer ends sentences at every line, so other backends
+            # can split a sentence differently where a chunk boundary falls
+            config['chunk_size'] = self.chunk_size
+        return config
+
+    def _load_resources(self):
+        """Load the tokenizers, stopwords and collocation measures."""
+        self._sent_tokenize = split_sentences
+        self._word_tokenize = split_words
+        self.tokenizer_backend = 'regex'
+        self._collocations = None
+        self._nbest_ngrams = None
+        self.stop_words = BASIC_STOPWORDS
+
+        if self.collocations == 'numpy':
+            from .collocations import nbest_ngrams, lexical_ranks
+            self._nbest_ngrams = (nbest_ngrams, lexical_ranks)
+        if self.method == 'textrank':
+            from .keyphrases import extract_keyphrases
+            self._extract_keyphrases = extract_keyphrases
+
+        if self.tokenizer == 'fast':
+            # Keep labels like "IMPORTANT:", which mark the sentences that follow
+            fast_tokenizer = FastTokenizer(keep_labels=IMPORTANCE_MARKERS)
+            self._sent_tokenize = fast_tokenizer.sent_tokenize
+            self._word_tokenize = fast_tokenizer.word_tokenize
+            self.tokenizer_backend = 'fast'
+
+        try:
+            import nltk
+            from nltk.tokenize import word_tokenize, sent_tokenize
+            from nltk.corpus import stopwords
+            from nltk.collocations import BigramAssocMeasures, BigramCollocationFinder
+            from nltk.probability import FreqDist
+        except ImportError:
+            if self.tokenizer == 'nltk':
+                raise
+            return
+
+        self._collocations = (BigramCollocationFinder, BigramAssocMeasures.pmi, FreqDist)
+
+        if self.download and not self._nltk_data_available(sent_tokenize, word_tokenize, stopwords):
+            nltk.download('punkt')
+            nltk.download('stopwords')
+
+        # Probe each resource once so calls never hit a missing resource
+        if self.tokenizer != 'fast':
+            try:
+                sent_tokenize("Probe sentence.")
+                word_tokenize("Probe sentence.")
+                self._sent_tokenize = sent_tokenize
+                self._word_tokenize = word_tokenize
+                self.tokenizer_backend = 'nltk'
+            except LookupError:
+                if self.tokenizer == 'nltk':
+                    raise
+        try:
+            self.stop_words = frozenset(stopwords.words('english'))
+        except (LookupError, AttributeError):
+            pass
+
+    @staticmethod
+    def _nltk_data_available(sent_tokenize, word_tokenize, stopwords):
+        """Check whether the NLTK tokenizer and stopword data are installed."""
+        try:
+            sent_tokenize("Probe sentence.")
+            word_tokenize("Probe sentence.")
+            stopwords.words('english')
+        except (LookupError, AttributeError):
+            return False
+        return True
+
+    def __getstate__(self):
+        # Loaded NLTK functions and corpora are reloaded rather than pickled
+        return {'download': False, 'tokenizer': self.tokenizer, 'scoring': self.scoring,
+                'df_store': self.df_store, 'collocations': self.collocations, 'method': self.method,
+                'workers': self.workers, 'chunk_size': self.chunk_size}
+
+    def __setstate__(self, state):
+        self.download = state['download']
+        self.tokenizer = state['tokenizer']
+        self.scoring = state.get('scoring', 'frequency')
+        self.df_store = state.get('df_store')
+        self.collocations = state.get('collocations', 'nltk')
+        self.method = state.get('method', 'frequency')
+        self.workers = state.get('workers')
+        self.chunk_size = state.get('chunk_size', DEFAULT_CHUNK_SIZE)
+        # Copies in other processes chunk texts the same way, but never nest pools
+        self._use_pool = False
+        self._executor = None
+        self._load_resources()
+
+    def tokenize(self, conversation_text):
+        """
+        Split a conversation into sentences and words.
+
+        Args:
+            conversation_text: The conversation text to tokenize
+
+        Returns:
+            Tuple of (list of sentences, list of word lists, one per sentence)
+        """
+        if self._parallel(conversation_text):
+            sentences, words = [], []
+            for chunk_sentences, chunk_words in self._tokenize_chunks(conversation_text):
+                sentences.extend(chunk_sentences)
+                words.extend(chunk_words)
+            return sentences, words
+        return self._tokenize_serial(conversation_text)
+
+    def _tokenize_serial(self, conversation_text):
+        """Tokenize a conversation in the current process."""
+        sentences = self._sent_tokenize(conversation_text)
+        words = [self._word_tokenize(sentence) for sentence in sentences]
+        return sentences, words
+
+    def iter_sentences(self, conversation_text):
+        """
+        Split a conversation into sentences and words, one sentence at a time.
+
+        Args:
+            conversation_text: The conversation text to tokenize
+
+        Yields:
+            Tuple of (sentence, list of words)
+        """
+        if self._parallel(conversation_text):
+            for chunk_sentences, chunk_words in self._tokenize_chunks(conversation_text):
+                yield from zip(chunk_sentences, chunk_words)
+        else:
+            for sentence in self._sent_tokenize(conversation_text):
+                yield sentence, self._word_tokenize(sentence)
+
+    def _chunking(self):
+        """Check whether texts longer than chunk_size are split into chunks."""
+        return bool(self.workers) and self.workers > 1
+
+    def _parallel(self, conversation_text):
+        """Check whether a text should be tokenized in chunks."""
+        return self._chunking() and len(conversation_text) > self.chunk_size
+
+    def _tokenize_chunks(self, conversation_text):
+        """Tokenize the chunks of a text, in a process pool unless this is a copy in another process."""
+        if not self._use_pool:
+            chunks = split_chunks(conversation_text, self.chunk_size)
+            return (self._tokenize_serial(chunk) for chunk in chunks)
+        if self._executor is None:
+            self._executor = tokenize_executor(self._tokenize_serial, self.workers)
+        return tokenize_parallel(conversation_text, self._tokenize_serial, self.workers, self.chunk_size,
+                                 executor=self._executor)
+
+    def close(self):
+        """Shut down the tokenization process pool, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def rank_words(self, word_freq, total_words, n=30):
+        """
+        Rank the words of a conversation with the generator's scoring mode.
+
+        Args:
+            word_freq: Counter mapping words (without stopwords) to their counts
+            total_words: Number of words counted in word_freq
+            n: Number of words to return
+
+        Returns:
+            List of (word, importance) tuples, best first. The importance is the
+            word's share of the conversation's total score; with frequency scoring
+            this is its relative frequency.
+        """
+        if self.scoring == 'frequency':
+            return [(word, count / total_words) for word, count in word_freq.most_common(n)]
+
+        store = self.df_store
+        if self.scoring == 'tfidf':
+            scores = {word: count * store.idf(word) for word, count in word_freq.items()}
+        else:
+            # Normalize term frequencies by the conversation length relative to the corpus average
+            average_length = store.average_length or total_words
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * total_words / average_length)
+            scores = {word: store.bm25_idf(word) * count * (BM25_K1 + 1) / (count + norm)
+                      for word, count in word_freq.items()}
+
+        total_score = sum(scores.values())
+        if not total_score:
+            return []
+        return [(word, score / total_score) for word, score in heapq.nlargest(n, scores.items(), key=itemgetter(1))]
+
+    def generate(self, conversation_text, existing_keywords=None, threshold=0.5):
+        """
+        Analyze conversation to dynamically extract new potential keywords.
+
+        Args:
+            conversation_text: The conversation text to analyze
+            existing_keywords: Optional list of already known keywords to avoid duplicates
+            threshold: Importance threshold for considering a term as a keyword (with
+                       the 'textrank' method, the minimum phrase score relative to the
+                       best phrase)
+
+        Returns:
+            List of new potential keywords
+        """
+        if self.method == 'textrank':
+            _, words = self.tokenize(conversation_text)
+            return self._extract_keyphrases(words, self.stop_words, existing_keywords, threshold)
+
+        # Prepare existing keywords
+        existing_keywords = existing_keywords or []
+        existing_keywords_lower = {k.lower() for k in existing_keywords}
+        stop_words = self.stop_words
+
+        # Tokenize the conversation, interning counted words into a compact ID stream.
+        # Only the words of sentences following importance markers are kept as strings.
+        vocabulary = Vocabulary()
+        stream = array('I')
+        marker_words = {}  # Maps sentence indices to the words of sentences following markers
+        follows_marker = False
+        for i, (sentence, words) in enumerate(self.iter_sentences(conversation_text)):
+            if follows_marker:
+                marker_words[i] = words
+            sentence_lower = sentence.lower()
+            follows_marker = any(marker in sentence_lower for marker in IMPORTANCE_MARKERS)
+            vocabulary.encode((word.lower() for word in words if word.isalnum() and len(word) > 2), stream)
+
+        # Remove stopwords
+        filtered = filter_ids(stream, vocabulary.flags(stop_words))
+
+        # Find frequent terms
+        tokens = vocabulary.tokens
+        word_freq = Counter({tokens[i]: count for i, count in count_ids(filtered, len(tokens)).items()})
+        total_words = len(filtered)
+
+        # Count words and bigrams (two-word phrases) once for all the scoring below
+        ngram_counts = NgramCounts(
+            Counter({tokens[i]: count for i, count in count_ids(stream, len(tokens)).items()}),
+            Counter({(tokens[a], tokens[b]): count
+                     for (a, b), count in count_id_bigrams(stream, len(tokens)).items()})
+        )
+
+        # Find bigrams
+        if self._nbest_ngrams is not None:
+            # Score bigrams appearing >= 2 times by PMI over the ID stream, breaking ties like NLTK
+            nbest_ngrams, lexical_ranks = self._nbest_ngrams
+            best = nbest_ngrams(stream, len(tokens), 20, min_count=2, ranks=lexical_ranks(tokens))
+            bigrams = [(tokens[a], tokens[b]) for a, b in best]
+        else:
+            try:
+                finder_class, pmi, freq_dist = self._collocations
+                bigram_finder = finder_class(freq_dist(ngram_counts.unigrams), freq_dist(ngram_counts.bigrams))
+                bigram_finder.apply_freq_filter(2)  # Only consider bigrams that appear >= 2 times
+                bigrams = bigram_finder.nbest(pmi, 20)
+            except Exception:
+                # Fallback to every distinct bigram if NLTK collocations fail
+                bigrams = list(ngram_counts.bigrams)
+
+        # Without any content words there is nothing to score bigrams against
+        if not total_words:
+            bigrams = []
+
+        # Combine individual words and bigrams
+        potential_keywords = []
+
+        # Add important single words
+        for word, importance in self.rank_words(word_freq, total_words):
+            # Skip if already in existing keywords
+            if word.lower() in existing_keywords_lower:
+                continue
+
+            if importance > threshold / 4:  # Lower threshold for single words
+                potential_keywords.append(word)
+
+        # Add important bigrams
+        for w1, w2 in bigrams:
+            bigram = f"{w1} {w2}"
+            # Skip if already in existing keywords
+            if bigram.lower() in existing_keywords_lower:
+                continue
+
+            # Get combined frequency
+            combined_count = ngram_counts.bigrams[(w1, w2)]
+
+            # Calculate importance score
+            importance = combined_count / total_words
+            if importance > threshold / 2:  # Moderate threshold for bigrams
+                potential_keywords.append(bigram)
+
+        # Add words from the sentences following importance markers, as they might contain key information
+        potential_keywords_lower = {k.lower() for k in potential_keywords}
+        for words in marker_words.values():
+            for word in words:
+                if (word.isalnum() and len(word) > 3 and
+                    word.lower() not in stop_words and
+                    word.lower() not in existing_keywords_lower and
+                    word.lower() not in potential_keywords_lower):
+                    potential_keywords.append(word)
+                    potential_keywords_lower.add(word.lower())
+
+        # Remove duplicates and sort by length (preferring longer keywords)
+        unique_keywords = sorted(set(potential_keywords), key=len, reverse=True)
+
+        return unique_keywords[:20]  # Return top 20 new keywords
+
+
+# Shared generator used by generate_dynamic_keywords, created on first use
+_default_generator = None
+
+
+# Generator configuration that cache keys use for the shared generator, so that
+# cache hits do not need to create it (which may download NLTK data)
+DEFAULT_GENERATOR_CONFIG = {'generator': 'default'}
+
+
+def get_default_generator():
+    """
+    Get the shared keyword generator, creating it on first use.
+
+    The shared generator downloads missing NLTK data once, when it is created.
+
+    Returns:
+        KeywordGenerator instance
+    """
+    global _default_generator
+    if _default_generator is None:
+        _default_generator = KeywordGenerator(download=True)
+    return _default_generator
 
 
 def generate_dynamic_keywords(conversation_text, existing_keywords=None, threshold=0.5):
@@ -21,199 +516,187 @@ def generate_dynamic_keywords(conversation_text, existing_keywords=None, thresho
     Returns:
         List of new potential keywords
     """
-    import nltk
-    from nltk.tokenize import word_tokenize, sent_tokenize
-    from nltk.corpus import stopwords
-    from nltk.collocations import BigramAssocMeasures, BigramCollocationFinder
-
-    # Ensure NLTK resources are downloaded
-    try:
-        nltk.data.find('tokenizers/punkt')
-        nltk.data.find('corpora/stopwords')
-    except LookupError:
-        nltk.download('punkt')
-        nltk.download('stopwords')
-
-    # Prepare existing keywords
-    existing_keywords = existing_keywords or []
-    existing_keywords_lower = [k.lower() for k in existing_keywords]
-
-    # Ensure NLTK resources are downloaded
-    try:
-        nltk.data.find('tokenizers/punkt')
-        nltk.data.find('corpora/stopwords')
-    except LookupError:
-        nltk.download('punkt')
-        nltk.download('stopwords')
-
-    # Tokenize the conversation
-    try:
-        sentences = sent_tokenize(conversation_text)
-    except LookupError:
-        # Fallback to simple sentence splitting if NLTK tokenizer fails
-        sentences = [s.strip() for s in re.split(r'[.!?]+', conversation_text) if s.strip()]
-
-    try:
-        words = [word_tokenize(sentence) for sentence in sentences]
-    except LookupError:
-        # Fallback to simple word splitting if NLTK tokenizer fails
-        words = [re.findall(r'\w+', sentence) for sentence in sentences]
-
-    flat_words = [word.lower() for sentence in words for word in sentence
-                 if word.isalnum() and len(word) > 2]
-
-    # Remove stopwords
-    try:
-        stop_words = set(stopwords.words('english'))
-    except (LookupError, AttributeError):
-        # Fallback to a basic set of stopwords if NLTK stopwords fail
-        stop_words = {'a', 'an', 'the', 'and', 'or', 'but', 'if', 'because', 'as', 'what',
-                      'while', 'of', 'to', 'in', 'for', 'with', 'by', 'about', 'against',
-                      'between', 'into', 'through', 'during', 'before', 'after', 'above',
-                      'below', 'from', 'up', 'down', 'on', 'off', 'over', 'under', 'again',
-                      'then', 'once', 'here', 'there', 'when', 'where', 'why', 'how', 'all',
-                      'any', 'both', 'each', 'few', 'more', 'most', 'other', 'some', 'such',
-                      'no', 'nor', 'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very',
-                      'can', 'will', 'just', 'should', 'now'}
-
-    filtered_words = [word for word in flat_words if word not in stop_words]
-
-    # Find frequent terms
-    word_freq = Counter(filtered_words)
-    total_words = len(filtered_words)
-
-    # Find bigrams (two-word phrases)
-    try:
-        bigram_finder = BigramCollocationFinder.from_words(flat_words)
-        bigram_finder.apply_freq_filter(2)  # Only consider bigrams that appear >= 2 times
-        bigrams = bigram_finder.nbest(BigramAssocMeasures.pmi, 20)
-    except Exception:
-        # Fallback to simple bigram counting if NLTK collocations fail
-        bigrams = []
-        if len(flat_words) > 1:
-            for i in range(len(flat_words) - 1):
-                bigrams.append((flat_words[i], flat_words[i+1]))
-
-    # Combine individual words and bigrams
-    potential_keywords = []
-
-    # Add important single words
-    for word, count in word_freq.most_common(30):
-        # Skip if already in existing keywords
-        if word.lower() in existing_keywords_lower:
-            continue
-
-        # Calculate importance score based on frequency
-        importance = count / total_words
-        if importance > threshold / 4:  # Lower threshold for single words
-            potential_keywords.append(word)
-
-    # Add important bigrams
-    for w1, w2 in bigrams:
-        bigram = f"{w1} {w2}"
-        # Skip if already in existing keywords
-        if bigram.lower() in existing_keywords_lower:
-            continue
-
-        # Get combined frequency
-        combined_count = sum(1 for i in range(len(flat_words)-1)
-                           if flat_words[i] == w1 and flat_words[i+1] == w2)
-
-        # Calculate importance score
-        importance = combined_count / total_words
-        if importance > threshold / 2:  # Moderate threshold for bigrams
-            potential_keywords.append(bigram)
-
-    # Analyze sentences for key phrases
-    for i, sentence in enumerate(sentences):
-        # Look for sentences with potential importance markers
-        sentence_lower = sentence.lower()
-        if any(marker in sentence_lower for marker in
-              ["important", "remember", "key", "crucial", "essential",
-               "don't forget", "note that", "keep in mind"]):
-            # Extract the next sentence as it might contain key information
-            if i + 1 < len(sentences):
-                next_sentence = sentences[i + 1]
-                # Extract potential keywords from this sentence
-                try:
-                    next_words = word_tokenize(next_sentence)
-                except LookupError:
-                    next_words = re.findall(r'\w+', next_sentence)
-
-                for word in next_words:
-                    if (word.isalnum() and len(word) > 3 and
-                        word.lower() not in stop_words and
-                        word.lower() not in existing_keywords_lower and
-                        word.lower() not in [k.lower() for k in potential_keywords]):
-                        potential_keywords.append(word)
-
-    # Remove duplicates and sort by length (preferring longer keywords)
-    unique_keywords = sorted(set(potential_keywords), key=len, reverse=True)
-
-    return unique_keywords[:20]  # Return top 20 new keywords
-
-
-class KeywordTracker:
-    """Track keywords and their importance over time."""
-
-    def __init__(self, persistence_file=None):
-        """
-        Initialize the keyword tracker.
+    return get_default_generator().generate(conversation_text, existing_keywords, threshold)
+
+
+class _TopCounts:
+    """Track the n most frequent items of a Counter whose counts only grow."""
+
+    def __init__(self, counts, n):
+        """
+        Initialize the tracker.
 
         Args:
-            persistence_file: Optional file path to save/load keyword data
+            counts: Counter to track; call increment() after each increase
+            n: Number of items to track
         """
-        self.keywords = {}  # Maps keywords to their importance scores
-        self.persistence_file = persistence_file
+        self.counts = counts
+        self.n = n
+        self.first_seen = {}  # Ties are broken by first occurrence, like Counter.most_common
+        self.top = set()
+        self._min_item = None
+
+    def _key(self, item):
+        return (self.counts[item], -self.first_seen[item])
+
+    def increment(self, item):
+        """Update the top items after the count of item increased."""
+        if item not in self.first_seen:
+            self.first_seen[item] = len(self.first_seen)
+
+        if item in self.top:
+            if item == self._min_item:
+                self._min_item = None
+            return
+        if len(self.top) < self.n:
+            self.top.add(item)
+            self._min_item = None
+            return
+
+        if self._min_item is None:
+            self._min_item = min(self.top, key=self._key)
+        if self._key(item) > self._key(self._min_item):
+            self.top.remove(self._min_item)
+            self.top.add(item)
+            self._min_item = None
+
+    def most_common(self):
+        """Get the tracked items as (item, count) tuples, most frequent first."""
+        return [(item, self.counts[item]) for item in sorted(self.top, key=self._key, reverse=True)]
+
+
+class IncrementalKeywordModel:
+    """
+    Dynamic keyword statistics for a conversation that grows over time.
+
+    Feed each new message with feed(); the word and bigram counters, the total
+    word count and the words following importance markers are updated from the
+    new text only. The current keywords are then available in time that does not
+    depend on the length of the conversation so far.
+
+    Keywords are selected like generate_dynamic_keywords, except that bigram
+    candidates are the most frequent bigrams rather than the best PMI scores,
+    since PMI over the whole vocabulary cannot be maintained incrementally. Each
+    feed() call should end at a sentence boundary, such as the end of a message.
+    """
 
-        # Load existing data if available
-        if persistence_file and os.path.exists(persistence_file):
-            self._load()
+    # Number of most frequent words and bigrams considered as candidates
+    WORD_CANDIDATES = 30
+    BIGRAM_CANDIDATES = 20
 
-    def update_keyword(self, keyword, importance_increment=1.0, decay_factor=0.9):
+    def __init__(self, existing_keywords=None, threshold=0.5, generator=None):
         """
-        Update the importance of a keyword.
+        Initialize the model.
 
         Args:
-            keyword: The keyword to update
-            importance_increment: How much to increase importance
-            decay_factor: Factor to decay existing keywords
+            existing_keywords: Optional list of already known keywords to avoid duplicates
+            threshold: Importance threshold for considering a term as a keyword
+            generator: KeywordGenerator providing the tokenizer and stopwords
+                       (defaults to the shared generator)
         """
-        # Decay all existing keywords
-        for k in self.keywords:
-            self.keywords[k] *= decay_factor
+        self.generator = generator or get_default_generator()
+        self.existing_keywords_lower = {k.lower() for k in existing_keywords or []}
+        self.threshold = threshold
 
-        # Update or add the new keyword
-        if keyword in self.keywords:
-            self.keywords[keyword] += importance_increment
-        else:
-            self.keywords[keyword] = importance_increment
+        self.word_counts = Counter()  # Counts of words without stopwords
+        self.bigram_counts = Counter()  # Counts of adjacent word pairs
+        self.total_words = 0
+
+        self._top_words = _TopCounts(self.word_counts, self.WORD_CANDIDATES)
+        self._top_bigrams = _TopCounts(self.bigram_counts, self.BIGRAM_CANDIDATES)
+        self._last_word = None
+        self._marker_pending = False
 
-        # Save if we have a persistence file
-        if self.persistence_file:
-            self._save()
+        # Words following importance markers, bucketed by length for cheap longest-first queries
+        self._marker_words_lower = set()
+        self._marker_words_by_length = {}
 
-    def get_top_keywords(self, n=20):
+    def feed(self, new_text):
         """
-        Get the top n keywords by importance.
+        Add new conversation text to the statistics.
 
         Args:
-            n: Number of keywords to return
+            new_text: Text appended to the conversation since the last call
 
         Returns:
-            List of (keyword, importance) tuples
+            List of the current keywords, as returned by keywords()
         """
-        return sorted(self.keywords.items(), key=lambda x: x[1], reverse=True)[:n]
+        stop_words = self.generator.stop_words
+        sentences, words = self.generator.tokenize(new_text)
+
+        for i, sentence in enumerate(sentences):
+            # Words following a sentence with an importance marker are candidates
+            if self._marker_pending:
+                self._add_marker_words(words[i], stop_words)
+            sentence_lower = sentence.lower()
+            self._marker_pending = any(marker in sentence_lower for marker in IMPORTANCE_MARKERS)
+
+            for word in words[i]:
+                if not (word.isalnum() and len(word) > 2):
+                    continue
+                word = word.lower()
+
+                if self._last_word is not None:
+                    bigram = (self._last_word, word)
+                    self.bigram_counts[bigram] += 1
+                    self._top_bigrams.increment(bigram)
+                self._last_word = word
+
+                if word not in stop_words:
+                    self.word_counts[word] += 1
+                    self.total_words += 1
+                    self._top_words.increment(word)
+
+        return self.keywords()
+
+    def _add_marker_words(self, words, stop_words):
+        """Record the candidate words of a sentence following an importance marker."""
+        for word in words:
+            word_lower = word.lower()
+            if (word.isalnum() and len(word) > 3 and
+                word_lower not in stop_words and
+                word_lower not in self.existing_keywords_lower and
+                word_lower not in self._marker_words_lower):
+                self._marker_words_lower.add(word_lower)
+                self._marker_words_by_length.setdefault(len(word), []).append(word)
+
+    def keywords(self, n=20):
+        """
+        Get the current keywords.
 
-    def _save(self):
-        """Save keyword data to the persistence file."""
-        with open(self.persistence_file, 'w') as f:
-            json.dump(self.keywords, f)
+        Args:
+            n: Maximum number of keywords to return
 
-    def _load(self):
-        """Load keyword data from the persistence file."""
-        try:
-            with open(self.persistence_file, 'r') as f:
-                self.keywords = json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            self.keywords = {}
+        Returns:
+            List of keywords, longest first
+        """
+        potential_keywords = []
+        if self.total_words:
+            # Add important single words
+            for word, count in self._top_words.most_common():
+                if word not in self.existing_keywords_lower and count / self.total_words > self.threshold / 4:
+                    potential_keywords.append(word)
+
+            # Add important bigrams
+            for (w1, w2), count in self._top_bigrams.most_common():
+                bigram = f"{w1} {w2}"
+                if (count >= 2 and bigram not in self.existing_keywords_lower and
+                        count / self.total_words > self.threshold / 2):
+                    potential_keywords.append(bigram)
+
+        # Add the longest marker words that are not already keywords
+        selected_lower = set(potential_keywords)
+        marker_keywords = []
+        for length in sorted(self._marker_words_by_length, reverse=True):
+            for word in self._marker_words_by_length[length]:
+                if word.lower() not in selected_lower:
+                    marker_keywords.append(word)
+                    if len(marker_keywords) >= n:
+                        break
+            if len(marker_keywords) >= n:
+                break
+
+        # Remove duplicates and sort by length (preferring longer keywords)
+        unique_keywords = sorted(set(potential_keywords), key=len, reverse=True) + marker_keywords
+        unique_keywords.sort(key=len, reverse=True)
+        return unique_keywords[:n]
@@ -6,7 +6,12 @@ context around specified keywords.
 """
 import re
 import os
-from typing import List, Dict, Tuple
+import fnmatch
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Iterable, Iterator, List, Dict, Tuple
+
+# Matches speaker labels such as "USER:", "ASSISTANT:" or "A:" at the start of a line
+SPEAKER_PATTERN = re.compile(r'^[A-Z][A-Z0-9_ -]{0,30}:(?=\s|$)')
 
 
 def load_conversation(file_path: str) -> str:
@@ -27,6 +32,116 @@ def load_conversation(file_path: str) -> str:
         return ""
 
 
+def find_conversation_files(paths: Iterable[str], pattern: str = "*.txt") -> Iterator[str]:
+    """
+    Find conversation files, walking directories recursively.
+
+    Args:
+        paths: File and directory paths
+        pattern: Filename pattern that files found in directories must match
+
+    Returns:
+        Iterator over file paths, in sorted order within each directory
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if fnmatch.fnmatch(name, pattern):
+                    yield os.path.join(root, name)
+
+
+def _chunked(iterable, size):
+    """Group an iterable into lists of at most size items."""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# Per-process task function and options for file workers, set by _init_file_worker
+_file_worker_task = None
+
+
+def _init_file_worker(function, options):
+    """Initialize a file worker process with the task function and its shared options."""
+    global _file_worker_task
+    _file_worker_task = (function, options)
+
+
+def _run_file_task(file_paths):
+    """Run the worker's task function on a group of files."""
+    function, options = _file_worker_task
+    return function(file_paths, options)
+
+
+def map_file_chunks(function, file_paths, options, merge, workers=None, files_per_task=16):
+    """
+    Process conversation files in groups and merge the partial results as they complete.
+
+    With several workers, the options are sent to each worker process once, and
+    only a bounded number of tasks is in flight, so file_paths may be a lazy
+    iterator over a corpus of any size. Partial results are merged in
+    completion order, so merge must not depend on their order.
+
+    Args:
+        function: Module-level function(file_paths, options) returning the partial result of a group
+        file_paths: Iterable of conversation file paths
+        options: Options passed to every call of function
+        merge: Function called with each partial result
+        workers: Number of worker processes (None or 1 processes files in the current process)
+        files_per_task: Number of files processed by each task
+    """
+    if not workers or workers <= 1:
+        for chunk in _chunked(file_paths, files_per_task):
+            merge(function(chunk, options))
+        return
+
+    max_pending = workers * 2
+    pending = set()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_file_worker,
+                             initargs=(function, options)) as executor:
+        for chunk in _chunked(file_paths, files_per_task):
+            pending.add(executor.submit(_run_file_task, chunk))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    merge(future.result())
+        for future in pending:
+            merge(future.result())
+
+
+def split_turns(lines: List[str]) -> List[Tuple[int, int]]:
+    """
+    Split conversation lines into speaker turns.
+
+    A turn starts at a line beginning with a speaker label (see SPEAKER_PATTERN) and
+    runs until the next one. Lines before the first label form a turn of their own.
+    
+    Args:
+        lines: The conversation lines
+        
+    Returns:
+        List of (start, end) line index ranges, one per turn
+    """
+    turns = []
+    start = 0
+    for i, line in enumerate(lines):
+        if i > start and SPEAKER_PATTERN.match(line):
+            turns.append((start, i))
+            start = i
+    if lines:
+        turns.append((start, len(lines)))
+    return turns
+
+
 def extract_context(text: str, keywords: List[str], context_lines: int = 3) -> Dict[str, List[Tuple[str, List[str]]]]:
     """
     Extract context around keywords from text.
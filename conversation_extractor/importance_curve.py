@@ -0,0 +1,165 @@
+"""
+Keyword Importance Curve Module
+
+Follow how keyword importance rises and decays over the turns of one conversation (requires NumPy).
+"""
+import math
+from collections import Counter
+import numpy as np
+from .extractor import split_turns
+from .keyword_tracker import MAX_SCALE
+from .dynamic_keywords import get_default_generator
+
+
+class ImportanceCurve:
+    """
+    Decayed importance of keywords after each turn of a conversation.
+
+    Row t of scores holds what a KeywordTracker would report after calling
+    update_keywords() with the keyword counts of turns 0 to t, one batch per
+    turn (turns without keywords still decay the scores).
+    """
+
+    __slots__ = ('keywords', 'turns', 'scores')
+
+    def __init__(self, keywords, turns, scores):
+        """
+        Initialize the curve.
+
+        Args:
+            keywords: List of keywords, one per column
+            turns: List of (start, end) line index ranges, one per row
+            scores: NumPy array of shape (turns, keywords)
+        """
+        self.keywords = keywords
+        self.turns = turns
+        self.scores = scores
+
+    def trajectory(self, keyword):
+        """
+        Get the importance of a keyword after each turn.
+
+        Args:
+            keyword: One of the curve's keywords
+
+        Returns:
+            NumPy array with one score per turn
+        """
+        return self.scores[:, self.keywords.index(keyword)]
+
+    def top_keywords(self, turn, n=5):
+        """
+        Get the most important keywords after a turn.
+
+        Args:
+            turn: Turn index
+            n: Number of keywords to return
+
+        Returns:
+            List of (keyword, importance) tuples, ties in keyword order
+        """
+        row = self.scores[turn]
+        order = np.argsort(-row, kind='stable')[:n]
+        return [(self.keywords[i], float(row[i])) for i in order]
+
+
+def decayed_cumsum(counts, decay_factor):
+    """
+    Compute decayed running totals: totals[t] = decay_factor * totals[t - 1] + counts[t].
+
+    Each block of rows is computed at once as a cumulative sum of the counts
+    divided by the decay accumulated since the block started; blocks are kept
+    short enough for that decay to stay within range.
+
+    Args:
+        counts: NumPy array of shape (steps, columns)
+        decay_factor: Factor to decay the totals by at each step
+
+    Returns:
+        NumPy float64 array of the same shape
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    if decay_factor == 0:
+        return counts.copy()
+    if abs(decay_factor) == 1:
+        block = max(len(counts), 1)
+    else:
+        block = max(1, int(math.log(MAX_SCALE) / abs(math.log(abs(decay_factor)))))
+
+    totals = np.empty_like(counts)
+    carry = np.zeros(counts.shape[1:])
+    for start in range(0, len(counts), block):
+        chunk = counts[start:start + block]
+        # totals[start + i] = d^i * (d * carry + sum over j <= i of counts[start + j] / d^j)
+        powers = decay_factor ** np.arange(len(chunk), dtype=np.float64)
+        powers = powers.reshape((-1,) + (1,) * (counts.ndim - 1))
+        chunk_totals = np.cumsum(chunk / powers, axis=0)
+        chunk_totals += decay_factor * carry
+        chunk_totals *= powers
+        totals[start:start + block] = chunk_totals
+        carry = chunk_totals[-1]
+    return totals
+
+
+def count_turn_keywords(conversation_text, keywords, generator=None):
+    """
+    Count the occurrences of keywords in each turn of a conversation.
+
+    Multi-word keywords are counted as consecutive words; matching ignores case.
+
+    Args:
+        conversation_text: The conversation text
+        keywords: List of keywords to count
+        generator: Optional KeywordGenerator to tokenize with (defaults to the shared one)
+
+    Returns:
+        Tuple of (list of (start, end) line ranges of the turns, NumPy array of shape (turns, keywords))
+    """
+    generator = generator or get_default_generator()
+    lines = conversation_text.split('\n')
+    turns = split_turns(lines)
+
+    columns = {}
+    for column, keyword in enumerate(keywords):
+        columns.setdefault(tuple(keyword.lower().split()), []).append(column)
+    sizes = sorted({len(ngram) for ngram in columns if ngram})
+
+    counts = np.zeros((len(turns), len(keywords)))
+    for row, (start, end) in enumerate(turns):
+        _, words = generator.tokenize('\n'.join(lines[start:end]))
+        for sentence in words:
+            tokens = [word.lower() for word in sentence]
+            for size in sizes:
+                ngrams = Counter(zip(*(tokens[i:] for i in range(size))))
+                for ngram, count in ngrams.items():
+                    for column in columns.get(ngram, ()):
+                        counts[row, column] += count
+    return turns, counts
+
+
+def keyword_importance_curve(conversation_text, keywords=None, generator=None,
+                             importance_increment=1.0, decay_factor=0.9):
+    """
+    Score keywords turn by turn across a conversation, like a KeywordTracker.
+
+    The keywords are counted in each turn, and the decayed scores of all
+    keywords after every turn are computed at once with a vectorized
+    cumulative decay, instead of one tracker update per occurrence.
+
+    Args:
+        conversation_text: The conversation text
+        keywords: Optional list of keywords to follow (defaults to the generator's dynamic keywords)
+        generator: Optional KeywordGenerator (defaults to the shared one)
+        importance_increment: Importance added per occurrence
+        decay_factor: Factor to decay the scores by after each turn
+
+    Returns:
+        ImportanceCurve instance
+    """
+    generator = generator or get_default_generator()
+    if keywords is None:
+        keywords = generator.generate(conversation_text)
+    keywords = list(keywords)
+
+    turns, counts = count_turn_keywords(conversation_text, keywords, generator)
+    return ImportanceCurve(keywords, turns, decayed_cumsum(counts * importance_increment, decay_factor))
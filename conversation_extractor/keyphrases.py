@@ -0,0 +1,139 @@
+"""
+Keyphrase Ranking Module
+
+Rank multi-word keyphrases with TextRank over a sparse word co-occurrence graph (requires NumPy).
+"""
+import numpy as np
+from .vocabulary import Vocabulary
+
+
+def textrank_scores(ids, sentence_ids, size, window=2, damping=0.85, max_iterations=50, tolerance=1e-6):
+    """
+    Score words with TextRank.
+
+    Words co-occurring within window positions of the same sentence are linked,
+    weighted by how often they co-occur, and the scores are found by power
+    iteration. Each iteration is one pass over the graph's edges, of which there
+    are at most (window - 1) per token.
+
+    Args:
+        ids: NumPy array of content word IDs, in order
+        sentence_ids: NumPy array of the sentence index of each word
+        size: Vocabulary size (one more than the largest ID)
+        window: Co-occurrence window, in words
+        damping: TextRank damping factor
+        max_iterations: Maximum number of power iterations
+        tolerance: Stop once no score changes by more than this
+
+    Returns:
+        NumPy array mapping word IDs to scores
+    """
+    sources, targets = [], []
+    for distance in range(1, window):
+        linked = (sentence_ids[:-distance] == sentence_ids[distance:]) & (ids[:-distance] != ids[distance:])
+        sources += [ids[:-distance][linked], ids[distance:][linked]]
+        targets += [ids[distance:][linked], ids[:-distance][linked]]
+
+    scores = np.full(size, 1 - damping)
+    if not sources or not sum(len(s) for s in sources):
+        return scores
+
+    # Coalesce repeated co-occurrences into weighted edges
+    edges, weights = np.unique(np.concatenate(sources) * size + np.concatenate(targets), return_counts=True)
+    sources, targets = edges // size, edges % size
+    out_weights = np.bincount(sources, weights=weights, minlength=size)
+    transitions = weights / out_weights[sources]
+
+    scores = np.ones(size)
+    for _ in range(max_iterations):
+        updated = (1 - damping) + damping * np.bincount(targets, weights=transitions * scores[sources], minlength=size)
+        converged = np.abs(updated - scores).max() <= tolerance
+        scores = updated
+        if converged:
+            break
+    return scores
+
+
+def rank_keyphrases(words, stop_words, window=2, damping=0.85, max_words=3):
+    """
+    Rank the keyphrases of tokenized text.
+
+    Candidate phrases are runs of up to max_words content words, broken by
+    stopwords, punctuation and sentence ends, as in RAKE. A phrase scores the
+    sum of its words' TextRank scores.
+
+    Args:
+        words: List of word lists, one per sentence
+        stop_words: Set of words that break phrases
+        window: Co-occurrence window, in words
+        damping: TextRank damping factor
+        max_words: Maximum number of words per phrase
+
+    Returns:
+        List of (phrase, score) tuples, best first
+    """
+    vocabulary = Vocabulary()
+    ids, sentence_ids, runs = [], [], []
+    run = []
+    for sentence_index, sentence in enumerate(words):
+        for word in sentence:
+            word = word.lower()
+            if word.isalnum() and len(word) > 2 and word not in stop_words:
+                run.append(len(ids))
+                ids.append(vocabulary.intern(word))
+                sentence_ids.append(sentence_index)
+            elif run:
+                runs.append(run)
+                run = []
+        if run:
+            runs.append(run)
+            run = []
+
+    if not ids:
+        return []
+    ids = np.array(ids, dtype=np.int64)
+    word_scores = textrank_scores(ids, np.array(sentence_ids), len(vocabulary), window, damping).tolist()
+
+    # Score each distinct phrase once; long runs contribute their max_words-word windows
+    phrase_scores = {}
+    tokens = vocabulary.tokens
+    id_list = ids.tolist()
+    for run in runs:
+        length = min(len(run), max_words)
+        for start in range(len(run) - length + 1):
+            phrase_ids = tuple(id_list[i] for i in run[start:start + length])
+            if phrase_ids not in phrase_scores:
+                phrase_scores[phrase_ids] = sum(word_scores[i] for i in phrase_ids)
+
+    ranked = sorted(phrase_scores.items(), key=lambda x: x[1], reverse=True)
+    return [(' '.join(tokens[i] for i in phrase_ids), score) for phrase_ids, score in ranked]
+
+
+def extract_keyphrases(words, stop_words, existing_keywords=None, threshold=0.5, n=20, **options):
+    """
+    Extract the best keyphrases of tokenized text.
+
+    Args:
+        words: List of word lists, one per sentence
+        stop_words: Set of words that break phrases
+        existing_keywords: Optional list of already known keywords to avoid duplicates
+        threshold: Minimum phrase score, relative to the best phrase's score
+        n: Maximum number of keyphrases to return
+        **options: Options for rank_keyphrases()
+
+    Returns:
+        List of keyphrases, best first
+    """
+    existing_keywords_lower = {k.lower() for k in existing_keywords or []}
+    ranked = rank_keyphrases(words, stop_words, **options)
+    if not ranked:
+        return []
+
+    best_score = ranked[0][1]
+    keyphrases = []
+    for phrase, score in ranked:
+        if score < threshold * best_score or len(keyphrases) >= n:
+            break
+        if phrase not in existing_keywords_lower:
+            keyphrases.append(phrase)
+    return keyphrases
@@ -0,0 +1,1024 @@
+"""
+Keyword Tracker Module
+
+Track keywords and their decaying importance over time.
+"""
+import os
+import json
+import math
+import mmap
+import time
+import heapq
+import struct
+import tempfile
+from bisect import bisect_left
+from contextlib import contextmanager
+from collections.abc import Mapping
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Bounds of the global decay scale; outside them the raw scores are renormalized
+# before the scale can lose precision or overflow
+MIN_SCALE = 1e-100
+MAX_SCALE = 1e100
+
+# Suffixes of the update journal and the lock file kept next to the persistence file
+JOURNAL_SUFFIX = '.journal'
+LOCK_SUFFIX = '.lock'
+
+# Version of the JSON snapshot format (version 1 files are a plain keyword dictionary)
+SNAPSHOT_FORMAT = 2
+
+# Binary snapshot layout (little-endian):
+#   header: magic, version, keyword count, string blob size, snapshot generation, scale,
+#           decay product, time of the last update (NaN if none), half-life (0 if none)
+#   offsets: (keyword count + 1) uint64 offsets of the UTF-8 keywords in the blob
+#   scores: keyword count float64 raw scores (importance = raw score * scale)
+#   index: keyword count uint32 entry numbers, ordered by their UTF-8 keywords
+#   blob: the concatenated keywords
+# Entries are stored by decreasing importance, so the top keywords come first.
+BINARY_MAGIC = b'CXKT'
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct('<4sIQQQdddd')
+
+
+def batch_increments(keywords, importance_increment=1.0, decay='batch'):
+    """
+    Turn a batch of keywords into (keyword, increment) pairs.
+
+    Args:
+        keywords: Mapping (such as a Counter) of keywords to counts, or an iterable of keywords
+        importance_increment: Importance added per count or occurrence
+        decay: 'batch' to merge repeated keywords, 'item' to keep every occurrence in order
+
+    Returns:
+        List of (keyword, increment) tuples
+    """
+    if decay not in KeywordTracker.DECAY_MODES:
+        raise ValueError(f"Unknown decay '{decay}', expected one of {KeywordTracker.DECAY_MODES}")
+    if isinstance(keywords, Mapping):
+        return [(keyword, count * importance_increment) for keyword, count in keywords.items()]
+    if decay == 'item':
+        return [(keyword, importance_increment) for keyword in keywords]
+    increments = {}
+    for keyword in keywords:
+        increments[keyword] = increments.get(keyword, 0.0) + importance_increment
+    return list(increments.items())
+
+
+class _KeywordHeap:
+    """
+    Indexed binary max-heap of keywords.
+
+    Keywords are ordered by raw score, then by first insertion, which is the
+    order of a stable sort by importance while the decay scale is positive.
+    The position index lets a keyword move up or down after its score changes.
+    """
+
+    def __init__(self, raw):
+        """
+        Initialize the heap.
+
+        Args:
+            raw: Dictionary mapping keywords to raw scores; it is read, not copied
+        """
+        self.raw = raw
+        self.sequence = dict(zip(raw, range(len(raw))))
+        # A sorted list is a valid heap; the stable sort keeps ties in insertion order
+        self.heap = sorted(raw, key=raw.__getitem__, reverse=True)
+        self.positions = dict(zip(self.heap, range(len(self.heap))))
+
+    def _higher(self, a, b):
+        raw_a, raw_b = self.raw[a], self.raw[b]
+        return raw_a > raw_b or (raw_a == raw_b and self.sequence[a] < self.sequence[b])
+
+    def _swap(self, i, j):
+        heap = self.heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self.positions[heap[i]] = i
+        self.positions[heap[j]] = j
+
+    def update(self, keyword):
+        """Restore the heap order after a keyword was added or its raw score changed."""
+        if keyword not in self.positions:
+            self.sequence[keyword] = len(self.sequence)
+            self.positions[keyword] = len(self.heap)
+            self.heap.append(keyword)
+
+        heap = self.heap
+        i = self.positions[keyword]
+        # Sift up
+        while i > 0 and self._higher(keyword, heap[(i - 1) // 2]):
+            self._swap(i, (i - 1) // 2)
+            i = (i - 1) // 2
+        # Sift down
+        while True:
+            child = 2 * i + 1
+            if child >= len(heap):
+                break
+            if child + 1 < len(heap) and self._higher(heap[child + 1], heap[child]):
+                child += 1
+            if not self._higher(heap[child], keyword):
+                break
+            self._swap(i, child)
+            i = child
+
+    def top(self, n):
+        """Get the n highest keywords in O(n log n), without modifying the heap."""
+        heap, raw, sequence = self.heap, self.raw, self.sequence
+        result = []
+        candidates = [(-raw[heap[0]], sequence[heap[0]], 0)] if heap else []
+        while candidates and len(result) < n:
+            _, _, i = heapq.heappop(candidates)
+            result.append(heap[i])
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    heapq.heappush(candidates, (-raw[heap[child]], sequence[heap[child]], child))
+        return result
+
+
+class KeywordTracker:
+    """
+    Track keywords and their importance over time.
+
+    Every update decays all existing keywords by decay_factor. Instead of
+    multiplying each score, the tracker stores raw scores and one global scale
+    (the product of all decay factors so far), so that importance = raw * scale.
+    An update multiplies the scale and adds importance_increment / scale to one
+    raw score, which makes it independent of the number of tracked keywords;
+    the raw scores are renormalized only when the scale drifts out of range.
+    Keywords are also kept in an indexed heap ordered by raw score, so an
+    update costs O(log K) and get_top_keywords(n) O(n log n) instead of a sort.
+
+    With a persistence file, updates are written behind: they are appended to a
+    journal (persistence_file + '.journal') when a flush is due, and the journal
+    is periodically compacted into an atomically replaced snapshot of all
+    scores. Loading replays the journal on top of the snapshot. Use the tracker
+    as a context manager, or call flush(), to write buffered updates.
+
+    With shared=True several processes can feed the same persistence file.
+    Each process applies its own updates locally at full speed; flushing
+    takes an advisory lock, merges the journal entries other processes wrote
+    since the last flush, and appends the local ones after them, so every
+    process converges on the same scores and no update is lost. Merging costs
+    only the new entries and the local pending updates, not a reload; a flush
+    without pending updates just picks up the other processes' updates.
+
+    Trackers are also mergeable: merge() adds another tracker's scores as if
+    its updates had followed this tracker's, so trackers fed with consecutive
+    shards of a stream can be reduced into the scores of the whole stream.
+
+    With half_life set, scores decay with wall-clock time instead of with the
+    number of updates: a score halves every half_life seconds. The elapsed
+    time decays every keyword by the same factor, so it goes into the global
+    scale as well; an update folds in the decay since the previous update,
+    and reads apply the decay since then without modifying anything, so no
+    background sweeps are needed. The time of each keyword's last update is
+    kept too. Journaled updates decay by the time between their timestamps,
+    so shared trackers decay each other's updates like their own.
+
+    Snapshots are JSON by default. With snapshot_format='binary' they use the
+    compact format of to_bytes(), which loads faster; it does not keep the
+    per-keyword update times. KeywordSnapshot opens such a file read-only
+    without loading it.
+    """
+
+    DECAY_MODES = ('batch', 'item')
+    SNAPSHOT_FORMATS = ('json', 'binary')
+
+    def __init__(self, persistence_file=None, flush_every=None, flush_interval=None, compact_every=10000,
+                 shared=False, half_life=None, clock=time.time, snapshot_format='json'):
+        """
+        Initialize the keyword tracker.
+
+        Args:
+            persistence_file: Optional file path to save/load keyword data
+            flush_every: Write buffered updates to the journal once this many are pending
+                         (defaults to 1, or 1000 with shared=True)
+            flush_interval: Also write them once this many seconds have passed since the
+                            last flush (checked on update)
+            compact_every: Compact the journal into a new snapshot once it holds this many updates
+            shared: Lock the persistence file and merge other processes' updates on flush
+            half_life: Optional half-life of scores in seconds, to decay them with time
+                       instead of by decay_factor on each update
+            clock: Function returning the current time in seconds, for half_life
+            snapshot_format: 'json' or 'binary' snapshots of the persistence file
+        """
+        if snapshot_format not in self.SNAPSHOT_FORMATS:
+            raise ValueError(f"Unknown snapshot format '{snapshot_format}', expected one of {self.SNAPSHOT_FORMATS}")
+        if shared and not persistence_file:
+            raise ValueError("A shared keyword tracker requires a persistence file")
+        if shared and fcntl is None:
+            raise ValueError("A shared keyword tracker requires fcntl file locking")
+
+        self._raw = {}  # Maps keywords to their importance scores divided by the scale
+        self._scale = 1.0
+        self._decay_product = 1.0  # Product of every decay factor applied so far
+        self._heap = _KeywordHeap(self._raw)
+        self.half_life = half_life
+        self.clock = clock
+        self._time = None  # Clock time of the last update, with half_life
+        self._last_update = {}  # Maps keywords to the clock time of their last update, with half_life
+        self.persistence_file = persistence_file
+        if flush_every is None:
+            flush_every = 1000 if shared else 1
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.compact_every = compact_every
+        self.shared = shared
+        self.snapshot_format = snapshot_format
+
+        self._pending = []  # Journal entries not yet written
+        self._journal_entries = 0  # Entries in the journal since the last snapshot
+        self._journal_offset = 0  # Bytes of the journal already applied
+        self._generation = 0  # Snapshot generation the journal applies to
+        self._last_flush = time.monotonic()
+        self._lock = None
+        self._lock_depth = 0
+
+        # Load existing data if available
+        if persistence_file and (os.path.exists(persistence_file) or os.path.exists(self.journal_file)):
+            with self._locked():
+                self._load()
+
+    @property
+    def keywords(self):
+        """Dictionary mapping keywords to their current importance scores."""
+        scale = self._current_scale()
+        return {keyword: raw * scale for keyword, raw in self._raw.items()}
+
+    @keywords.setter
+    def keywords(self, keywords):
+        self._raw = dict(keywords)
+        self._scale = 1.0
+        self._heap = _KeywordHeap(self._raw)
+
+    @property
+    def decay_product(self):
+        """Product of all decay factors applied so far, i.e. how much a score from the start has decayed."""
+        return self._decay_product
+
+    def __len__(self):
+        return len(self._raw)
+
+    def __contains__(self, keyword):
+        return keyword in self._raw
+
+    def get_importance(self, keyword):
+        """
+        Get the current importance of a keyword.
+
+        Args:
+            keyword: The keyword to look up
+
+        Returns:
+            Importance score (0.0 for untracked keywords)
+        """
+        return self._raw.get(keyword, 0.0) * self._current_scale()
+
+    def last_update(self, keyword):
+        """
+        Get the clock time a keyword was last updated at, with half_life.
+
+        Args:
+            keyword: The keyword to look up
+
+        Returns:
+            Clock time in seconds, or None for untracked keywords or without half_life
+        """
+        return self._last_update.get(keyword)
+
+    def export_scores(self, now=None):
+        """
+        Export the scores of all keywords at once.
+
+        The scores are computed in one vectorized multiplication of the raw
+        scores (when NumPy is available).
+
+        Args:
+            now: Clock time to decay the scores to, with half_life (defaults to the current time)
+
+        Returns:
+            Tuple of (list of keywords, NumPy float64 array of their scores, or a list without NumPy)
+        """
+        scale = self._current_scale(now)
+        keywords = list(self._raw)
+        if np is None:
+            return keywords, [raw * scale for raw in self._raw.values()]
+        return keywords, np.fromiter(self._raw.values(), dtype=np.float64, count=len(keywords)) * scale
+
+    def _current_scale(self, now=None):
+        """Get the global scale, decayed to the current (or given) time with half_life."""
+        if not self.half_life:
+            return self._scale
+        return self._scale * self._elapsed_decay(self.clock() if now is None else now)
+
+    def _elapsed_decay(self, now):
+        """Get the half-life decay factor between the last update and a clock time."""
+        if self._time is None:
+            return 1.0
+        return 0.5 ** (max(now - self._time, 0.0) / self.half_life)
+
+    def update_keyword(self, keyword, importance_increment=1.0, decay_factor=0.9):
+        """
+        Update the importance of a keyword.
+
+        Args:
+            keyword: The keyword to update
+            importance_increment: How much to increase importance
+            decay_factor: Factor to decay existing keywords (ignored with half_life)
+        """
+        entry = [keyword, importance_increment, decay_factor]
+        if self.half_life:
+            now = self.clock()
+            entry = [keyword, importance_increment, self._elapsed_decay(now), now]
+        self._apply(*entry)
+
+        # Journal the update if we have a persistence file
+        if self.persistence_file:
+            self._pending.append(entry)
+            if self._flush_due():
+                self.flush()
+
+    def update_keywords(self, keywords, importance_increment=1.0, decay_factor=0.9, decay='batch'):
+        """
+        Update the importance of a batch of keywords.
+
+        With decay='batch' the existing keywords decay once and then every
+        keyword in the batch gains its increment, so the batch counts as one
+        step. With decay='item' the result equals calling update_keyword() for
+        each item in turn (each mapping entry, or each occurrence of an
+        iterable). Either way the batch is journaled in one write. An empty
+        batch still decays the existing keywords with decay='batch'. With
+        half_life the whole batch is applied at the current time.
+
+        Args:
+            keywords: Mapping (such as a Counter) of keywords to counts, or an iterable of keywords
+            importance_increment: Importance added per count or occurrence
+            decay_factor: Factor to decay existing keywords, per batch or per item (ignored with half_life)
+            decay: 'batch' or 'item'
+        """
+        entries = []
+        increments = batch_increments(keywords, importance_increment, decay)
+        if not increments and decay == 'batch':
+            increments = [(None, 0.0)]  # A decay step without a keyword
+        timestamp = []
+        if self.half_life:
+            now = self.clock()
+            decay_factor, timestamp = self._elapsed_decay(now), [now]
+        for i, (keyword, increment) in enumerate(increments):
+            # Within a batch only the first entry decays; a factor of 1.0 leaves the scale untouched
+            factor = decay_factor if i == 0 or (decay == 'item' and not self.half_life) else 1.0
+            entry = [keyword, increment, factor] + timestamp
+            self._apply(*entry)
+            entries.append(entry)
+
+        if self.persistence_file and entries:
+            self._pending.extend(entries)
+            if self._flush_due():
+                self.flush()
+
+    def merge(self, other):
+        """
+        Merge another tracker's scores into this one.
+
+        The merged scores are those of this tracker's updates followed by the
+        other's: existing scores decay by other.decay_product, then the other
+        tracker's scores are added. Merging trackers of consecutive shards of
+        a stream, in order, therefore gives the scores of the whole stream
+        (merge is associative, but not commutative). The merge is journaled
+        like one update_keywords() batch. With half_life both trackers decay
+        with time, so they are aligned at the current time instead: this
+        tracker's scores decay to now and the other's current scores are added.
+
+        Args:
+            other: KeywordTracker to merge
+        """
+        if self.half_life:
+            self.update_keywords(other.keywords)
+        else:
+            self.update_keywords(other.keywords, decay_factor=other.decay_product)
+
+    @classmethod
+    def merge_all(cls, trackers):
+        """
+        Merge trackers in order into a new, in-memory tracker.
+
+        Args:
+            trackers: Iterable of KeywordTracker instances, in stream order
+
+        Returns:
+            KeywordTracker instance
+        """
+        merged = cls()
+        for tracker in trackers:
+            merged.merge(tracker)
+        return merged
+
+    def to_bytes(self):
+        """
+        Serialize the scores and decay state in the compact binary snapshot format.
+
+        Returns:
+            Bytes to pass to from_bytes(), or to open with KeywordSnapshot
+        """
+        # Entries by decreasing importance; the sort is stable, so ties stay in insertion order
+        sign = -1.0 if self._scale < 0 else 1.0
+        entries = sorted(self._raw.items(), key=lambda x: x[1] * sign, reverse=True)
+        keywords = [keyword.encode('utf-8') for keyword, _ in entries]
+        offsets = [0]
+        for keyword in keywords:
+            offsets.append(offsets[-1] + len(keyword))
+        index = sorted(range(len(keywords)), key=keywords.__getitem__)
+        time_value = math.nan if self._time is None else self._time
+        return b''.join([
+            BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(keywords), offsets[-1], self._generation,
+                               self._scale, self._decay_product, time_value, self.half_life or 0.0),
+            struct.pack(f'<{len(offsets)}Q', *offsets),
+            struct.pack(f'<{len(entries)}d', *(raw for _, raw in entries)),
+            struct.pack(f'<{len(index)}I', *index),
+            b''.join(keywords),
+        ])
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Create an in-memory tracker from to_bytes() output.
+
+        Args:
+            data: Bytes written by to_bytes()
+
+        Returns:
+            KeywordTracker instance
+        """
+        with KeywordSnapshot(data) as snapshot:
+            return snapshot.to_tracker()
+
+    def save_binary(self, file_path):
+        """
+        Atomically write a binary snapshot of the tracker, to open with KeywordSnapshot.
+
+        Args:
+            file_path: Path of the file to write
+        """
+        self._write_atomic(file_path, self.to_bytes())
+
+    def _restore(self, snapshot):
+        """Replace the scores and decay state with those of a KeywordSnapshot."""
+        self.keywords = snapshot.raw_items()
+        self._scale = snapshot.scale
+        self._decay_product = snapshot.decay_product
+        self._time = snapshot.time
+        self._last_update = {}
+        self._generation = snapshot.generation
+
+    def _apply(self, keyword, importance_increment, decay_factor, timestamp=None):
+        """
+        Apply one update to the scores (a keyword of None only decays them).
+
+        With half_life, timestamped updates decay the scores by the time since the
+        last update instead of by decay_factor, which was measured by the process
+        that wrote the update. An update older than the last one is added already
+        decayed to the time of the last one, so the order of updates does not matter.
+        """
+        if timestamp is not None and self.half_life:
+            if self._time is not None and timestamp < self._time:
+                decay_factor = 1.0
+                importance_increment *= 0.5 ** ((self._time - timestamp) / self.half_life)
+            else:
+                decay_factor = self._elapsed_decay(timestamp)
+
+        # Decay all existing keywords
+        self._decay(decay_factor)
+        if timestamp is not None:
+            self._time = timestamp if self._time is None else max(self._time, timestamp)
+            if keyword is not None:
+                self._last_update[keyword] = max(timestamp, self._last_update.get(keyword, timestamp))
+        if keyword is None:
+            return
+
+        # Update or add the new keyword
+        self._raw[keyword] = self._raw.get(keyword, 0.0) + importance_increment / self._scale
+        self._heap.update(keyword)
+
+    def _decay(self, decay_factor):
+        """Decay all keywords by multiplying the global scale."""
+        self._decay_product *= decay_factor
+        if decay_factor == 0:
+            # Nothing survives; the scale cannot represent this, so reset the scores
+            self.keywords = dict.fromkeys(self._raw, 0.0)
+            return
+
+        self._scale *= decay_factor
+        if not MIN_SCALE <= abs(self._scale) <= MAX_SCALE:
+            self._renormalize()
+
+    def _renormalize(self):
+        """Fold the global scale into the raw scores (in place, keeping the heap order)."""
+        raw, scale = self._raw, self._scale
+        for keyword in raw:
+            raw[keyword] *= scale
+        self._scale = 1.0
+
+    def get_top_keywords(self, n=20):
+        """
+        Get the top n keywords by importance.
+
+        Args:
+            n: Number of keywords to return
+
+        Returns:
+            List of (keyword, importance) tuples
+        """
+        if self._scale < 0:
+            # Negative decay factors flip the order of raw scores
+            return sorted(self.keywords.items(), key=lambda x: x[1], reverse=True)[:n]
+        scale = self._current_scale()
+        return [(keyword, self._raw[keyword] * scale) for keyword in self._heap.top(n)]
+
+    @property
+    def journal_file(self):
+        """Path of the update journal, or None without a persistence file."""
+        return self.persistence_file + JOURNAL_SUFFIX if self.persistence_file else None
+
+    @contextmanager
+    def _locked(self):
+        """Hold the shared tracker's file lock (a no-op unless shared; reentrant)."""
+        if not self.shared:
+            yield
+            return
+        if not self._lock_depth:
+            self._lock = open(self.persistence_file + LOCK_SUFFIX, 'a')
+            fcntl.flock(self._lock, fcntl.LOCK_EX)
+        self._lock_depth += 1
+        try:
+            yield
+        finally:
+            self._lock_depth -= 1
+            if not self._lock_depth:
+                fcntl.flock(self._lock, fcntl.LOCK_UN)
+                self._lock.close()
+                self._lock = None
+
+    def _flush_due(self):
+        """Check whether the flush policy calls for writing the pending updates."""
+        if len(self._pending) >= self.flush_every:
+            return True
+        return self.flush_interval is not None and time.monotonic() - self._last_flush >= self.flush_interval
+
+    def flush(self):
+        """Write pending updates to the journal, compacting it once it has grown large."""
+        if not self.persistence_file:
+            return
+        with self._locked():
+            if self.shared:
+                self._sync()
+            if self._pending:
+                self._append_journal(self._pending)
+                self._journal_entries += len(self._pending)
+                self._pending = []
+            self._last_flush = time.monotonic()
+            if self._journal_entries >= self.compact_every:
+                self._write_snapshot()
+
+    def compact(self):
+        """Write a snapshot of all scores and start a new, empty journal."""
+        if not self.persistence_file:
+            return
+        with self._locked():
+            if self.shared:
+                self._sync()
+            self._write_snapshot()
+
+    def close(self):
+        """Write all pending updates."""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _sync(self):
+        """Merge the journal entries other processes wrote since the last sync (holding the lock)."""
+        try:
+            generation, start, data = self._read_journal(self._journal_offset)
+        except FileNotFoundError:
+            return
+        if generation == self._generation and not data:
+            return
+
+        if generation != self._generation:
+            # Another process compacted the journal: reload the shared scores and
+            # apply the local updates after theirs
+            pending = self._pending
+            self._load()
+            for entry in pending:
+                self._apply(*entry)
+            self._pending = pending
+            return
+
+        entries, consumed, torn = self._parse_journal(data)
+        if self._pending and not self.half_life:
+            self._merge_before_pending(entries)
+        else:
+            # Either the scores are exactly what the journal held at the last sync, or they
+            # decay with time, which makes updates commute; either way, continue from here
+            for entry in entries:
+                self._apply(*entry)
+        self._journal_entries += len(entries)
+        self._journal_offset = start + consumed
+        if torn:
+            self._write_snapshot()
+
+    def _merge_before_pending(self, entries):
+        """
+        Apply journal entries as if they had come before the pending updates.
+
+        The scores are those at the last sync, decayed by the pending updates
+        (product d_p) plus the scores p the pending updates add on their own.
+        The entries decay the synced scores by d_f and add scores f, so the
+        merged scores are d_f * current + (1 - d_f) * p + d_p * f, which costs
+        the entries and pending updates only.
+
+        Args:
+            entries: Journal entries written by other processes since the last sync
+        """
+        foreign, local = self._replayed(entries), self._replayed(self._pending)
+        foreign_decay, local_decay = foreign.decay_product, local.decay_product
+        self._decay(foreign_decay)
+
+        scale = self._scale
+        additions = [(keyword, (1 - foreign_decay) * score) for keyword, score in local.keywords.items()]
+        additions += [(keyword, local_decay * score) for keyword, score in foreign.keywords.items()]
+        for keyword, score in additions:
+            self._raw[keyword] = self._raw.get(keyword, 0.0) + score / scale
+            self._heap.update(keyword)
+
+    @classmethod
+    def _replayed(cls, entries):
+        """Apply journal entries to a new, empty in-memory tracker."""
+        tracker = cls()
+        for entry in entries:
+            tracker._apply(*entry)
+        return tracker
+
+    def _write_snapshot(self):
+        """Save a snapshot of all scores, which covers pending updates too, and start a new journal."""
+        self._generation += 1
+        self._save()
+        self._start_journal()
+        self._pending = []
+
+    def _journal_header(self):
+        """Get the first line of a journal, naming the snapshot generation it applies to."""
+        return json.dumps({'generation': self._generation}) + '\n'
+
+    def _start_journal(self):
+        """Atomically replace the journal with an empty one for the current generation."""
+        header = self._journal_header()
+        self._write_atomic(self.journal_file, header)
+        self._journal_offset = len(header)
+        self._journal_entries = 0
+
+    def _append_journal(self, entries):
+        """Append entries to the journal, starting it if needed."""
+        lines = ''.join(json.dumps(entry) + '\n' for entry in entries)
+        if not os.path.exists(self.journal_file):
+            lines = self._journal_header() + lines
+        with open(self.journal_file, 'ab') as f:
+            f.write(lines.encode())
+            self._journal_offset = f.tell()
+
+    def _read_journal(self, offset):
+        """
+        Read the journal from a byte offset.
+
+        Args:
+            offset: Byte offset to read from; the header line is always skipped
+
+        Returns:
+            Tuple of (generation named in the header or None, offset read from, bytes read)
+        """
+        with open(self.journal_file, 'rb') as f:
+            header = f.readline()
+            start = max(offset, len(header))
+            f.seek(start)
+            data = f.read()
+        try:
+            generation = json.loads(header).get('generation')
+        except (json.JSONDecodeError, AttributeError):
+            generation = None
+        return generation, start, data
+
+    @staticmethod
+    def _parse_journal(data):
+        """
+        Parse journal entries.
+
+        Args:
+            data: Journal bytes holding one JSON entry per line
+
+        Returns:
+            Tuple of (list of entries, bytes parsed, whether a torn or corrupt line stopped parsing)
+        """
+        lines = data.split(b'\n')
+        entries = []
+        consumed = 0
+        for line in lines[:-1]:
+            try:
+                keyword, importance_increment, decay_factor, *timestamp = json.loads(line)
+            except (json.JSONDecodeError, ValueError):
+                return entries, consumed, True
+            entries.append([keyword, importance_increment, decay_factor] + timestamp)
+            consumed += len(line) + 1
+        # A last line without its newline is a write that was cut short
+        return entries, consumed, bool(lines[-1])
+
+    @staticmethod
+    def _write_atomic(file_path, data):
+        """Replace a file with new contents, so readers never see a partial file."""
+        directory = os.path.dirname(os.path.abspath(file_path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix=os.path.basename(file_path))
+        try:
+            with os.fdopen(fd, 'wb' if isinstance(data, bytes) else 'w') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, file_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def _save(self):
+        """Save a snapshot of the keyword data to the persistence file."""
+        if self.snapshot_format == 'binary':
+            self._write_atomic(self.persistence_file, self.to_bytes())
+            return
+        # Scores as of the last update; with half_life, reads decay them from that time
+        scale = self._scale
+        snapshot = {'format': SNAPSHOT_FORMAT, 'generation': self._generation,
+                    'keywords': {keyword: raw * scale for keyword, raw in self._raw.items()},
+                    'decay_product': self._decay_product}
+        if self._time is not None:
+            snapshot['time'] = self._time
+            snapshot['last_update'] = self._last_update
+        self._write_atomic(self.persistence_file, json.dumps(snapshot))
+
+    def _load(self):
+        """Load the keyword data snapshot and replay the journal on top of it."""
+        try:
+            with open(self.persistence_file, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = b''
+
+        if data.startswith(BINARY_MAGIC):
+            with KeywordSnapshot(data, self.persistence_file) as snapshot:
+                self._restore(snapshot)
+            self._replay_journal()
+            return
+
+        try:
+            data = json.loads(data) if data else {}
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            data = {}
+        if data.get('format') == SNAPSHOT_FORMAT and isinstance(data.get('keywords'), dict):
+            self.keywords = data['keywords']
+            self._generation = data['generation']
+            self._decay_product = data.get('decay_product', 1.0)
+            self._time = data.get('time')
+            self._last_update = data.get('last_update', {})
+        else:
+            self.keywords = data  # Plain keyword dictionary
+            self._generation = 0
+            self._decay_product = 1.0
+            self._time = None
+            self._last_update = {}
+
+        self._replay_journal()
+
+    def _replay_journal(self):
+        """Apply the journal's updates, if it belongs to the loaded snapshot."""
+        self._journal_entries = 0
+        self._journal_offset = 0
+        try:
+            generation, start, data = self._read_journal(0)
+        except FileNotFoundError:
+            return
+
+        if generation != self._generation:
+            # Left over from before a compaction, so already in the snapshot
+            self._start_journal()
+            return
+
+        entries, consumed, torn = self._parse_journal(data)
+        for entry in entries:
+            self._apply(*entry)
+        self._journal_entries = len(entries)
+        self._journal_offset = start + consumed
+        if torn:
+            # Start over from a snapshot so later appends stay readable
+            self._write_snapshot()
+
+
+class KeywordSnapshot:
+    """
+    Read-only view of a binary keyword tracker snapshot.
+
+    Loading a snapshot file memory-maps it and reads only its header, so it
+    takes the same time for any number of keywords. Keywords are decoded
+    lazily: lookups bisect the keyword index comparing UTF-8 bytes, and
+    get_top_keywords(n) decodes just the first n entries, which are stored by
+    decreasing importance. Half-life snapshots keep decaying on read.
+    """
+
+    def __init__(self, data, file_path=None, clock=time.time):
+        """
+        Open a snapshot held in a buffer.
+
+        Args:
+            data: Buffer holding a snapshot written by KeywordTracker.to_bytes()
+            file_path: Path the buffer was read from, for error messages
+            clock: Function returning the current time in seconds, for half-life snapshots
+        """
+        self.file_path = file_path
+        self.clock = clock
+        self._file = None
+        self._mmap = None
+        self._view = memoryview(data)
+        self._offsets = self._scores = self._index = None
+
+        if len(self._view) < BINARY_HEADER.size:
+            self.close()
+            raise ValueError(f"Unsupported keyword snapshot: {file_path}")
+        (magic, version, count, blob_size, self.generation, self.scale, self.decay_product,
+         time_value, half_life) = BINARY_HEADER.unpack_from(self._view, 0)
+        offsets_start = BINARY_HEADER.size
+        scores_start = offsets_start + (count + 1) * 8
+        index_start = scores_start + count * 8
+        self._blob_start = index_start + count * 4
+        if magic != BINARY_MAGIC or version != BINARY_VERSION or len(self._view) != self._blob_start + blob_size:
+            self.close()
+            raise ValueError(f"Unsupported keyword snapshot: {file_path}")
+
+        self.time = None if math.isnan(time_value) else time_value
+        self.half_life = half_life or None
+        self._count = count
+        self._offsets = self._view[offsets_start:scores_start].cast('Q')
+        self._scores = self._view[scores_start:index_start].cast('d')
+        self._index = self._view[index_start:self._blob_start].cast('I')
+
+    @classmethod
+    def load(cls, file_path, clock=time.time):
+        """
+        Open a binary snapshot file by memory-mapping it.
+
+        Args:
+            file_path: Path of a file written by KeywordTracker.save_binary()
+            clock: Function returning the current time in seconds, for half-life snapshots
+
+        Returns:
+            KeywordSnapshot instance
+        """
+        f = open(file_path, 'rb')
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            f.close()
+            raise ValueError(f"Unsupported keyword snapshot: {file_path}")
+        try:
+            snapshot = cls(mapped, file_path, clock)
+        except ValueError:
+            mapped.close()
+            f.close()
+            raise
+        snapshot._file = f
+        snapshot._mmap = mapped
+        return snapshot
+
+    def _keyword(self, entry):
+        """Get the UTF-8 encoded keyword of an entry."""
+        start = self._blob_start + self._offsets[entry]
+        end = self._blob_start + self._offsets[entry + 1]
+        return self._view[start:end].tobytes()
+
+    def _find(self, keyword):
+        """Get the entry number of a keyword, or None."""
+        key = keyword.encode('utf-8')
+        position = bisect_left(_SnapshotKeys(self), key)
+        if position < self._count and self._keyword(self._index[position]) == key:
+            return self._index[position]
+        return None
+
+    def _current_scale(self):
+        """Get the scale, decayed to the current time for half-life snapshots."""
+        if self.half_life is None or self.time is None:
+            return self.scale
+        return self.scale * 0.5 ** (max(self.clock() - self.time, 0.0) / self.half_life)
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, keyword):
+        return self._find(keyword) is not None
+
+    def get_importance(self, keyword):
+        """
+        Get the current importance of a keyword.
+
+        Args:
+            keyword: The keyword to look up
+
+        Returns:
+            Importance score (0.0 for untracked keywords)
+        """
+        entry = self._find(keyword)
+        return 0.0 if entry is None else self._scores[entry] * self._current_scale()
+
+    def get_top_keywords(self, n=20):
+        """
+        Get the top n keywords by importance.
+
+        Args:
+            n: Number of keywords to return
+
+        Returns:
+            List of (keyword, importance) tuples
+        """
+        scale = self._current_scale()
+        return [(self._keyword(entry).decode('utf-8'), self._scores[entry] * scale)
+                for entry in range(min(n, self._count))]
+
+    def items(self):
+        """Iterate over (keyword, importance) pairs, by decreasing importance."""
+        scale = self._current_scale()
+        return ((keyword, raw * scale) for keyword, raw in self.raw_items())
+
+    def raw_items(self):
+        """Iterate over (keyword, raw score) pairs, by decreasing importance."""
+        blob = self._view[self._blob_start:].tobytes()
+        offsets = self._offsets.tolist()
+        try:
+            # Byte offsets are character offsets in ASCII text, which is much faster to slice
+            blob = blob.decode('ascii')
+            keywords = (blob[offsets[i]:offsets[i + 1]] for i in range(self._count))
+        except UnicodeDecodeError:
+            keywords = (blob[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(self._count))
+        return zip(keywords, self._scores.tolist())
+
+    @property
+    def keywords(self):
+        """Dictionary mapping keywords to their current importance scores."""
+        return dict(self.items())
+
+    def to_tracker(self):
+        """
+        Load the snapshot into a new, in-memory KeywordTracker.
+
+        Returns:
+            KeywordTracker instance
+        """
+        tracker = KeywordTracker(half_life=self.half_life, clock=self.clock)
+        tracker._restore(self)
+        return tracker
+
+    def close(self):
+        """Release the buffer and the memory-mapped file, if any."""
+        # Views into the map must be released before it can be closed
+        for view in (self._offsets, self._scores, self._index, self._view):
+            if view is not None:
+                view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class _SnapshotKeys:
+    """Sequence view of a snapshot's keywords in UTF-8 order, for bisect."""
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    def __len__(self):
+        return self.snapshot._count
+
+    def __getitem__(self, position):
+        return self.snapshot._keyword(self.snapshot._index[position])
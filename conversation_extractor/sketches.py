@@ -0,0 +1,362 @@
+"""
+Heavy Hitter Sketches Module
+
+Bounded-memory, mergeable frequency sketches for mining dynamic keywords from huge corpora.
+"""
+import math
+import heapq
+import zlib
+from array import array
+from .extractor import load_conversation, map_file_chunks
+from .dynamic_keywords import IMPORTANCE_MARKERS, get_default_generator
+
+
+def _encode(item):
+    """Encode a word or word tuple as bytes for hashing."""
+    if isinstance(item, tuple):
+        item = ' '.join(item)
+    return item.encode('utf-8')
+
+
+class CountMinSketch:
+    """
+    Count-Min sketch of item frequencies.
+
+    Estimates never undercount; with probability 1 - delta they overcount by at
+    most epsilon times the total count. Hashes are deterministic, so sketches
+    built in different processes can be merged.
+    """
+
+    def __init__(self, width, depth):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            width: Number of counters per row
+            depth: Number of rows (hash functions)
+        """
+        self.width = width
+        self.depth = depth
+        self.table = array('Q', bytes(8 * width * depth))
+        self.total = 0
+
+    @classmethod
+    def from_error(cls, epsilon=0.0001, delta=0.01):
+        """
+        Create a sketch sized for an error bound.
+
+        Args:
+            epsilon: Maximum overcount, as a fraction of the total count
+            delta: Probability of exceeding that bound
+
+        Returns:
+            CountMinSketch instance
+        """
+        return cls(math.ceil(math.e / epsilon), math.ceil(math.log(1 / delta)))
+
+    def _indexes(self, item):
+        """Get the table index of an item in each row (double hashing)."""
+        data = _encode(item)
+        h1 = zlib.crc32(data)
+        h2 = zlib.adler32(data) | 1
+        width = self.width
+        return [row * width + (h1 + row * h2) % width for row in range(self.depth)]
+
+    def add(self, item, count=1):
+        """Add count occurrences of an item."""
+        table = self.table
+        for index in self._indexes(item):
+            table[index] += count
+        self.total += count
+
+    def estimate(self, item):
+        """Get the estimated count of an item (never an undercount)."""
+        table = self.table
+        return min(table[index] for index in self._indexes(item))
+
+    def merge(self, other):
+        """Add the counts of a sketch with the same dimensions."""
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("Cannot merge Count-Min sketches with different dimensions")
+        table = self.table
+        for index, count in enumerate(other.table):
+            if count:
+                table[index] += count
+        self.total += other.total
+
+
+class SpaceSaving:
+    """
+    Space-Saving summary of the most frequent items.
+
+    At most capacity items are tracked. Any item occurring more than
+    total / capacity times is guaranteed to be tracked, and tracked counts
+    overcount by at most the recorded error.
+    """
+
+    def __init__(self, capacity):
+        """
+        Initialize an empty summary.
+
+        Args:
+            capacity: Maximum number of tracked items
+        """
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.first_seen = {}  # Ties are broken by first occurrence, like Counter.most_common
+        self.total = 0
+        self._heap = []  # (count, first seen, item) entries; stale entries are skipped when popped
+        self._sequence = 0
+
+    def add(self, item, count=1):
+        """Add count occurrences of an item."""
+        self.total += count
+        counts = self.counts
+        if item in counts:
+            counts[item] += count
+        elif len(counts) < self.capacity:
+            counts[item] = count
+            self.errors[item] = 0
+            self._see(item)
+        else:
+            # Replace the least frequent item, inheriting its count as the error bound
+            minimum, evicted = self._pop_minimum()
+            del counts[evicted], self.errors[evicted], self.first_seen[evicted]
+            counts[item] = minimum + count
+            self.errors[item] = minimum
+            self._see(item)
+        self._push(item)
+
+    def _see(self, item):
+        self.first_seen[item] = self._sequence
+        self._sequence += 1
+
+    def _push(self, item):
+        heap = self._heap
+        heapq.heappush(heap, (self.counts[item], self.first_seen[item], item))
+        # Rebuild once stale entries dominate, to keep the heap bounded
+        if len(heap) > 4 * self.capacity + 16:
+            self._heap = [(count, self.first_seen[tracked], tracked) for tracked, count in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_minimum(self):
+        """Remove and return the current (count, item) with the smallest count."""
+        heap = self._heap
+        while True:
+            count, sequence, item = heapq.heappop(heap)
+            if self.counts.get(item) == count and self.first_seen.get(item) == sequence:
+                return count, item
+
+    def minimum(self):
+        """Get the smallest tracked count (0 while the summary is not full)."""
+        if len(self.counts) < self.capacity:
+            return 0
+        return min(self.counts.values())
+
+    def most_common(self, n=None):
+        """Get the tracked items as (item, count) tuples, most frequent first."""
+        items = sorted(self.counts.items(), key=lambda x: (-x[1], self.first_seen[x[0]]))
+        return items if n is None else items[:n]
+
+    def merge(self, other):
+        """
+        Merge another summary into this one.
+
+        Items missing from one summary are assumed to occur as often as that
+        summary's smallest count, which keeps counts upper bounds; the
+        capacity most frequent merged items are kept.
+        """
+        own_minimum, other_minimum = self.minimum(), other.minimum()
+        # Keep first occurrence order: this summary's items, then the other's new items
+        order = sorted(self.counts, key=self.first_seen.get) + \
+            sorted((item for item in other.counts if item not in self.counts), key=other.first_seen.get)
+        merged = {}
+        for item in order:
+            merged[item] = (
+                self.counts.get(item, own_minimum) + other.counts.get(item, other_minimum),
+                self.errors.get(item, own_minimum) + other.errors.get(item, other_minimum)
+            )
+        kept = set(sorted(order, key=lambda item: -merged[item][0])[:self.capacity])
+
+        self.counts = {}
+        self.errors = {}
+        self.first_seen = {}
+        self._sequence = 0
+        for item in order:
+            if item in kept:
+                self.counts[item], self.errors[item] = merged[item]
+                self._see(item)
+        self._heap = [(count, self.first_seen[item], item) for item, count in self.counts.items()]
+        heapq.heapify(self._heap)
+        self.total += other.total
+
+
+class HeavyHitterKeywordMiner:
+    """
+    Mine dynamic keywords from a stream of conversations in bounded memory.
+
+    Words, bigrams and the words following importance markers are tracked with
+    Space-Saving summaries, and word and bigram counts are tightened with
+    Count-Min sketches, so memory depends only on the configured capacity and
+    error bounds. Keywords are selected like generate_dynamic_keywords, except
+    that bigram candidates are the most frequent bigrams, as PMI needs exact
+    counts for the whole vocabulary. Miners from parallel workers can be merged.
+    """
+
+    def __init__(self, capacity=10000, epsilon=0.0001, delta=0.01, threshold=0.5,
+                 existing_keywords=None, generator=None):
+        """
+        Initialize the miner.
+
+        Args:
+            capacity: Number of words, bigrams and marker words tracked exactly
+            epsilon: Count-Min overcount bound, as a fraction of the total count
+            delta: Probability of exceeding the Count-Min bound
+            threshold: Importance threshold for considering a term as a keyword
+            existing_keywords: Optional list of already known keywords to avoid duplicates
+            generator: KeywordGenerator providing the tokenizer and stopwords
+                       (defaults to the shared generator)
+        """
+        self.generator = generator or get_default_generator()
+        self.threshold = threshold
+        self.existing_keywords_lower = {k.lower() for k in existing_keywords or []}
+        self.words = SpaceSaving(capacity)
+        self.bigrams = SpaceSaving(capacity)
+        self.marker_words = SpaceSaving(capacity)
+        self.word_sketch = CountMinSketch.from_error(epsilon, delta)
+        self.bigram_sketch = CountMinSketch.from_error(epsilon, delta)
+        self.documents = 0
+
+    @property
+    def total_words(self):
+        """Number of counted words (without stopwords) seen so far."""
+        return self.words.total
+
+    def feed(self, conversation_text):
+        """
+        Add one conversation to the sketches.
+
+        Args:
+            conversation_text: The conversation text
+        """
+        stop_words = self.generator.stop_words
+        sentences, words = self.generator.tokenize(conversation_text)
+        follows_marker = False
+        last_word = None
+
+        for sentence, sentence_words in zip(sentences, words):
+            for word in sentence_words:
+                if follows_marker and (word.isalnum() and len(word) > 3 and
+                                       word.lower() not in stop_words):
+                    self.marker_words.add(word)
+                if not (word.isalnum() and len(word) > 2):
+                    continue
+                word = word.lower()
+
+                if last_word is not None:
+                    bigram = (last_word, word)
+                    self.bigrams.add(bigram)
+                    self.bigram_sketch.add(bigram)
+                last_word = word
+
+                if word not in stop_words:
+                    self.words.add(word)
+                    self.word_sketch.add(word)
+
+            sentence_lower = sentence.lower()
+            follows_marker = any(marker in sentence_lower for marker in IMPORTANCE_MARKERS)
+
+        self.documents += 1
+
+    def merge(self, other):
+        """
+        Merge the sketches of another miner with the same settings.
+
+        Args:
+            other: HeavyHitterKeywordMiner instance
+        """
+        for name in ('words', 'bigrams', 'marker_words', 'word_sketch', 'bigram_sketch'):
+            getattr(self, name).merge(getattr(other, name))
+        self.documents += other.documents
+
+    def _ranked(self, summary, sketch, n):
+        """Get the n most frequent tracked items with their tightest count estimates."""
+        estimates = [(item, min(count, sketch.estimate(item))) for item, count in summary.most_common()]
+        estimates.sort(key=lambda x: x[1], reverse=True)
+        return estimates[:n]
+
+    def keywords(self, n=20):
+        """
+        Get the keywords mined so far.
+
+        Args:
+            n: Maximum number of keywords to return
+
+        Returns:
+            List of keywords, longest first
+        """
+        total_words = self.total_words
+        potential_keywords = []
+        if total_words:
+            # Add important single words
+            for word, count in self._ranked(self.words, self.word_sketch, 30):
+                if word not in self.existing_keywords_lower and count / total_words > self.threshold / 4:
+                    potential_keywords.append(word)
+
+            # Add important bigrams
+            for (w1, w2), count in self._ranked(self.bigrams, self.bigram_sketch, 20):
+                bigram = f"{w1} {w2}"
+                if (count >= 2 and bigram not in self.existing_keywords_lower and
+                        count / total_words > self.threshold / 2):
+                    potential_keywords.append(bigram)
+
+        # Add the most frequent marker words that are not already keywords
+        potential_keywords_lower = {k.lower() for k in potential_keywords}
+        for word, _ in self.marker_words.most_common():
+            word_lower = word.lower()
+            if word_lower not in self.existing_keywords_lower and word_lower not in potential_keywords_lower:
+                potential_keywords.append(word)
+                potential_keywords_lower.add(word_lower)
+
+        # Remove duplicates and sort by length (preferring longer keywords)
+        unique_keywords = sorted(set(potential_keywords), key=len, reverse=True)
+        return unique_keywords[:n]
+
+
+def _mine_files(file_paths, options):
+    """Mine a group of files into a new miner."""
+    miner = HeavyHitterKeywordMiner(**options)
+    for file_path in file_paths:
+        miner.feed(load_conversation(file_path))
+    return miner
+
+
+def mine_corpus_keywords(file_paths, capacity=10000, epsilon=0.0001, delta=0.01, threshold=0.5,
+                         existing_keywords=None, generator=None, workers=None, files_per_task=16):
+    """
+    Mine dynamic keywords across conversation files in bounded memory.
+
+    Args:
+        file_paths: Iterable of conversation file paths
+        capacity: Number of words, bigrams and marker words tracked exactly
+        epsilon: Count-Min overcount bound, as a fraction of the total count
+        delta: Probability of exceeding the Count-Min bound
+        threshold: Importance threshold for considering a term as a keyword
+        existing_keywords: Optional list of already known keywords to avoid duplicates
+        generator: KeywordGenerator providing the tokenizer and stopwords
+                   (defaults to the shared generator)
+        workers: Number of worker processes (None or 1 mines in the current process)
+        files_per_task: Number of files mined by each task
+
+    Returns:
+        HeavyHitterKeywordMiner with the merged sketches; call keywords() for the ranked list
+    """
+    options = {
+        'capacity': capacity, 'epsilon': epsilon, 'delta': delta, 'threshold': threshold,
+        'existing_keywords': existing_keywords, 'generator': generator or get_default_generator()
+    }
+    total = HeavyHitterKeywordMiner(**options)
+
+    map_file_chunks(_mine_files, file_paths, options, total.merge, workers, files_per_task)
+    return total
@@ -0,0 +1,239 @@
+"""
+SQLite Keyword Tracker Module
+
+Track keyword importance in an SQLite database, for histories too large to load into memory.
+"""
+import math
+import sqlite3
+from .keyword_tracker import batch_increments
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS keywords (
+    keyword TEXT PRIMARY KEY,
+    sign INTEGER NOT NULL,
+    log_raw REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS keywords_by_score ON keywords (sign DESC, (sign * log_raw) DESC);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value
+);
+"""
+
+
+def _signed_log(value):
+    """Split a number into (sign, log of its magnitude); zero is (0, 0.0)."""
+    if not value:
+        return 0, 0.0
+    return (1 if value > 0 else -1), math.log(abs(value))
+
+
+def _log_sum(sign_a, log_a, sign_b, log_b):
+    """
+    Add two numbers given as (sign, log of magnitude) pairs.
+
+    Returns:
+        Tuple of (sign, log of magnitude) of the sum
+    """
+    if not sign_b:
+        return sign_a, log_a
+    if not sign_a:
+        return sign_b, log_b
+    if log_a < log_b:
+        sign_a, log_a, sign_b, log_b = sign_b, log_b, sign_a, log_a
+    if sign_a == sign_b:
+        return sign_a, log_a + math.log1p(math.exp(log_b - log_a))
+    remainder = -math.expm1(log_b - log_a)  # 1 - |b| / |a|
+    if remainder <= 0:
+        return 0, 0.0
+    return sign_a, log_a + math.log(remainder)
+
+
+class SQLiteKeywordTracker:
+    """
+    Track keywords and their importance in an SQLite database.
+
+    Offers the same interface as KeywordTracker. Scores decay lazily the same
+    way: the database holds raw scores and the global decay scale, so an update
+    touches one row, and rows are indexed by raw score so get_top_keywords(n)
+    reads the first n entries of the index. Raw scores and the scale are stored
+    as a sign and a logarithm, so the scale never leaves the range of a float
+    and decays never rewrite the table, however many keywords it holds.
+    Opening a tracker reads no keywords. Updates are buffered and written in
+    one transaction per batch; reads flush the buffer first. The database uses
+    write-ahead logging, so readers in other processes do not block the writer.
+    """
+
+    def __init__(self, database_file, batch_size=1000):
+        """
+        Initialize the tracker, creating the database if needed.
+
+        Args:
+            database_file: Path of the SQLite database
+            batch_size: Number of updates written per transaction
+        """
+        self.database_file = database_file
+        self.batch_size = batch_size
+        self._connection = sqlite3.connect(database_file)
+        self._connection.create_function('log_sum_sign', 4, lambda *pairs: _log_sum(*pairs)[0], deterministic=True)
+        self._connection.create_function('log_sum_log', 4, lambda *pairs: _log_sum(*pairs)[1], deterministic=True)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        with self._connection:
+            self._connection.executescript(SCHEMA)
+            self._connection.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('scale_sign', 1)")
+            self._connection.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('log_scale', 0.0)")
+        meta = dict(self._connection.execute("SELECT key, value FROM meta"))
+        self._scale_sign = meta['scale_sign']
+        self._log_scale = meta['log_scale']
+
+        self._pending = {}  # Maps keywords to (sign, log) raw score increments not yet written
+        self._pending_updates = 0
+
+    def update_keyword(self, keyword, importance_increment=1.0, decay_factor=0.9):
+        """
+        Update the importance of a keyword.
+
+        Args:
+            keyword: The keyword to update
+            importance_increment: How much to increase importance
+            decay_factor: Factor to decay existing keywords
+        """
+        self._decay(decay_factor)
+        self._add(keyword, importance_increment)
+        if self._pending_updates >= self.batch_size:
+            self.flush()
+
+    def update_keywords(self, keywords, importance_increment=1.0, decay_factor=0.9, decay='batch'):
+        """
+        Update the importance of a batch of keywords, like KeywordTracker.update_keywords().
+
+        Args:
+            keywords: Mapping (such as a Counter) of keywords to counts, or an iterable of keywords
+            importance_increment: Importance added per count or occurrence
+            decay_factor: Factor to decay existing keywords, per batch or per item
+            decay: 'batch' or 'item'
+        """
+        increments = batch_increments(keywords, importance_increment, decay)
+        if not increments and decay == 'batch':
+            increments = [(None, 0.0)]  # A decay step without a keyword
+        for i, (keyword, increment) in enumerate(increments):
+            if decay == 'item' or i == 0:
+                self._decay(decay_factor)
+            if keyword is not None:
+                self._add(keyword, increment)
+        if self._pending_updates >= self.batch_size:
+            self.flush()
+
+    def _decay(self, decay_factor):
+        """Decay all keywords by multiplying the global scale."""
+        if decay_factor == 0:
+            self._reset_scores()
+            return
+        sign, log_factor = _signed_log(decay_factor)
+        self._scale_sign *= sign
+        self._log_scale += log_factor
+
+    def _add(self, keyword, importance_increment):
+        """Buffer an increment of one keyword's importance."""
+        # raw = importance / scale
+        sign, log_increment = _signed_log(importance_increment)
+        increment = (sign * self._scale_sign, log_increment - self._log_scale)
+        self._pending[keyword] = _log_sum(*self._pending.get(keyword, (0, 0.0)), *increment)
+        self._pending_updates += 1
+
+    def _reset_scores(self):
+        """Set every score to zero, after a decay factor of zero."""
+        self.flush()
+        with self._connection:
+            self._connection.execute('UPDATE keywords SET sign = 0, log_raw = 0.0')
+            self._scale_sign = 1
+            self._log_scale = 0.0
+            self._write_scale()
+
+    def _write_scale(self):
+        self._connection.executemany("UPDATE meta SET value = ? WHERE key = ?",
+                                     [(self._scale_sign, 'scale_sign'), (self._log_scale, 'log_scale')])
+
+    def _importance(self, sign, log_raw):
+        """Get the importance of a raw score given as a sign and a logarithm."""
+        if not sign:
+            return 0.0
+        try:
+            return sign * self._scale_sign * math.exp(log_raw + self._log_scale)
+        except OverflowError:
+            return sign * self._scale_sign * math.inf
+
+    def flush(self):
+        """Write the buffered updates in one transaction."""
+        with self._connection:
+            if self._pending:
+                self._connection.executemany(
+                    'INSERT INTO keywords (keyword, sign, log_raw) VALUES (?, ?, ?) '
+                    'ON CONFLICT (keyword) DO UPDATE SET '
+                    'sign = log_sum_sign(sign, log_raw, excluded.sign, excluded.log_raw), '
+                    'log_raw = log_sum_log(sign, log_raw, excluded.sign, excluded.log_raw)',
+                    ((keyword, sign, log_raw) for keyword, (sign, log_raw) in self._pending.items())
+                )
+            self._write_scale()
+        self._pending = {}
+        self._pending_updates = 0
+
+    def close(self):
+        """Write the buffered updates and close the database."""
+        self.flush()
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        self.flush()
+        return self._connection.execute('SELECT COUNT(*) FROM keywords').fetchone()[0]
+
+    def __contains__(self, keyword):
+        if keyword in self._pending:
+            return True
+        return self._connection.execute('SELECT 1 FROM keywords WHERE keyword = ?', (keyword,)).fetchone() is not None
+
+    @property
+    def keywords(self):
+        """Dictionary mapping keywords to their current importance scores."""
+        self.flush()
+        rows = self._connection.execute('SELECT keyword, sign, log_raw FROM keywords ORDER BY rowid')
+        return {keyword: self._importance(sign, log_raw) for keyword, sign, log_raw in rows}
+
+    def get_importance(self, keyword):
+        """
+        Get the current importance of a keyword.
+
+        Args:
+            keyword: The keyword to look up
+
+        Returns:
+            Importance score (0.0 for untracked keywords)
+        """
+        row = self._connection.execute('SELECT sign, log_raw FROM keywords WHERE keyword = ?', (keyword,)).fetchone()
+        return self._importance(*_log_sum(*(row or (0, 0.0)), *self._pending.get(keyword, (0, 0.0))))
+
+    def get_top_keywords(self, n=20):
+        """
+        Get the top n keywords by importance.
+
+        Args:
+            n: Number of keywords to return
+
+        Returns:
+            List of (keyword, importance) tuples
+        """
+        self.flush()
+        # Negative decay factors flip the order of raw scores
+        order = 'DESC' if self._scale_sign > 0 else 'ASC'
+        rows = self._connection.execute(
+            f'SELECT keyword, sign, log_raw FROM keywords ORDER BY sign {order}, (sign * log_raw) {order}, rowid '
+            'LIMIT ?', (n,)
+        )
+        return [(keyword, self._importance(sign, log_raw)) for keyword, sign, log_raw in rows]
@@ -0,0 +1,229 @@
+"""
+Tokenizer Module
+
+Regex-based sentence and word tokenizers that need no NLTK data, and parallel tokenization of large texts.
+"""
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from .extractor import SPEAKER_PATTERN
+
+# Default size of the chunks tokenized in parallel, in characters
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Fenced code blocks (``` ... ```), including an unterminated block at the end of the text
+CODE_FENCE_PATTERN = re.compile(r'^[ \t]*```.*?(?:^[ \t]*```[^\n]*$|\Z)', re.MULTILINE | re.DOTALL)
+
+# Sentence boundaries: terminal punctuation followed by whitespace
+SENTENCE_BOUNDARY_PATTERN = re.compile(r'(?<=[.!?])\s+')
+
+# URLs, dotted names, contraction suffixes (as split by NLTK), words and punctuation
+WORD_PATTERN = re.compile(
+    # URLs stay a single (non-alphanumeric) token, without trailing sentence punctuation
+    r"(?:https?://|www\.)\S+?(?=[.,;:!?)\]'\"]*(?:\s|$))"
+    r"|\w+(?:\.\w+)+"          # "app.py", "os.path.join"
+    r"|\w+(?=n't\b)|n't"       # "don't" -> "do", "n't"
+    r"|'\w+"                   # "it's" -> "it", "'s"
+    r"|\w+"
+    r"|[^\w\s]"
+)
+
+
+def split_sentences(text):
+    """Split text into sentences on terminal punctuation, without NLTK."""
+    return [s.strip() for s in re.split(r'[.!?]+', text) if s.strip()]
+
+
+def split_words(sentence):
+    """Split a sentence into words, without NLTK."""
+    return re.findall(r'\w+', sentence)
+
+
+class FastTokenizer:
+    """
+    Precompiled regex tokenizer tuned for chat transcripts.
+
+    Unlike the punctuation-splitting fallback it keeps fenced code blocks apart from
+    prose (one sentence per code line), treats every line of a message as ending a
+    sentence, removes speaker labels such as "USER:" and keeps URLs and dotted names
+    like "app.py" in one piece.
+    """
+
+    def __init__(self, keep_labels=()):
+        """
+        Initialize the tokenizer.
+
+        Args:
+            keep_labels: Lowercase terms; labels containing one (such as "IMPORTANT:")
+                         are kept as text instead of being removed as speaker labels
+        """
+        self.keep_labels = tuple(keep_labels)
+
+    def sent_tokenize(self, text):
+        """
+        Split chat text into sentences.
+
+        Args:
+            text: The text to split
+
+        Returns:
+            List of sentences
+        """
+        sentences = []
+        position = 0
+        for fence in CODE_FENCE_PATTERN.finditer(text):
+            self._split_prose(text[position:fence.start()], sentences)
+            # Skip the fence markers themselves
+            lines = fence.group().split('\n')[1:]
+            if lines and lines[-1].lstrip().startswith('```'):
+                lines.pop()
+            sentences.extend(line.strip() for line in lines if line.strip())
+            position = fence.end()
+        self._split_prose(text[position:], sentences)
+        return sentences
+
+    def _split_prose(self, text, sentences):
+        """Split prose into sentences, appending them to sentences."""
+        for line in text.split('\n'):
+            line = line.strip()
+            label = SPEAKER_PATTERN.match(line)
+            if label and not any(term in label.group().lower() for term in self.keep_labels):
+                line = line[label.end():].strip()
+            if line:
+                sentences.extend(s for s in SENTENCE_BOUNDARY_PATTERN.split(line) if s)
+
+    def word_tokenize(self, sentence):
+        """
+        Split a sentence into word, punctuation and URL tokens.
+
+        Args:
+            sentence: The sentence to split
+
+        Returns:
+            List of tokens
+        """
+        return WORD_PATTERN.findall(sentence)
+
+
+def split_chunks(text, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Split text into chunks that can be tokenized independently.
+
+    Chunks end just before a speaker turn or a blank line once they hold at
+    least chunk_size characters, and never inside a fenced code block.
+
+    Args:
+        text: The text to split
+        chunk_size: Minimum chunk size, in characters
+
+    Yields:
+        Consecutive chunks that join back into the text
+    """
+    lines = []
+    size = 0
+    in_fence = False
+    for line in text.splitlines(keepends=True):
+        stripped = line.strip()
+        if size >= chunk_size and not in_fence and (not stripped or SPEAKER_PATTERN.match(stripped)):
+            yield ''.join(lines)
+            lines = []
+            size = 0
+        lines.append(line)
+        size += len(line)
+        if stripped.startswith('```'):
+            in_fence = not in_fence
+    if lines:
+        yield ''.join(lines)
+
+
+# Per-process tokenize function for tokenization workers, set by _init_tokenize_worker
+_worker_tokenize = None
+
+
+def _init_tokenize_worker(tokenize):
+    """Initialize a tokenization worker process, loading the tokenizer's resources once."""
+    global _worker_tokenize
+    _worker_tokenize = tokenize
+
+
+# Separators used to send tokenized chunks back as two strings, which pickle much
+# faster than lists of strings; both are whitespace, so tokens never contain them
+_SENTENCE_SEPARATOR = '\x1e'
+_WORD_SEPARATOR = '\x1f'
+
+
+def _tokenize_chunk(chunk):
+    """Tokenize one chunk in a worker process."""
+    sentences, words = _worker_tokenize(chunk)
+    if _SENTENCE_SEPARATOR in chunk or _WORD_SEPARATOR in chunk:
+        return sentences, words
+    return (_SENTENCE_SEPARATOR.join(sentences),
+            _SENTENCE_SEPARATOR.join(_WORD_SEPARATOR.join(sentence_words) for sentence_words in words))
+
+
+def _unpack_chunk(result):
+    """Get the sentences and word lists of a tokenized chunk."""
+    sentences, words = result
+    if not isinstance(sentences, str):
+        return sentences, words
+    if not sentences:
+        return [], []
+    return (sentences.split(_SENTENCE_SEPARATOR),
+            [sentence_words.split(_WORD_SEPARATOR) if sentence_words else []
+             for sentence_words in words.split(_SENTENCE_SEPARATOR)])
+
+
+def tokenize_executor(tokenize, workers):
+    """
+    Create a process pool for tokenize_parallel() that can be reused across texts.
+
+    Each worker loads the tokenizer's resources once, when it starts.
+
+    Args:
+        tokenize: Picklable function (or bound method) taking a text and returning
+                  (list of sentences, list of word lists)
+        workers: Number of worker processes
+
+    Returns:
+        ProcessPoolExecutor instance; shut it down when done
+    """
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_tokenize_worker, initargs=(tokenize,))
+
+
+def tokenize_parallel(text, tokenize, workers, chunk_size=DEFAULT_CHUNK_SIZE, max_pending=None, executor=None):
+    """
+    Tokenize a large text in a process pool.
+
+    The text is split with split_chunks() and each chunk is tokenized in a
+    worker; results are yielded in text order.
+
+    Args:
+        text: The text to tokenize
+        tokenize: Picklable function (or bound method) taking a text and returning
+                  (list of sentences, list of word lists)
+        workers: Number of worker processes
+        chunk_size: Minimum chunk size, in characters
+        max_pending: Maximum number of chunks in flight (default: workers * 2)
+        executor: Optional pool from tokenize_executor() for the same tokenize function,
+                  to reuse instead of starting a new one
+
+    Yields:
+        Tuple of (list of sentences, list of word lists) per chunk
+    """
+    if executor is None:
+        with tokenize_executor(tokenize, workers) as executor:
+            yield from tokenize_parallel(text, tokenize, workers, chunk_size, max_pending, executor)
+        return
+
+    max_pending = max_pending or workers * 2
+    pending = deque()
+    try:
+        for chunk in split_chunks(text, chunk_size):
+            pending.append(executor.submit(_tokenize_chunk, chunk))
+            if len(pending) >= max_pending:
+                yield _unpack_chunk(pending.popleft().result())
+        while pending:
+            yield _unpack_chunk(pending.popleft().result())
+    finally:
+        for future in pending:
+            future.cancel()
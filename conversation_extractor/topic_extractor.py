@@ -3,9 +3,13 @@ Topic Extractor Module
 
 Extract and group conversation topics based on keywords.
 """
-from collections import defaultdict
-from .extractor import extract_context
-from .dynamic_keywords import generate_dynamic_keywords, KeywordTracker
+import os
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from .extractor import load_conversation
+from .categories import TopicCategorySet
+from .dynamic_keywords import (generate_dynamic_keywords, get_default_generator, KeywordTracker,
+                               DEFAULT_GENERATOR_CONFIG)
 
 # Define topic categories and their associated keywords
 DEFAULT_TOPIC_CATEGORIES = {
@@ -42,70 +46,271 @@ DEFAULT_TOPIC_CATEGORIES = {
     ]
 }
 
+class TopicMatch:
+    """
+    A line matched by one or more keywords of a topic category.
 
-def extract_topics(conversation_text, topic_categories=None, context_lines=3, enable_dynamic=True, threshold=0.5):
+    Unpacks like a (keyword, matched_line, context) tuple, where keyword is the
+    first keyword of the category that matched the line, and compares equal to
+    that tuple. Matches are hashable, so they can be collected in sets.
+    """
+
+    __slots__ = ('keywords', 'line_number', 'matched_line', 'context')
+
+    def __init__(self, keywords, line_number, matched_line, context):
+        """
+        Initialize the match.
+
+        Args:
+            keywords: Keywords of the category that matched the line, in category order
+            line_number: Zero-based index of the matched line
+            matched_line: The matched line
+            context: The matched line with its surrounding context lines
+        """
+        self.keywords = keywords
+        self.line_number = line_number
+        self.matched_line = matched_line
+        self.context = context
+
+    @property
+    def keyword(self):
+        """The first keyword that matched the line."""
+        return self.keywords[0]
+
+    def _as_tuple(self):
+        return (self.keywords[0], self.matched_line, self.context)
+
+    def __iter__(self):
+        return iter(self._as_tuple())
+
+    def __len__(self):
+        return 3
+
+    def __getitem__(self, index):
+        return self._as_tuple()[index]
+
+    def __eq__(self, other):
+        if isinstance(other, tuple):
+            return self._as_tuple() == other
+        if not isinstance(other, TopicMatch):
+            return NotImplemented
+        return (self.keywords == other.keywords and self.line_number == other.line_number and
+                self.matched_line == other.matched_line and self.context == other.context)
+
+    def __hash__(self):
+        return hash((tuple(self.keywords), self.line_number, self.matched_line, tuple(self.context)))
+
+    def __repr__(self):
+        return f"TopicMatch(keywords={self.keywords!r}, line_number={self.line_number!r})"
+
+
+# Category that holds the keywords found by dynamic keyword generation
+DYNAMIC_TOPICS_CATEGORY = "Dynamic Topics"
+
+# Compiled form of DEFAULT_TOPIC_CATEGORIES, built on first use
+_default_category_set = None
+
+
+def _resolve_categories(topic_categories):
+    """
+    Get the compiled category set for the topic categories passed to extract_topics.
+
+    Args:
+        topic_categories: TopicCategorySet, dictionary of categories, or None for the defaults
+
+    Returns:
+        TopicCategorySet instance
+    """
+    global _default_category_set
+    if topic_categories is None:
+        if _default_category_set is None:
+            _default_category_set = TopicCategorySet(DEFAULT_TOPIC_CATEGORIES)
+        return _default_category_set
+    return TopicCategorySet.coerce(topic_categories)
+
+
+def extract_topics(conversation_text, topic_categories=None, context_lines=3, enable_dynamic=True, threshold=0.5,
+                   cache=None, keyword_generator=None):
     """
     Extract and group conversation topics based on predefined categories.
 
     Args:
         conversation_text: The conversation text to analyze
-        topic_categories: Dictionary mapping topic categories to lists of keywords
-                         (defaults to DEFAULT_TOPIC_CATEGORIES if None)
+        topic_categories: Dictionary mapping topic categories to lists of keywords, or a
+                         precompiled TopicCategorySet (defaults to DEFAULT_TOPIC_CATEGORIES if None)
         context_lines: Number of context lines to include
         enable_dynamic: Whether to enable dynamic keyword generation
         threshold: Importance threshold for considering a term as a keyword
+        cache: Optional TopicResultCache to reuse results for unchanged conversations; results
+               of the shared default generator are cached under its name, so clear the cache
+               after installing NLTK data
+        keyword_generator: Optional KeywordGenerator to use for dynamic keywords
 
     Returns:
-        Dictionary mapping topic categories to their extracted contexts
+        Dictionary mapping topic categories to lists of TopicMatch objects, one per
+        matched line, ordered by line number
     """
-    # Use default categories if none provided
-    if topic_categories is None:
-        topic_categories = DEFAULT_TOPIC_CATEGORIES.copy()
-    else:
-        topic_categories = topic_categories.copy()
+    category_set = _resolve_categories(topic_categories)
+
+    # Serve repeated runs on unchanged conversations from the cache, before creating a generator
+    if cache is not None:
+        generator_config = None
+        if enable_dynamic:
+            generator_config = keyword_generator.config if keyword_generator else DEFAULT_GENERATOR_CONFIG
+        cache_key = cache.make_key(conversation_text, category_set, context_lines, enable_dynamic, threshold,
+                                   generator_config)
+        cached_results = cache.get(cache_key)
+        if cached_results is not None:
+            return cached_results
+
+    if enable_dynamic and keyword_generator is None:
+        keyword_generator = get_default_generator()
 
     # Initialize results dictionary
     topic_results = defaultdict(list)
 
-    # Flatten existing keywords to check for duplicates
-    all_existing_keywords = []
-    for keywords in topic_categories.values():
-        all_existing_keywords.extend(keywords)
+    # Find the matching lines of every keyword in a single pass over the categories
+    lines = conversation_text.split('\n')
+    keyword_lines = category_set.match_lines(lines)
+    categories = dict(category_set.categories)
 
     # Generate dynamic keywords if enabled
     if enable_dynamic:
-        dynamic_keywords = generate_dynamic_keywords(
+        dynamic_keywords = keyword_generator.generate(
             conversation_text,
-            existing_keywords=all_existing_keywords,
+            existing_keywords=category_set.keywords,
             threshold=threshold
         )
 
         # Add a new category for dynamic keywords
         if dynamic_keywords:
-            topic_categories["Dynamic Topics"] = dynamic_keywords
+            dynamic_set = TopicCategorySet({DYNAMIC_TOPICS_CATEGORY: dynamic_keywords})
+            categories[DYNAMIC_TOPICS_CATEGORY] = dynamic_set.categories[DYNAMIC_TOPICS_CATEGORY]
+            keyword_lines.update(dynamic_set.match_lines(lines))
 
     # Process each topic category
-    for category, keywords in topic_categories.items():
-        # Extract context for all keywords in this category
-        results = extract_context(conversation_text, keywords, context_lines)
-
-        # If we found matches, add them to the category
-        if results:
-            for keyword, matches in results.items():
-                for matched_line, context in matches:
-                    # Add the match to the category results
-                    # Include the keyword that matched
-                    topic_results[category].append((keyword, matched_line, context))
+    for category, keywords in categories.items():
+        # Group the keywords of this category by the line they matched
+        line_keywords = {}
+        for keyword in keywords:
+            for i in keyword_lines.get(keyword.lower(), ()):
+                line_keywords.setdefault(i, []).append(keyword)
+
+        for i in sorted(line_keywords):
+            # Get context lines before and after the match
+            start = max(0, i - context_lines)
+            end = min(len(lines), i + context_lines + 1)
+
+            # Add one match per line, listing every keyword that matched it
+            topic_results[category].append(TopicMatch(line_keywords[i], i, lines[i], lines[start:end]))
+
+    if cache is not None:
+        cache.put(cache_key, topic_results)
 
     return topic_results
 
 
+def _read_conversation(conversation):
+    """
+    Get the text of a conversation given as text or as a file path.
+
+    Path-like objects are always read from disk. Strings are treated as file paths
+    when they are a single line naming an existing file, and as text otherwise.
+
+    Args:
+        conversation: Conversation text or path to a conversation file
+
+    Returns:
+        The conversation text
+    """
+    if isinstance(conversation, os.PathLike):
+        return load_conversation(os.fspath(conversation))
+    if '\n' not in conversation and os.path.isfile(conversation):
+        return load_conversation(conversation)
+    return conversation
+
+
+# Per-process state for extract_topics_batch workers, set by _init_batch_worker
+_batch_worker_options = None
+
+
+def _init_batch_worker(options):
+    """Initialize a batch worker process with the shared extraction options."""
+    global _batch_worker_options
+    _batch_worker_options = options
+
+
+def _extract_batch_item(conversation):
+    """Extract topics for one conversation inside a batch worker process."""
+    return extract_topics(_read_conversation(conversation), **_batch_worker_options)
+
+
+def extract_topics_batch(conversations, topic_categories=None, context_lines=3, enable_dynamic=True,
+                         threshold=0.5, cache=None, workers=None, max_pending=None, keyword_generator=None):
+    """
+    Extract topics from many conversations, reusing the setup work between them.
+
+    The topic categories are compiled and the keyword generator is loaded once, and
+    both are shared by every conversation; the shared default generator is only
+    loaded once a conversation misses the cache. With workers > 1 the conversations are
+    processed in a process pool whose workers receive them once, when they start.
+    Files are read by the worker that processes them.
+
+    Args:
+        conversations: Iterable of conversation texts or paths to conversation files
+        topic_categories: Dictionary mapping topic categories to lists of keywords, or a
+                         precompiled TopicCategorySet (defaults to DEFAULT_TOPIC_CATEGORIES if None)
+        context_lines: Number of context lines to include
+        enable_dynamic: Whether to enable dynamic keyword generation
+        threshold: Importance threshold for considering a term as a keyword
+        cache: Optional TopicResultCache to reuse results for unchanged conversations
+        workers: Number of worker processes (None or 1 processes in the current process)
+        max_pending: Maximum number of conversations queued in the pool at once
+                     (defaults to 4 per worker)
+        keyword_generator: Optional KeywordGenerator to use for dynamic keywords
+                           (defaults to the shared generator)
+
+    Yields:
+        Topic results for each conversation, in input order
+    """
+    options = {
+        'topic_categories': _resolve_categories(topic_categories),
+        'context_lines': context_lines,
+        'enable_dynamic': enable_dynamic,
+        'threshold': threshold,
+        'cache': cache,
+        'keyword_generator': keyword_generator if enable_dynamic else None,
+    }
+
+    if not workers or workers <= 1:
+        for conversation in conversations:
+            yield extract_topics(_read_conversation(conversation), **options)
+        return
+
+    max_pending = max_pending or workers * 4
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                             initargs=(options,)) as executor:
+        try:
+            # Keep a bounded window of conversations in flight and yield results in order
+            for conversation in conversations:
+                pending.append(executor.submit(_extract_batch_item, conversation))
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # Don't process the rest of the queue if the caller stops early
+            for future in pending:
+                future.cancel()
+
+
 def print_topic_results(topic_results):
     """
     Print the topic extraction results in a readable format.
 
     Args:
-        topic_results: Dictionary mapping topic categories to their extracted contexts
+        topic_results: Dictionary mapping topic categories to lists of TopicMatch objects
     """
     if not topic_results:
         print("No topics found.")
@@ -117,21 +322,14 @@ def print_topic_results(topic_results):
         print(f"TOPIC: {category} - {len(matches)} matches found")
         print(f"{'='*80}")
 
-        # Group by matched line to avoid duplicates
-        unique_contexts = {}
-        for keyword, matched_line, context in matches:
-            # Use the context as the key to avoid duplicates
-            context_key = "\n".join(context)
-            if context_key not in unique_contexts:
-                unique_contexts[context_key] = (keyword, matched_line, context)
-
-        # Print unique contexts
-        for i, (keyword, matched_line, context) in enumerate(unique_contexts.values(), 1):
-            print(f"\nMatch #{i} (matched keyword: '{keyword}'):")
+        for i, match in enumerate(matches, 1):
+            matched_keywords = ", ".join(f"'{keyword}'" for keyword in match.keywords)
+            label = "keyword" if len(match.keywords) == 1 else "keywords"
+            print(f"\nMatch #{i} (matched {label}: {matched_keywords}):")
             print(f"{'-'*40}")
-            for ctx_line in context:
+            for ctx_line in match.context:
                 # Highlight the matched line
-                if ctx_line == matched_line:
+                if ctx_line == match.matched_line:
                     print(f">>> {ctx_line}")
                 else:
                     print(f"    {ctx_line}")
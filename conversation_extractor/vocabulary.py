@@ -0,0 +1,158 @@
+"""
+Vocabulary Module
+
+Intern tokens to integer IDs and count compact token ID streams.
+"""
+from array import array
+from collections import Counter
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; counting falls back to Counter
+    np = None
+
+
+class Vocabulary:
+    """
+    Map tokens to dense integer IDs.
+
+    IDs are assigned in order of first occurrence, so counts listed in ID order
+    come out in the same order as a Counter over the original tokens, and ties
+    are broken the same way.
+    """
+
+    def __init__(self, tokens=None):
+        """
+        Initialize the vocabulary.
+
+        Args:
+            tokens: Optional iterable of tokens to intern
+        """
+        self._ids = {}
+        self.tokens = []  # Maps IDs back to tokens
+        if tokens is not None:
+            self.encode(tokens)
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def __contains__(self, token):
+        return token in self._ids
+
+    def intern(self, token):
+        """
+        Get the ID of a token, assigning the next free ID to new tokens.
+
+        Args:
+            token: The token to intern
+
+        Returns:
+            Integer token ID
+        """
+        token_id = self._ids.get(token)
+        if token_id is None:
+            token_id = self._ids[token] = len(self.tokens)
+            self.tokens.append(token)
+        return token_id
+
+    def get(self, token, default=None):
+        """Get the ID of a token without interning it."""
+        return self._ids.get(token, default)
+
+    def encode(self, tokens, stream=None):
+        """
+        Intern tokens and store their IDs in a compact array.
+
+        Args:
+            tokens: Iterable of tokens
+            stream: Optional array('I') to append the IDs to
+
+        Returns:
+            array('I') of token IDs
+        """
+        if stream is None:
+            stream = array('I')
+        ids = self._ids
+        for token in tokens:
+            token_id = ids.get(token)
+            if token_id is None:
+                token_id = ids[token] = len(self.tokens)
+                self.tokens.append(token)
+            stream.append(token_id)
+        return stream
+
+    def decode(self, ids):
+        """Get the tokens of a sequence of IDs."""
+        tokens = self.tokens
+        return [tokens[token_id] for token_id in ids]
+
+    def flags(self, tokens):
+        """
+        Get per-ID membership flags for a set of tokens, for filter_ids().
+
+        Args:
+            tokens: Set of tokens to flag
+
+        Returns:
+            Sequence indexed by ID that is true for IDs of tokens in the set
+        """
+        if np is not None:
+            return np.fromiter((token in tokens for token in self.tokens), dtype=bool, count=len(self.tokens))
+        return bytearray(token in tokens for token in self.tokens)
+
+
+def filter_ids(ids, excluded):
+    """
+    Remove flagged IDs from a token ID stream.
+
+    Args:
+        ids: array('I') of token IDs
+        excluded: Per-ID flags from Vocabulary.flags()
+
+    Returns:
+        array('I') of the remaining IDs, in order
+    """
+    if np is not None and len(ids):
+        id_array = np.frombuffer(ids, dtype=np.uint32)
+        return array('I', id_array[~excluded[id_array]].tobytes())
+    return array('I', (token_id for token_id in ids if not excluded[token_id]))
+
+
+def count_ids(ids, size):
+    """
+    Count the IDs of a token ID stream.
+
+    Args:
+        ids: array('I') of token IDs
+        size: Vocabulary size (one more than the largest ID)
+
+    Returns:
+        Dictionary mapping IDs to their counts, in ID order
+    """
+    if np is not None and len(ids):
+        counts = np.bincount(np.frombuffer(ids, dtype=np.uint32), minlength=size)
+        present = np.flatnonzero(counts)
+        return dict(zip(present.tolist(), counts[present].tolist()))
+    return dict(sorted(Counter(ids).items()))
+
+
+def count_id_bigrams(ids, size):
+    """
+    Count the adjacent ID pairs of a token ID stream.
+
+    Args:
+        ids: array('I') of token IDs
+        size: Vocabulary size (one more than the largest ID)
+
+    Returns:
+        Dictionary mapping (id1, id2) tuples to their counts, in order of first occurrence
+    """
+    if np is not None and len(ids) > 1:
+        id_array = np.frombuffer(ids, dtype=np.uint32).astype(np.uint64)
+        codes = id_array[:-1] * size + id_array[1:]
+        unique, first, counts = np.unique(codes, return_index=True, return_counts=True)
+        order = np.argsort(first, kind='stable')
+        unique = unique[order]
+        return dict(zip(zip((unique // size).tolist(), (unique % size).tolist()), counts[order].tolist()))
+    return dict(Counter(zip(ids, islice(ids, 1, None))))
@@ -32,7 +32,8 @@ def main():
         return 1
     
     print(f"Loaded conversation from {sample_file}")
-    print(f"({len(conversation)} characters, {len(conversation.split('\\n'))} lines)")
+    line_count = len(conversation.split('\n'))
+    print(f"({len(conversation)} characters, {line_count} lines)")
     
     # Generate dynamic keywords
     print("\nGenerating dynamic keywords...")
@@ -52,21 +53,13 @@ def main():
         print("\nDYNAMIC TOPICS:")
         print("=" * 80)
         
-        # Group by matched line to avoid duplicates
-        unique_contexts = {}
-        for keyword, matched_line, context in topic_results["Dynamic Topics"]:
-            # Use the context as the key to avoid duplicates
-            context_key = "\n".join(context)
-            if context_key not in unique_contexts:
-                unique_contexts[context_key] = (keyword, matched_line, context)
-        
-        # Print unique contexts
-        for i, (keyword, matched_line, context) in enumerate(unique_contexts.values(), 1):
-            print(f"\nMatch #{i} (matched keyword: '{keyword}'):")
+        # Matches are already grouped by line, with every keyword that matched it
+        for i, match in enumerate(topic_results["Dynamic Topics"], 1):
+            print(f"\nMatch #{i} (matched keywords: {', '.join(match.keywords)}):")
             print(f"{'-'*40}")
-            for ctx_line in context:
+            for ctx_line in match.context:
                 # Highlight the matched line
-                if ctx_line == matched_line:
+                if ctx_line == match.matched_line:
                     print(f">>> {ctx_line}")
                 else:
                     print(f"    {ctx_line}")
@@ -78,9 +71,8 @@ def main():
     print("\nTracking keyword importance...")
     tracker = KeywordTracker()
     
-    # Update keywords based on the dynamic keywords
-    for keyword in keywords[:10]:  # Use top 10 keywords
-        tracker.update_keyword(keyword)
+    # Update keywords based on the dynamic keywords, as one batch
+    tracker.update_keywords(keywords[:10])  # Use top 10 keywords
     
     # Print the top keywords by importance
     top_keywords = tracker.get_top_keywords()
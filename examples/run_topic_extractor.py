@@ -30,7 +30,8 @@ def main():
         return 1
     
     print(f"Loaded conversation from {sample_file}")
-    print(f"({len(conversation)} characters, {len(conversation.split('\\n'))} lines)")
+    line_count = len(conversation.split('\n'))
+    print(f"({len(conversation)} characters, {line_count} lines)")
     
     # Extract topics with 2 lines of context
     context_lines = 2
@@ -44,10 +45,7 @@ def main():
     print("\nTOPIC SUMMARY:")
     print("-" * 40)
     for category, matches in topic_results.items():
-        unique_contexts = set()
-        for _, _, context in matches:
-            unique_contexts.add(tuple(context))
-        print(f"{category}: {len(unique_contexts)} unique contexts")
+        print(f"{category}: {len(matches)} matched lines")
     
     return 0
 
@@ -7,6 +7,8 @@ setup(
     entry_points={
         'console_scripts': [
             'conversation-extractor=conversation_extractor.cli:main',
+            'conversation-cooccurrence=conversation_extractor.cli:cooccurrence_main',
+            'conversation-document-frequencies=conversation_extractor.cli:document_frequency_main',
         ],
     },
     python_requires='>=3.6',
@@ -14,6 +16,9 @@ setup(
         'nltk>=3.6.0',
     ],
     extras_require={
+        'numpy': [
+            'numpy>=1.17.0',
+        ],
         'dev': [
             'pytest>=6.0.0',
             'pytest-html>=3.0.0',
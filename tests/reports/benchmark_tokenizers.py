@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""
+Benchmark the fast tokenizer against the NLTK tokenizer and report how well they agree.
+
+Usage:
+    python tests/reports/benchmark_tokenizers.py [--repeat N] [--scale N] [files...]
+
+Without file arguments every conversation in tests/data is used. When the NLTK
+punkt data is not installed the reference path falls back to plain punctuation
+splitting, which the report points out.
+"""
+import os
+import sys
+import glob
+import time
+import argparse
+from collections import Counter
+
+# Add parent directory to path so we can import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from conversation_extractor import load_conversation, KeywordGenerator
+
+
+def content_words(words):
+    """Get the lowercased words that keyword generation counts."""
+    return Counter(word.lower() for sentence in words for word in sentence
+                   if word.isalnum() and len(word) > 2)
+
+
+def jaccard(a, b):
+    """Jaccard similarity of two sets or multisets (Counters)."""
+    if isinstance(a, Counter):
+        union = sum((a | b).values())
+        return sum((a & b).values()) / union if union else 1.0
+    union = len(a | b)
+    return len(a & b) / union if union else 1.0
+
+
+def best_time(function, repeat):
+    """Run a function repeat times and return the fastest run in seconds."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def benchmark_file(file_path, reference, fast, repeat, scale, threshold):
+    """Benchmark and compare both tokenizers on one file."""
+    text = load_conversation(file_path) * scale
+
+    ref_sentences, ref_words = reference.tokenize(text)
+    fast_sentences, fast_words = fast.tokenize(text)
+    ref_keywords = set(reference.generate(text, threshold=threshold))
+    fast_keywords = set(fast.generate(text, threshold=threshold))
+
+    return {
+        'file': os.path.basename(file_path),
+        'chars': len(text),
+        'ref_time': best_time(lambda: reference.tokenize(text), repeat),
+        'fast_time': best_time(lambda: fast.tokenize(text), repeat),
+        'ref_sentences': len(ref_sentences),
+        'fast_sentences': len(fast_sentences),
+        'word_agreement': jaccard(content_words(ref_words), content_words(fast_words)),
+        'keyword_agreement': jaccard(ref_keywords, fast_keywords),
+        'only_ref': sorted(ref_keywords - fast_keywords),
+        'only_fast': sorted(fast_keywords - ref_keywords),
+    }
+
+
+def main():
+    """Run the benchmark and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument("files", nargs="*", help="Conversation files (default: tests/data/*.txt)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs per file (default: 5)")
+    parser.add_argument("--scale", type=int, default=1, help="Repeat each text this many times (default: 1)")
+    parser.add_argument("--threshold", type=float, default=0.05,
+                        help="Keyword importance threshold (default: 0.05)")
+    args = parser.parse_args()
+
+    files = args.files or sorted(glob.glob(os.path.join(os.path.dirname(__file__), '..', 'data', '*.txt')))
+
+    reference = KeywordGenerator(tokenizer='auto')
+    fast = KeywordGenerator(tokenizer='fast')
+
+    print("=" * 80)
+    print(f"Reference tokenizer: {reference.tokenizer_backend}")
+    if reference.tokenizer_backend != 'nltk':
+        print("NOTE: NLTK punkt data is not installed; the reference is plain punctuation splitting")
+    print(f"Fast tokenizer: {fast.tokenizer_backend}")
+    print("=" * 80)
+
+    for file_path in files:
+        result = benchmark_file(file_path, reference, fast, args.repeat, args.scale, args.threshold)
+        speedup = result['ref_time'] / result['fast_time'] if result['fast_time'] else float('inf')
+        print(f"\n{result['file']} ({result['chars']} characters)")
+        print("-" * 40)
+        print(f"Tokenize time:     reference {result['ref_time'] * 1000:.2f} ms, "
+              f"fast {result['fast_time'] * 1000:.2f} ms ({speedup:.1f}x)")
+        print(f"Sentences:         reference {result['ref_sentences']}, fast {result['fast_sentences']}")
+        print(f"Word agreement:    {result['word_agreement']:.1%} (weighted Jaccard of counted words)")
+        print(f"Keyword agreement: {result['keyword_agreement']:.1%} (Jaccard of generated keywords)")
+        print(f"Only reference:    {', '.join(result['only_ref']) or '-'}")
+        print(f"Only fast:         {', '.join(result['only_fast']) or '-'}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
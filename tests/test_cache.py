@@ -0,0 +1,125 @@
+"""
+Tests for the topic result cache
+"""
+import os
+import pytest
+from conversation_extractor import extract_topics, TopicResultCache, TopicCategorySet, TopicMatch
+from conversation_extractor import topic_extractor
+
+
+CONVERSATION = """
+USER: I'm having trouble with my Python code. It keeps giving me errors with dictionaries.
+ASSISTANT: Let's look at your dictionary code. Are you using the correct syntax for accessing keys?
+USER: I'm also working on a Flask project and struggling with focus because of my ADHD.
+ASSISTANT: Try the Pomodoro technique to keep your focus while you build the Flask routes.
+"""
+
+
+def test_cache_returns_identical_results(tmp_path):
+    """
+    FEATURE: Cached topic extraction
+
+    Test that a cache hit returns the same results as a fresh extraction.
+    """
+    # Given a cache and a first extraction
+    cache = TopicResultCache(str(tmp_path / "cache"))
+    first = extract_topics(CONVERSATION, context_lines=1, enable_dynamic=False, cache=cache)
+
+    # When we extract topics again for the same conversation
+    second = extract_topics(CONVERSATION, context_lines=1, enable_dynamic=False, cache=cache)
+
+    # Then the results should be identical
+    assert dict(second) == dict(first), "Cached results should match the fresh extraction"
+
+
+def test_cache_hit_skips_extraction(tmp_path, monkeypatch):
+    """
+    FEATURE: Cache hits avoid recomputation
+
+    Test that a cache hit does not run keyword matching again.
+    """
+    # Given a warmed cache
+    cache = TopicResultCache(str(tmp_path / "cache"))
+    extract_topics(CONVERSATION, enable_dynamic=False, cache=cache)
+    extract_topics(CONVERSATION, cache=cache)
+
+    # When keyword matching is unavailable
+    def fail(*args, **kwargs):
+        raise AssertionError("Keywords should not be matched on a cache hit")
+    monkeypatch.setattr(TopicCategorySet, "match_lines", fail)
+
+    # Then the cached results are still returned
+    results = extract_topics(CONVERSATION, enable_dynamic=False, cache=cache)
+    assert "Web Development" in results, "Should return cached results"
+
+    # And with dynamic keywords, a hit does not need the default generator
+    def no_generator():
+        raise AssertionError("The default generator should not be created on a cache hit")
+    monkeypatch.setattr(topic_extractor, "get_default_generator", no_generator)
+    assert "Web Development" in extract_topics(CONVERSATION, cache=cache)
+
+
+def test_cache_key_depends_on_config(tmp_path):
+    """
+    FEATURE: Configuration-sensitive cache keys
+
+    Test that changing the text or any configuration value changes the cache key.
+    """
+    cache = TopicResultCache(str(tmp_path / "cache"))
+    categories = {"Web": ["Flask"]}
+    base = cache.make_key(CONVERSATION, categories, 3, True, 0.5)
+
+    assert cache.make_key(CONVERSATION + "!", categories, 3, True, 0.5) != base
+    assert cache.make_key(CONVERSATION, {"Web": ["Django"]}, 3, True, 0.5) != base
+    assert cache.make_key(CONVERSATION, categories, 2, True, 0.5) != base
+    assert cache.make_key(CONVERSATION, categories, 3, False, 0.5) != base
+    assert cache.make_key(CONVERSATION, categories, 3, True, 0.4) != base
+    assert cache.make_key(CONVERSATION, dict(categories), 3, True, 0.5) == base
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """
+    FEATURE: Size-bounded LRU eviction
+
+    Test that the cache stays within its size limit by evicting the least recently used entries.
+    """
+    # Given a small cache holding two entries
+    cache = TopicResultCache(str(tmp_path / "cache"), max_bytes=150)
+    results = {"Web": [TopicMatch(["Flask"], 0, "a Flask line", ["a Flask line"])]}
+    cache.put("aa-first", results)
+    cache.put("bb-second", results)
+    os.utime(cache._path("aa-first"), ns=(1, 1))
+    os.utime(cache._path("bb-second"), ns=(2, 2))
+
+    # When we use the first entry and add a third one
+    assert cache.get("aa-first") is not None
+    cache.put("cc-third", results)
+
+    # Then the least recently used entry is evicted
+    assert cache.get("bb-second") is None, "Least recently used entry should be evicted"
+    assert cache.get("aa-first") is not None, "Recently used entry should be kept"
+    assert cache.get("cc-third") is not None, "Newest entry should be kept"
+
+    # And eviction frees space down to the low-water mark, below the limit
+    assert cache._get_total_bytes() <= 0.9 * cache.max_bytes
+
+
+def test_cache_overwrite_counts_entry_once(tmp_path):
+    """
+    FEATURE: Cache size accounting
+
+    Test that overwriting an entry replaces its size in the running total instead of adding to it.
+    """
+    cache = TopicResultCache(str(tmp_path / "cache"))
+    results = {"Web": [TopicMatch(["Flask"], 0, "a Flask line", ["a Flask line"])]}
+    cache.put("aa-first", results)
+    size = cache._get_total_bytes()
+
+    cache.put("aa-first", results)
+    cache.put("aa-first", results)
+
+    assert cache._get_total_bytes() == size == os.path.getsize(cache._path("aa-first"))
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
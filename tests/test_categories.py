@@ -0,0 +1,93 @@
+"""
+Tests for precompiled topic category sets
+"""
+import pickle
+import pytest
+from conversation_extractor import (
+    extract_topics,
+    TopicCategorySet,
+    DEFAULT_TOPIC_CATEGORIES
+)
+
+
+CONVERSATION = """USER: My Flask app keeps raising an error when I debug it.
+ASSISTANT: Let's add some logging and check the traceback.
+USER: I also lose focus because of my ADHD.
+ASSISTANT: A Pomodoro timer can help you stay on task."""
+
+
+def test_category_set_normalizes_keywords():
+    """
+    FEATURE: Keyword normalization
+
+    Test that keywords are deduplicated case-insensitively and mapped to their categories.
+    """
+    # Given categories with duplicate and shared keywords
+    category_set = TopicCategorySet({
+        "Debugging": ["debug", "Debug", "error", ""],
+        "Best Practices": ["logging", "debug"]
+    })
+
+    # Then duplicates and empty keywords are removed, keeping the first spelling
+    assert category_set["Debugging"] == ("debug", "error")
+    assert category_set["Best Practices"] == ("logging", "debug")
+
+    # And the keyword map lists every category a keyword belongs to
+    assert category_set.keyword_categories["debug"] == ("Debugging", "Best Practices")
+    assert category_set.keywords == ("debug", "error", "logging")
+
+
+def test_category_set_matches_like_extract_topics():
+    """
+    FEATURE: Precompiled category matching
+
+    Test that a precompiled category set gives the same results as a plain dictionary.
+    """
+    # Given the default categories as a dictionary and as a category set
+    category_set = TopicCategorySet(DEFAULT_TOPIC_CATEGORIES)
+
+    # When we extract topics with both
+    from_dict = extract_topics(CONVERSATION, DEFAULT_TOPIC_CATEGORIES, context_lines=1, enable_dynamic=False)
+    from_set = extract_topics(CONVERSATION, category_set, context_lines=1, enable_dynamic=False)
+
+    # Then the results should be identical
+    assert dict(from_set) == dict(from_dict), "Category set should match like the plain dictionary"
+    assert "Debugging" in from_set and "ADHD & Productivity" in from_set
+
+
+def test_category_set_save_and_load(tmp_path):
+    """
+    FEATURE: Category set serialization
+
+    Test that a category set survives a save/load round trip and pickling.
+    """
+    # Given a saved category set
+    category_set = TopicCategorySet(DEFAULT_TOPIC_CATEGORIES)
+    file_path = tmp_path / "categories.json"
+    category_set.save(str(file_path))
+
+    # When we load it back and pickle it
+    loaded = TopicCategorySet.load(str(file_path))
+    unpickled = pickle.loads(pickle.dumps(category_set))
+
+    # Then the categories and fingerprint are preserved
+    assert loaded == category_set
+    assert loaded.fingerprint == category_set.fingerprint
+    assert unpickled.match_lines(CONVERSATION.split("\n")) == category_set.match_lines(CONVERSATION.split("\n"))
+
+
+def test_category_set_rejects_unknown_files(tmp_path):
+    """
+    FEATURE: Category file validation
+
+    Test that loading a file that was not written by save() fails clearly.
+    """
+    file_path = tmp_path / "other.json"
+    file_path.write_text('{"Debugging": ["debug"]}', encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        TopicCategorySet.load(str(file_path))
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,93 @@
+"""
+Tests for vectorized collocation scoring
+"""
+import os
+import pytest
+from conversation_extractor import KeywordGenerator, load_conversation
+from conversation_extractor.vocabulary import Vocabulary
+
+pytest.importorskip("numpy")
+from conversation_extractor.collocations import score_ngrams, nbest_ngrams, lexical_ranks  # noqa: E402
+
+
+SAMPLE_FILE = os.path.join(os.path.dirname(__file__), "data", "coding_buddy_conversation.txt")
+
+
+def sample_words():
+    """Get the lowercased words of the sample conversation."""
+    _, words = KeywordGenerator(tokenizer="fast").tokenize(load_conversation(SAMPLE_FILE))
+    return [word.lower() for sentence in words for word in sentence if word.isalnum()]
+
+
+@pytest.mark.parametrize("measure", ["pmi", "likelihood_ratio", "student_t"])
+def test_nbest_matches_nltk(measure):
+    """
+    FEATURE: NLTK-compatible vectorized collocations
+
+    Test that the best bigrams and trigrams, including tie order, match NLTK's collocation finders.
+    """
+    from nltk.collocations import (
+        BigramAssocMeasures, BigramCollocationFinder, TrigramAssocMeasures, TrigramCollocationFinder
+    )
+
+    # Given an interned token stream
+    words = sample_words()
+    vocab = Vocabulary()
+    ids = vocab.encode(words)
+    ranks = lexical_ranks(vocab.tokens)
+
+    # When we take the best bigrams and trigrams of NLTK and of the vectorized scorer
+    finders = [
+        (2, BigramCollocationFinder.from_words(words), getattr(BigramAssocMeasures, measure)),
+        (3, TrigramCollocationFinder.from_words(words), getattr(TrigramAssocMeasures, measure)),
+    ]
+    for order, finder, score_fn in finders:
+        finder.apply_freq_filter(2)
+        expected = finder.nbest(score_fn, 15)
+        best = nbest_ngrams(ids, len(vocab), 15, order=order, measure=measure, min_count=2, ranks=ranks)
+
+        # Then they agree
+        assert [tuple(vocab.decode(ngram)) for ngram in best] == expected
+
+
+def test_score_ngrams_filters_and_validates():
+    """
+    FEATURE: Vectorized frequency filtering
+
+    Test that rare n-grams are filtered out and unsupported arguments are rejected.
+    """
+    vocab = Vocabulary()
+    ids = vocab.encode("a b a b c a b".split())
+
+    ngrams, counts, scores = score_ngrams(ids, len(vocab), min_count=2)
+    assert [tuple(vocab.decode(ngram)) for ngram in ngrams] == [("a", "b")]
+    assert counts.tolist() == [3] and len(scores) == 1
+    assert nbest_ngrams(ids[:1], len(vocab), 5) == []
+
+    with pytest.raises(ValueError):
+        score_ngrams(ids, len(vocab), order=4)
+    with pytest.raises(ValueError):
+        score_ngrams(ids, len(vocab), measure="unknown")
+
+
+def test_keyword_generator_numpy_collocations():
+    """
+    FEATURE: Vectorized collocations in keyword generation
+
+    Test that the NumPy finder generates the same keywords as the NLTK finder.
+    """
+    conversation = load_conversation(SAMPLE_FILE)
+    nltk_generator = KeywordGenerator(tokenizer="fast")
+    numpy_generator = KeywordGenerator(tokenizer="fast", collocations="numpy")
+
+    assert numpy_generator.config == {"tokenizer": "fast", "collocations": "numpy"}
+    for threshold in (0.5, 0.05, 0.01):
+        assert set(numpy_generator.generate(conversation, threshold=threshold)) == \
+            set(nltk_generator.generate(conversation, threshold=threshold))
+
+    with pytest.raises(ValueError):
+        KeywordGenerator(collocations="unknown")
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
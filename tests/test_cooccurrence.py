@@ -0,0 +1,130 @@
+"""
+Tests for corpus-wide topic co-occurrence statistics
+"""
+import os
+import pytest
+from conversation_extractor.extractor import split_turns, find_conversation_files, map_file_chunks
+from conversation_extractor.cooccurrence import (
+    CooccurrenceCounts,
+    count_cooccurrences,
+    count_corpus_cooccurrences
+)
+
+
+CONVERSATION = """USER: My Flask app crashes with an error.
+ASSISTANT: Add logging to the Flask route.
+Then check the traceback.
+USER: I keep losing focus because of my ADHD."""
+
+CATEGORIES = {
+    "Web": ["Flask", "route"],
+    "Debugging": ["error", "logging", "traceback"],
+    "ADHD": ["focus", "ADHD"]
+}
+
+
+def test_split_turns():
+    """
+    FEATURE: Speaker turn detection
+
+    Test that lines are grouped into turns at speaker labels.
+    """
+    lines = ["Header", "USER: hi", "ASSISTANT: hello", "more text", "A: done"]
+    assert split_turns(lines) == [(0, 1), (1, 2), (2, 4), (4, 5)]
+
+
+def count_names(file_paths, options):
+    """Count the file names of a group, weighted by the options (a map_file_chunks task)."""
+    return {name: options["weight"] for name in file_paths}
+
+
+def test_map_file_chunks():
+    """
+    FEATURE: Shared parallel file processing
+
+    Test that files are processed once each, in groups, serially or in worker processes.
+    """
+    for workers in (None, 2):
+        # Given a lazy iterator of file names
+        names = (f"file_{i}.txt" for i in range(25))
+        merged = {}
+
+        map_file_chunks(count_names, names, {"weight": 2}, merged.update, workers=workers, files_per_task=4)
+
+        # Then every file was processed with the options
+        assert merged == {f"file_{i}.txt": 2 for i in range(25)}
+
+
+def test_count_cooccurrences_scopes():
+    """
+    FEATURE: Co-occurrence counting per scope
+
+    Test that co-occurrences are counted within lines, turns and windows.
+    """
+    # When we count co-occurrences with two-line windows
+    counts = count_cooccurrences(CONVERSATION, CATEGORIES, window_lines=2)
+
+    # Then categories on the same line co-occur at line level
+    assert counts.get("Web", "Debugging", scope="line") == 2
+    assert counts.get("Web", "Web", scope="line") == 2
+    assert counts.get("Web", "ADHD", scope="line") == 0
+
+    # And keywords in the same turn co-occur at turn level
+    assert counts.get("flask", "traceback", kind="keyword", scope="line") == 0
+    assert counts.get("Flask", "traceback", kind="keyword", scope="turn") == 1
+    assert counts.get("focus", "adhd", kind="keyword", scope="turn") == 1
+
+    # And windows group consecutive lines
+    assert counts.get("Debugging", "Web", scope="window") == 1
+    assert counts.get("ADHD", "Debugging", scope="window") == 1
+
+
+def test_counts_merge_and_round_trip(tmp_path):
+    """
+    FEATURE: Mergeable, persistent co-occurrence counts
+
+    Test that partial counts merge additively and survive a save/load round trip.
+    """
+    # Given counts from two conversations
+    total = CooccurrenceCounts()
+    total.merge(count_cooccurrences(CONVERSATION, CATEGORIES))
+    total.merge(count_cooccurrences(CONVERSATION, CATEGORIES))
+
+    # Then counts add up
+    assert total.documents == 2
+    assert total.get("Web", "Debugging") == 4
+    assert total.most_common(1) == [(("Debugging", "Web"), 4)]
+
+    # And they survive a save/load round trip
+    file_path = str(tmp_path / "cooccurrence.json.gz")
+    total.save(file_path)
+    loaded = CooccurrenceCounts.load(file_path)
+    assert loaded.documents == 2
+    assert loaded.counts == total.counts
+
+
+def test_count_corpus_cooccurrences_parallel(tmp_path):
+    """
+    FEATURE: Parallel corpus counting
+
+    Test that a process pool gives the same counts as counting serially.
+    """
+    # Given a directory of conversation files
+    for i in range(5):
+        (tmp_path / f"conversation_{i}.txt").write_text(CONVERSATION * (i + 1), encoding="utf-8")
+    (tmp_path / "notes.md").write_text("Flask error", encoding="utf-8")
+    file_paths = list(find_conversation_files([str(tmp_path)]))
+    assert len(file_paths) == 5, "Should only find .txt files"
+
+    # When we count serially and in parallel with the default categories
+    serial = count_corpus_cooccurrences(file_paths, files_per_task=2)
+    parallel = count_corpus_cooccurrences(file_paths, workers=2, files_per_task=2)
+
+    # Then the counts should be identical
+    assert parallel.documents == serial.documents == 5
+    assert parallel.counts == serial.counts
+    assert serial.get("Web Development", "Debugging", scope="turn") > 0
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
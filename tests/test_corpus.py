@@ -0,0 +1,135 @@
+"""
+Tests for the corpus document frequency store and TF-IDF/BM25 keyword scoring
+"""
+import pickle
+import pytest
+from collections import Counter
+from conversation_extractor import KeywordGenerator
+from conversation_extractor.extractor import find_conversation_files
+from conversation_extractor.corpus import DocumentFrequencyStore
+
+
+CONVERSATIONS = [
+    "USER: The code crashes again. ASSISTANT: Show me the code and the traceback.",
+    "USER: Can you review my code? ASSISTANT: The code looks clean.",
+    "USER: My kubernetes pod restarts. The code deploys to kubernetes. "
+    "ASSISTANT: Check the kubernetes events for the code.",
+]
+
+
+def write_corpus(directory):
+    """Write the sample conversations to a directory and return their paths."""
+    for i, text in enumerate(CONVERSATIONS):
+        (directory / f"conversation_{i}.txt").write_text(text, encoding="utf-8")
+    return list(find_conversation_files([str(directory)]))
+
+
+def test_build_and_memory_mapped_lookup(tmp_path):
+    """
+    FEATURE: Persistent document frequency store
+
+    Test that document frequencies are counted per document and survive a save/load round trip.
+    """
+    # Given a store built over a small corpus, serially and in parallel
+    file_paths = write_corpus(tmp_path)
+    generator = KeywordGenerator(tokenizer="fast")
+    store = DocumentFrequencyStore.build(file_paths, generator=generator, files_per_task=1)
+    parallel = DocumentFrequencyStore.build(file_paths, generator=generator, workers=2, files_per_task=1)
+
+    # Then words are counted once per document
+    assert store.documents == 3
+    assert store.df("code") == 3
+    assert store.df("kubernetes") == 1
+    assert store.df("unknown") == 0
+    assert dict(parallel.items()) == dict(store.items())
+    assert store.idf("kubernetes") > store.idf("code")
+
+    # And the memory-mapped file answers the same lookups
+    file_path = str(tmp_path / "corpus.df")
+    store.save(file_path)
+    with DocumentFrequencyStore.load(file_path) as loaded:
+        assert loaded.documents == 3
+        assert loaded.total_words == store.total_words
+        assert len(loaded) == len(store)
+        assert dict(loaded.items()) == dict(store.items())
+        for word, df in store.items():
+            assert loaded.df(word) == df
+        assert loaded.df("unknown") == 0
+        assert loaded.df("zzz") == 0
+
+        # And mapped stores can be pickled for worker processes
+        assert pickle.loads(pickle.dumps(loaded)).df("kubernetes") == 1
+
+    # And other files are rejected
+    (tmp_path / "bad.df").write_bytes(b"not a store")
+    with pytest.raises(ValueError):
+        DocumentFrequencyStore.load(str(tmp_path / "bad.df"))
+
+
+def test_tfidf_and_bm25_scoring(tmp_path):
+    """
+    FEATURE: Corpus-aware keyword scoring
+
+    Test that TF-IDF and BM25 rank distinctive words above words common to every conversation.
+    """
+    # Given a document frequency store
+    file_path = str(tmp_path / "corpus.df")
+    store = DocumentFrequencyStore.build(write_corpus(tmp_path), generator=KeywordGenerator(tokenizer="fast"))
+    store.save(file_path)
+
+    # When we rank the words of a conversation where "code" is as frequent as "kubernetes"
+    text = CONVERSATIONS[2]
+    frequency = KeywordGenerator(tokenizer="fast")
+    tfidf = KeywordGenerator(tokenizer="fast", scoring="tfidf", df_store=file_path)
+    bm25 = KeywordGenerator(tokenizer="fast", scoring="bm25", df_store=store)
+
+    # Then frequency scoring keeps the first seen word first, while corpus scoring prefers the distinctive word
+    assert [word for word, _ in frequency.rank_words(Counter({"code": 3, "kubernetes": 3}), 6)] == ["code", "kubernetes"]
+    for generator in (tfidf, bm25):
+        ranked = generator.rank_words(Counter({"code": 3, "kubernetes": 3}), 6)
+        assert ranked[0][0] == "kubernetes"
+        assert sum(importance for _, importance in ranked) == pytest.approx(1.0)
+        assert "kubernetes" in generator.generate(text, threshold=0.5)
+
+    # And the scoring mode is part of the generator configuration
+    assert tfidf.config["scoring"] == "tfidf"
+    assert "scoring" not in frequency.config
+
+    # And corpus scoring needs a store
+    with pytest.raises(ValueError):
+        KeywordGenerator(scoring="tfidf")
+    with pytest.raises(ValueError):
+        KeywordGenerator(scoring="unknown")
+
+
+def test_store_fingerprint(tmp_path):
+    """
+    FEATURE: Corpus fingerprint
+
+    Test that stores of equal size but different contents configure generators (and cache keys) differently.
+    """
+    # Given two stores with the same sizes but different words
+    first = DocumentFrequencyStore({"flask": 2, "django": 1}, 3, 10)
+    second = DocumentFrequencyStore({"flask": 1, "django": 2}, 3, 10)
+
+    # Then their fingerprints and generator configurations differ
+    assert first.fingerprint != second.fingerprint
+    assert KeywordGenerator(tokenizer="fast", scoring="tfidf", df_store=first).config != \
+        KeywordGenerator(tokenizer="fast", scoring="tfidf", df_store=second).config
+
+    # And a saved store keeps its fingerprint in the file header
+    file_path = str(tmp_path / "corpus.df")
+    first.save(file_path)
+    with DocumentFrequencyStore.load(file_path) as loaded:
+        assert loaded._fingerprint is not None
+        assert loaded.fingerprint == first.fingerprint
+
+    # And files of other format versions are rejected
+    with open(file_path, "rb") as f:
+        data = f.read()
+    (tmp_path / "old.df").write_bytes(data[:4] + (1).to_bytes(4, "little") + data[8:])
+    with pytest.raises(ValueError):
+        DocumentFrequencyStore.load(str(tmp_path / "old.df"))
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
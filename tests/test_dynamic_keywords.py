@@ -2,14 +2,18 @@
 Tests for the dynamic keyword generation functionality
 """
 import os
+import pickle
 import tempfile
 import pytest
 from conversation_extractor import (
     generate_dynamic_keywords,
+    KeywordGenerator,
+    IncrementalKeywordModel,
     KeywordTracker,
     extract_topics,
     load_conversation
 )
+from conversation_extractor.dynamic_keywords import count_ngrams
 
 
 def test_generate_dynamic_keywords_basic():
@@ -102,6 +106,93 @@ def test_generate_dynamic_keywords_with_existing():
     assert len(keywords) > 0, "Should generate at least one keyword"
 
 
+def test_count_ngrams():
+    """
+    FEATURE: Linear-time n-gram counting
+
+    Test that unigrams and bigrams are counted in one pass over the tokens.
+    """
+    # Given a token stream with repeated phrases
+    tokens = ["list", "comprehension", "syntax", "list", "comprehension", "list"]
+
+    # When we count n-grams up to bigrams
+    counts = count_ngrams(tokens)
+
+    # Then every order should be counted correctly
+    assert counts.total == 6
+    assert counts.unigrams["list"] == 3
+    assert counts.bigrams[("list", "comprehension")] == 2
+    assert counts.bigrams[("comprehension", "list")] == 1
+    assert sum(counts.bigrams.values()) == 5
+
+    # And unigrams only should leave bigrams empty
+    assert not count_ngrams(tokens, max_n=1).bigrams
+
+
+def test_keyword_generator_reuse():
+    """
+    FEATURE: Reusable keyword generator
+
+    Test that a KeywordGenerator matches generate_dynamic_keywords, survives pickling
+    and never downloads NLTK data while generating keywords.
+    """
+    import nltk
+
+    # Given a real conversation and a generator created without downloads
+    sample_file = os.path.join(os.path.dirname(__file__), "data", "coding_buddy_conversation.txt")
+    conversation = load_conversation(sample_file)
+    generator = KeywordGenerator()
+    expected = generate_dynamic_keywords(conversation, existing_keywords=["flask"])
+
+    # When downloads are unavailable
+    original_download = nltk.download
+    def fail(*args, **kwargs):
+        raise AssertionError("Generating keywords should not download NLTK data")
+    nltk.download = fail
+    try:
+        # Then the generator still produces the same keywords as the function
+        keywords = generator.generate(conversation, existing_keywords=["flask"])
+        assert set(keywords) == set(expected), "Generator should match generate_dynamic_keywords"
+
+        # And a pickled copy (as sent to worker processes) behaves the same
+        restored = pickle.loads(pickle.dumps(generator))
+        assert set(restored.generate(conversation, existing_keywords=["flask"])) == set(keywords)
+    finally:
+        nltk.download = original_download
+
+
+def test_incremental_keyword_model():
+    """
+    FEATURE: Incremental keyword statistics
+
+    Test that feeding a conversation message by message gives the same keywords as
+    feeding it at once, and that marker sentences contribute keywords.
+    """
+    # Given a real conversation and the fast tokenizer (which splits sentences per line)
+    sample_file = os.path.join(os.path.dirname(__file__), "data", "coding_buddy_conversation.txt")
+    conversation = load_conversation(sample_file)
+    generator = KeywordGenerator(tokenizer="fast")
+
+    # When we feed it all at once and line by line
+    whole = IncrementalKeywordModel(threshold=0.05, generator=generator)
+    whole.feed(conversation)
+    incremental = IncrementalKeywordModel(threshold=0.05, generator=generator)
+    for line in conversation.split("\n"):
+        keywords = incremental.feed(line + "\n")
+
+    # Then the statistics and keywords should be identical
+    assert incremental.total_words == whole.total_words
+    assert incremental.bigram_counts == whole.bigram_counts
+    assert keywords == whole.keywords(), "Incremental keywords should match a single feed"
+    assert len(keywords) > 5, "Should find keywords in a real conversation"
+
+    # And words following an importance marker become keywords
+    model = IncrementalKeywordModel(existing_keywords=["flask"], threshold=1.0, generator=generator)
+    model.feed("USER: Remember this.")
+    assert "Blueprints" in model.feed("ASSISTANT: Flask Blueprints organize routes.")
+    assert "Flask" not in model.keywords(), "Existing keywords should be skipped"
+
+
 def test_keyword_tracker():
     """
     FEATURE: Keyword importance tracking
@@ -137,8 +228,9 @@ def test_keyword_tracker():
 
     finally:
         # Clean up
-        if os.path.exists(temp_path):
-            os.unlink(temp_path)
+        for path in (temp_path, temp_path + ".journal"):
+            if os.path.exists(path):
+                os.unlink(path)
 
 
 def test_extract_topics_with_dynamic_keywords():
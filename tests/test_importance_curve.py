@@ -0,0 +1,67 @@
+"""
+Tests for keyword importance curves
+"""
+import os
+import pytest
+from conversation_extractor import KeywordGenerator, KeywordTracker, load_conversation
+
+np = pytest.importorskip("numpy")
+from conversation_extractor.importance_curve import (  # noqa: E402
+    decayed_cumsum, count_turn_keywords, keyword_importance_curve
+)
+
+
+SAMPLE_FILE = os.path.join(os.path.dirname(__file__), "data", "coding_buddy_conversation.txt")
+
+
+def test_decayed_cumsum():
+    """
+    FEATURE: Vectorized cumulative decay
+
+    Test that blocked cumulative decay equals the step-by-step recurrence over many steps.
+    """
+    rng = np.random.default_rng(3)
+    counts = rng.integers(0, 3, size=(1000, 4)).astype(float)
+
+    for decay_factor in (0.5, 0.9, 1.0, 0.0, -0.8):
+        expected = np.empty_like(counts)
+        total = np.zeros(4)
+        for t, row in enumerate(counts):
+            total = decay_factor * total + row
+            expected[t] = total
+        assert decayed_cumsum(counts, decay_factor) == pytest.approx(expected, rel=1e-9, abs=1e-300)
+
+
+def test_keyword_importance_curve():
+    """
+    FEATURE: Rolling keyword importance
+
+    Test that the turn x keyword matrix matches a KeywordTracker fed one batch per turn.
+    """
+    conversation = load_conversation(SAMPLE_FILE)
+    generator = KeywordGenerator(tokenizer="fast")
+
+    # Given the conversation's dynamic keywords and a multi-word keyword
+    curve = keyword_importance_curve(conversation, generator=generator, decay_factor=0.8)
+    keywords = curve.keywords
+    assert keywords and curve.scores.shape == (len(curve.turns), len(keywords))
+
+    # Then each row is what a tracker reports after that turn
+    turns, counts = count_turn_keywords(conversation, keywords, generator)
+    tracker = KeywordTracker()
+    for row, turn_counts in enumerate(counts):
+        tracker.update_keywords({k: c for k, c in zip(keywords, turn_counts) if c}, decay_factor=0.8)
+        assert curve.scores[row] == pytest.approx([tracker.get_importance(k) for k in keywords])
+
+    # And trajectories and per-turn rankings read the matrix
+    assert curve.trajectory(keywords[0]) == pytest.approx(curve.scores[:, 0])
+    top = curve.top_keywords(len(turns) - 1, n=3)
+    assert [score for _, score in top] == sorted((score for _, score in top), reverse=True)
+
+    phrase_curve = keyword_importance_curve("USER: the connection pool\nASSISTANT: Connection pool size",
+                                            keywords=["connection pool", "size"], generator=generator)
+    assert phrase_curve.scores == pytest.approx(np.array([[1.0, 0.0], [1.9, 1.0]]))
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
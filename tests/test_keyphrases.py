@@ -0,0 +1,79 @@
+"""
+Tests for TextRank keyphrase ranking
+"""
+import os
+import pytest
+from conversation_extractor import KeywordGenerator, load_conversation, extract_topics
+
+np = pytest.importorskip("numpy")
+from conversation_extractor.keyphrases import textrank_scores, rank_keyphrases, extract_keyphrases  # noqa: E402
+
+
+SAMPLE_FILE = os.path.join(os.path.dirname(__file__), "data", "coding_buddy_conversation.txt")
+
+
+def test_textrank_scores():
+    """
+    FEATURE: TextRank power iteration
+
+    Test that well connected words score highest and words in other sentences are not linked.
+    """
+    # Given "hub" linked to three words, and an isolated word in its own sentence
+    ids = np.array([1, 0, 2, 0, 3, 4])
+    sentence_ids = np.array([0, 0, 0, 0, 0, 1])
+
+    scores = textrank_scores(ids, sentence_ids, 5)
+
+    # Then the hub leads and the isolated word keeps the base score
+    assert scores.argmax() == 0
+    assert scores[4] == pytest.approx(0.15)
+    assert scores[:4].sum() == pytest.approx(4.0, rel=1e-3)
+
+
+def test_rank_keyphrases():
+    """
+    FEATURE: Multi-word keyphrases
+
+    Test that phrases are broken at stopwords and punctuation and ranked by their words' scores.
+    """
+    words = [
+        ["the", "connection", "pool", "times", "out"],
+        ["increase", "the", "connection", "pool", "size", "."],
+        ["connection", "pool", "settings", "matter"],
+    ]
+    ranked = rank_keyphrases(words, {"the", "out"})
+    phrases = [phrase for phrase, _ in ranked]
+
+    assert "connection pool times" in phrases
+    assert "connection pool size" in phrases
+    assert "increase" in phrases
+    assert all(a[1] >= b[1] for a, b in zip(ranked, ranked[1:]))
+
+    # And the threshold, count and existing keywords limit the extracted phrases
+    extracted = extract_keyphrases(words, {"the", "out"}, existing_keywords=["Increase"], threshold=0.0, n=3)
+    assert len(extracted) == 3 and "increase" not in extracted
+    assert extract_keyphrases([], set()) == []
+
+
+def test_keyword_generator_textrank():
+    """
+    FEATURE: TextRank keyword method
+
+    Test that the TextRank method plugs into keyword generation and topic extraction.
+    """
+    conversation = load_conversation(SAMPLE_FILE)
+    generator = KeywordGenerator(tokenizer="fast", method="textrank")
+
+    keywords = generator.generate(conversation, threshold=0.2)
+    assert generator.config["method"] == "textrank"
+    assert any(" " in keyword for keyword in keywords), "Should find multi-word keyphrases"
+
+    results = extract_topics(conversation, keyword_generator=generator, threshold=0.2)
+    assert "Dynamic Topics" in results
+
+    with pytest.raises(ValueError):
+        KeywordGenerator(method="unknown")
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,543 @@
+"""
+Tests for the keyword tracker
+"""
+import json
+import time
+import random
+import multiprocessing
+from collections import Counter
+import pytest
+from conversation_extractor import KeywordTracker, KeywordSnapshot, SQLiteKeywordTracker
+
+
+def eager_scores(updates):
+    """Apply updates the original way, decaying every keyword on each update."""
+    scores = {}
+    for keyword, increment, decay_factor in updates:
+        for k in scores:
+            scores[k] *= decay_factor
+        scores[keyword] = scores.get(keyword, 0.0) + increment
+    return scores
+
+
+def random_updates(count, seed=7, decay_factors=(0.9,)):
+    """Generate random (keyword, increment, decay_factor) updates."""
+    rng = random.Random(seed)
+    return [(f"kw{rng.randrange(50)}", rng.uniform(0.1, 2.0), rng.choice(decay_factors)) for _ in range(count)]
+
+
+def test_lazy_decay_matches_eager_decay():
+    """
+    FEATURE: O(1) lazy decay
+
+    Test that lazily decayed scores equal decaying every keyword on every update, across renormalizations.
+    """
+    # Given enough updates for the global scale to be renormalized several times
+    updates = random_updates(5000, decay_factors=(0.9, 0.5, 1.0))
+
+    # When we apply them to a tracker
+    tracker = KeywordTracker()
+    for keyword, increment, decay_factor in updates:
+        tracker.update_keyword(keyword, increment, decay_factor)
+
+    # Then scores and ranking match the eager computation
+    expected = eager_scores(updates)
+    assert tracker.keywords == pytest.approx(expected, rel=1e-9, abs=1e-300)
+    top = tracker.get_top_keywords(10)
+    assert [k for k, _ in top] == [k for k, _ in sorted(expected.items(), key=lambda x: x[1], reverse=True)[:10]]
+    assert tracker.get_importance(top[0][0]) == pytest.approx(top[0][1])
+    assert tracker.get_importance("missing") == 0.0
+
+
+def test_zero_decay_resets_scores():
+    """
+    FEATURE: Full decay
+
+    Test that a decay factor of zero clears earlier importance without breaking later updates.
+    """
+    tracker = KeywordTracker()
+    tracker.update_keyword("Python", 1.0)
+    tracker.update_keyword("Flask", 2.0, decay_factor=0.0)
+    tracker.update_keyword("Flask", 1.0)
+
+    assert tracker.keywords == pytest.approx({"Python": 0.0, "Flask": 2.8})
+    assert len(tracker) == 2 and "Python" in tracker
+
+
+def test_top_keywords_heap_matches_sort():
+    """
+    FEATURE: Heap-indexed top-k
+
+    Test that top-k reads from the keyword heap equal a stable sort of all scores, including ties.
+    """
+    # Given updates with tied increments, a negative increment and a full decay
+    tracker = KeywordTracker()
+    updates = [(f"kw{i % 40}", float(i % 3), 0.95) for i in range(400)]
+    updates += [("kw5", -10.0, 0.95), ("kw41", 1.0, 0.0), ("kw42", 1.0, 0.9), ("kw7", 1.0, 0.9)]
+    for keyword, increment, decay_factor in updates:
+        tracker.update_keyword(keyword, increment, decay_factor)
+        # Then every read matches sorting the whole map, ties in insertion order
+        expected = sorted(tracker.keywords.items(), key=lambda x: x[1], reverse=True)[:8]
+        assert tracker.get_top_keywords(8) == expected
+
+    # And asking for more keywords than are tracked returns them all
+    assert len(tracker.get_top_keywords(1000)) == len(tracker)
+    assert tracker.get_top_keywords(0) == []
+
+
+def test_update_keywords_batch(tmp_path):
+    """
+    FEATURE: Bulk keyword updates
+
+    Test batch and per-item decay semantics, Counter input and a single journal write per batch.
+    """
+    file_path = str(tmp_path / "keywords.json")
+    tracker = KeywordTracker(file_path)
+    tracker.update_keyword("Python", 1.0)
+
+    # When a batch is applied with one decay step
+    tracker.update_keywords(["Flask", "Python", "Flask"], decay_factor=0.5)
+
+    # Then earlier scores decay once and repeated keywords add up
+    assert tracker.keywords == pytest.approx({"Python": 1.5, "Flask": 2.0})
+    assert len(open(tracker.journal_file).read().splitlines()) == 1 + 1 + 2
+
+    # And Counter values scale the increment
+    tracker.update_keywords(Counter({"Django": 3}), importance_increment=0.5, decay_factor=1.0)
+    assert tracker.get_importance("Django") == pytest.approx(1.5)
+    assert KeywordTracker(file_path).keywords == pytest.approx(tracker.keywords)
+
+    # And per-item decay equals calling update_keyword for each item
+    updates = random_updates(50)
+    expected = KeywordTracker()
+    for keyword, _, _ in updates:
+        expected.update_keyword(keyword, 2.0, 0.8)
+    itemwise = KeywordTracker()
+    itemwise.update_keywords((keyword for keyword, _, _ in updates), 2.0, 0.8, decay="item")
+    assert itemwise.keywords == pytest.approx(expected.keywords)
+
+    # And the SQLite tracker applies batches the same way
+    with SQLiteKeywordTracker(str(tmp_path / "keywords.db")) as sqlite_tracker:
+        sqlite_tracker.update_keyword("Python", 1.0)
+        sqlite_tracker.update_keywords(["Flask", "Python", "Flask"], decay_factor=0.5)
+        assert sqlite_tracker.keywords == pytest.approx({"Python": 1.5, "Flask": 2.0})
+
+    with pytest.raises(ValueError):
+        tracker.update_keywords(["Flask"], decay="never")
+
+
+def test_merge_shards(tmp_path):
+    """
+    FEATURE: Mergeable tracker shards
+
+    Test that merging trackers of consecutive shards in order equals one tracker fed the whole stream.
+    """
+    # Given a stream split into three shards, each fed to its own tracker
+    updates = random_updates(3000, decay_factors=(0.9, 0.5, 1.0))
+    shards = [KeywordTracker() for _ in range(3)]
+    for i, (keyword, increment, decay_factor) in enumerate(updates):
+        shards[i * 3 // len(updates)].update_keyword(keyword, increment, decay_factor)
+
+    # When they are merged in order
+    merged = KeywordTracker.merge_all(shards)
+
+    # Then the scores and the ranking are those of the whole stream
+    assert merged.keywords == pytest.approx(eager_scores(updates), rel=1e-9, abs=1e-300)
+    expected = sorted(eager_scores(updates).items(), key=lambda x: x[1], reverse=True)[:5]
+    assert [k for k, _ in merged.get_top_keywords(5)] == [k for k, _ in expected]
+
+    # And an empty shard still carries its decay
+    empty = KeywordTracker()
+    empty.update_keywords([], decay_factor=0.5)
+    first = KeywordTracker()
+    first.update_keyword("Python", 1.0)
+    first.merge(empty)
+    assert first.keywords == {"Python": 0.5} and first.decay_product == pytest.approx(0.45)
+
+    # And the binary form round-trips scores and decay state
+    restored = KeywordTracker.from_bytes(merged.to_bytes())
+    assert restored.keywords == merged.keywords
+    assert restored.decay_product == merged.decay_product
+    assert restored.get_top_keywords(10) == merged.get_top_keywords(10)
+    with pytest.raises(ValueError):
+        KeywordTracker.from_bytes(b"CXKT")
+
+    # And merges into a persistent tracker are journaled
+    file_path = str(tmp_path / "keywords.json")
+    with KeywordTracker(file_path) as persistent:
+        persistent.merge(first)
+    assert KeywordTracker(file_path).keywords == {"Python": 0.5}
+
+
+class FakeClock:
+    """Clock that only moves when told to."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_half_life_decay(tmp_path):
+    """
+    FEATURE: Wall-clock half-life decay
+
+    Test that scores halve every half-life regardless of the number of updates, and decay on read.
+    """
+    clock = FakeClock()
+    file_path = str(tmp_path / "keywords.json")
+    tracker = KeywordTracker(file_path, half_life=60.0, clock=clock)
+
+    # Given a burst of updates at one instant
+    tracker.update_keyword("Python", 1.0)
+    tracker.update_keywords(["Flask"] * 100)
+    assert tracker.keywords == pytest.approx({"Python": 1.0, "Flask": 100.0})
+
+    # When a minute passes, then reads see half the importance without any update
+    clock.now += 60.0
+    assert tracker.get_importance("Flask") == pytest.approx(50.0)
+    tracker.update_keyword("Python", 1.0)
+    assert tracker.get_top_keywords(2) == pytest.approx([("Flask", 50.0), ("Python", 1.5)])
+    assert tracker.last_update("Python") == clock.now and tracker.last_update("Flask") == clock.now - 60.0
+
+    # And exports decay all scores at once to any time
+    keywords, scores = tracker.export_scores(now=clock.now + 120.0)
+    assert dict(zip(keywords, scores)) == pytest.approx({"Python": 0.375, "Flask": 12.5})
+
+    # And a reloaded tracker keeps decaying from the last update
+    tracker.compact()
+    tracker.update_keyword("Django", 2.0)
+    clock.now += 60.0
+    reloaded = KeywordTracker(file_path, half_life=60.0, clock=clock)
+    assert reloaded.keywords == pytest.approx({"Python": 0.75, "Flask": 25.0, "Django": 1.0})
+    assert reloaded.last_update("Django") == clock.now - 60.0
+
+
+def test_binary_snapshot(tmp_path):
+    """
+    FEATURE: Memory-mapped binary snapshots
+
+    Test that binary snapshots open lazily, answer lookups and top-k queries, and persist trackers.
+    """
+    # Given a tracker with non-ASCII keywords and tied scores
+    tracker = KeywordTracker()
+    for keyword, increment, decay_factor in random_updates(500):
+        tracker.update_keyword(keyword, increment, decay_factor)
+    tracker.update_keywords(["café", "naïve", "tie"], decay_factor=1.0)
+    snapshot_file = str(tmp_path / "keywords.bin")
+    tracker.save_binary(snapshot_file)
+
+    # When the snapshot is memory-mapped
+    with KeywordSnapshot.load(snapshot_file) as snapshot:
+        # Then it answers like the tracker, without loading every keyword
+        assert len(snapshot) == len(tracker)
+        assert "café" in snapshot and "cafe" not in snapshot
+        assert snapshot.get_importance("kw3") == tracker.get_importance("kw3")
+        assert snapshot.get_importance("missing") == 0.0
+        assert snapshot.get_top_keywords(10) == tracker.get_top_keywords(10)
+        assert snapshot.keywords == tracker.keywords
+        assert snapshot.to_tracker().get_top_keywords(600) == tracker.get_top_keywords(600)
+
+    # And half-life snapshots keep decaying on read
+    clock = FakeClock()
+    timed = KeywordTracker(half_life=10.0, clock=clock)
+    timed.update_keyword("Python", 4.0)
+    timed.save_binary(snapshot_file)
+    clock.now += 20.0
+    with KeywordSnapshot.load(snapshot_file, clock=clock) as snapshot:
+        assert snapshot.get_importance("Python") == pytest.approx(1.0)
+
+    # And persistent trackers can compact into binary snapshots
+    file_path = str(tmp_path / "keywords.dat")
+    with KeywordTracker(file_path, compact_every=10, snapshot_format="binary") as persistent:
+        for keyword, increment, decay_factor in random_updates(25):
+            persistent.update_keyword(keyword, increment, decay_factor)
+    assert open(file_path, "rb").read(4) == b"CXKT"
+    assert KeywordTracker(file_path).keywords == pytest.approx(eager_scores(random_updates(25)))
+
+    # And files in other formats are rejected
+    (tmp_path / "empty.bin").write_bytes(b"")
+    with pytest.raises(ValueError):
+        KeywordSnapshot.load(str(tmp_path / "empty.bin"))
+    with pytest.raises(ValueError):
+        KeywordSnapshot.load(file_path + ".journal")
+
+
+def test_write_behind_journal(tmp_path):
+    """
+    FEATURE: Write-behind persistence
+
+    Test that updates are buffered, journaled on flush and compacted into snapshots.
+    """
+    file_path = str(tmp_path / "keywords.json")
+    updates = random_updates(250)
+
+    # Given a tracker that flushes every 10 updates and compacts every 100 journaled updates
+    with KeywordTracker(file_path, flush_every=10, compact_every=100) as tracker:
+        for keyword, increment, decay_factor in updates[:5]:
+            tracker.update_keyword(keyword, increment, decay_factor)
+
+        # Then nothing is written until a flush is due
+        assert not (tmp_path / "keywords.json.journal").exists()
+
+        for keyword, increment, decay_factor in updates[5:]:
+            tracker.update_keyword(keyword, increment, decay_factor)
+
+    # And the snapshot plus the journal restore every update
+    with open(file_path) as f:
+        snapshot = json.load(f)
+    assert snapshot["format"] == 2 and snapshot["generation"] == 2
+    assert len(open(tracker.journal_file).read().splitlines()) == 1 + 50
+    assert KeywordTracker(file_path).keywords == pytest.approx(eager_scores(updates))
+
+
+def test_journal_recovery(tmp_path):
+    """
+    FEATURE: Crash-safe persistence
+
+    Test that a torn journal write and a journal left over from before a compaction are handled.
+    """
+    file_path = str(tmp_path / "keywords.json")
+
+    # Given a journal whose last write was cut short
+    tracker = KeywordTracker(file_path)
+    tracker.update_keyword("Python", 1.0)
+    tracker.update_keyword("Flask", 1.0)
+    with open(tracker.journal_file, "a") as f:
+        f.write('["Dja')
+
+    # Then the complete updates are recovered and later updates are journaled cleanly
+    recovered = KeywordTracker(file_path)
+    assert recovered.keywords == pytest.approx({"Python": 0.9, "Flask": 1.0})
+    recovered.update_keyword("Django", 1.0)
+    assert KeywordTracker(file_path).keywords == pytest.approx({"Python": 0.81, "Flask": 0.9, "Django": 1.0})
+
+    # And when a crash left the old journal behind a newer snapshot, it is not replayed twice
+    journal = open(tracker.journal_file).read()
+    recovered.compact()
+    with open(tracker.journal_file, "w") as f:
+        f.write(journal)
+    assert KeywordTracker(file_path).keywords == pytest.approx({"Python": 0.81, "Flask": 0.9, "Django": 1.0})
+
+    # And plain keyword dictionaries from older versions still load
+    with open(file_path, "w") as f:
+        json.dump({"Python": 2.0}, f)
+    (tmp_path / "keywords.json.journal").unlink()
+    assert KeywordTracker(file_path).keywords == {"Python": 2.0}
+
+
+def feed_shared_tracker(file_path, worker):
+    """Apply one worker's updates to a shared tracker."""
+    with KeywordTracker(file_path, flush_every=7, compact_every=50, shared=True) as tracker:
+        for keyword, _, _ in random_updates(200, seed=worker):
+            tracker.update_keyword(keyword, 1.0, decay_factor=1.0)
+
+
+def test_shared_tracker_merges_processes(tmp_path):
+    """
+    FEATURE: Multi-process shared tracker
+
+    Test that processes feeding one tracker file lose no updates and merge in flush order.
+    """
+    file_path = str(tmp_path / "keywords.json")
+
+    # Given two trackers on the same file, each with unflushed updates
+    first = KeywordTracker(file_path, flush_every=100, shared=True)
+    second = KeywordTracker(file_path, flush_every=100, shared=True)
+    first.update_keyword("Python", 1.0, decay_factor=0.5)
+    second.update_keyword("Flask", 1.0, decay_factor=0.5)
+
+    # When they flush one after the other
+    second.flush()
+    first.flush()
+    second.flush()
+
+    # Then both hold the updates in flush order
+    assert first.keywords == pytest.approx({"Flask": 0.5, "Python": 1.0})
+    assert second.keywords == pytest.approx(first.keywords)
+    assert KeywordTracker(file_path).keywords == pytest.approx(first.keywords)
+
+    # And trackers that each hold pending updates while the other flushes merge in flush order
+    interleaved_file = str(tmp_path / "interleaved.json")
+    trackers = [KeywordTracker(interleaved_file, flush_every=1000, shared=True) for _ in range(2)]
+    memory = KeywordTracker()
+    updates = random_updates(200, decay_factors=(0.9, 0.5, 1.0))
+    for i in range(0, len(updates), 10):
+        tracker = trackers[i // 10 % 2]
+        for update in updates[i:i + 10]:
+            tracker.update_keyword(*update)
+            memory.update_keyword(*update)
+        tracker.flush()
+    trackers[0].flush()
+    for tracker in trackers:
+        assert tracker.keywords == pytest.approx(memory.keywords)
+        assert tracker.decay_product == pytest.approx(memory.decay_product)
+    assert KeywordTracker(interleaved_file).keywords == pytest.approx(memory.keywords)
+
+    # And concurrent processes that compact the journal lose no update
+    shared_file = str(tmp_path / "shared.json")
+    processes = [multiprocessing.Process(target=feed_shared_tracker, args=(shared_file, worker)) for worker in range(3)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    expected = Counter(keyword for worker in range(3) for keyword, _, _ in random_updates(200, seed=worker))
+    assert KeywordTracker(shared_file).keywords == pytest.approx(dict(expected))
+
+    with pytest.raises(ValueError):
+        KeywordTracker(shared=True)
+
+
+def test_shared_tracker_with_half_life(tmp_path):
+    """
+    FEATURE: Multi-process shared tracker with time decay
+
+    Test that shared trackers decay other processes' updates by the time between them, whatever the flush order.
+    """
+    file_path = str(tmp_path / "keywords.json")
+    now = [0.0]
+
+    def clock():
+        return now[0]
+
+    # Given two shared trackers with a half-life of 10 seconds
+    first = KeywordTracker(file_path, shared=True, half_life=10, clock=clock)
+    second = KeywordTracker(file_path, shared=True, half_life=10, clock=clock)
+
+    # When the first updates "x" at t=0 and the second updates "y" at t=10
+    first.update_keyword("x")
+    first.flush()
+    now[0] = 10.0
+    second.update_keyword("y")
+    second.flush()
+    first.flush()
+
+    # Then every view decays "x" by the time between the two updates
+    for tracker in (first, second, KeywordTracker(file_path, half_life=10, clock=clock)):
+        assert tracker.keywords == pytest.approx({"x": 0.5, "y": 1.0})
+
+    # And updates flushed out of time order (x at t=12 after y at t=15) decay by their times
+    now[0] = 12.0
+    first.update_keyword("x")
+    now[0] = 15.0
+    second.update_keyword("y")
+    second.flush()
+    first.flush()
+    second.flush()
+    for tracker in (first, second, KeywordTracker(file_path, half_life=10, clock=clock)):
+        assert tracker.keywords == pytest.approx({"x": 0.5 ** 0.3 + 0.5 ** 1.5, "y": 1.0 + 0.5 ** 0.5})
+        assert tracker.last_update("x") == 12.0
+
+
+def feed_shared_tracker_defaults(file_path, worker):
+    """Apply one worker's updates to a shared tracker with the default flush policy."""
+    with KeywordTracker(file_path, shared=True) as tracker:
+        for keyword, _, _ in random_updates(2000, seed=worker):
+            tracker.update_keyword(keyword, 1.0, decay_factor=1.0)
+
+
+def test_shared_tracker_throughput(tmp_path):
+    """
+    FEATURE: Multi-process shared tracker throughput
+
+    Test that processes feeding one tracker file with the default settings finish quickly and lose no update.
+    """
+    file_path = str(tmp_path / "keywords.json")
+
+    # Given four processes applying 2000 updates each
+    started = time.monotonic()
+    processes = [multiprocessing.Process(target=feed_shared_tracker_defaults, args=(file_path, worker))
+                 for worker in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    # Then they finish in seconds and every update is counted
+    assert time.monotonic() - started < 30
+    expected = Counter(keyword for worker in range(4) for keyword, _, _ in random_updates(2000, seed=worker))
+    assert KeywordTracker(file_path).keywords == pytest.approx(dict(expected))
+
+
+def test_sqlite_tracker(tmp_path):
+    """
+    FEATURE: SQLite tracker storage
+
+    Test that the SQLite tracker scores like the in-memory tracker, persists and answers top-k from its index.
+    """
+    database_file = str(tmp_path / "keywords.db")
+    updates = random_updates(3000, decay_factors=(0.9, 0.5, 1.0))
+
+    # Given the same updates applied to both trackers, in batches of 100
+    memory = KeywordTracker()
+    with SQLiteKeywordTracker(database_file, batch_size=100) as tracker:
+        for keyword, increment, decay_factor in updates:
+            memory.update_keyword(keyword, increment, decay_factor)
+            tracker.update_keyword(keyword, increment, decay_factor)
+
+        # Then the scores and the top keywords agree
+        assert tracker.keywords == pytest.approx(memory.keywords, rel=1e-9, abs=1e-300)
+        assert [k for k, _ in tracker.get_top_keywords(10)] == [k for k, _ in memory.get_top_keywords(10)]
+
+        # And top-k queries scan the score index instead of sorting
+        plan = tracker._connection.execute(
+            "EXPLAIN QUERY PLAN SELECT keyword, sign, log_raw FROM keywords "
+            "ORDER BY sign DESC, (sign * log_raw) DESC, rowid LIMIT 10"
+        ).fetchall()
+        assert "keywords_by_score" in str(plan) and "TEMP B-TREE" not in str(plan)
+
+    # And a reopened database continues where it left off
+    with SQLiteKeywordTracker(database_file) as reopened:
+        assert len(reopened) == len(memory)
+        reopened.update_keyword("new", 1.0)
+        memory.update_keyword("new", 1.0)
+        assert "new" in reopened
+        assert reopened.get_importance(updates[-1][0]) == pytest.approx(memory.get_importance(updates[-1][0]))
+        # And an empty batch still decays the scores, like the in-memory tracker
+        reopened.update_keywords([], decay_factor=0.5)
+        memory.update_keywords([], decay_factor=0.5)
+        assert None not in reopened
+        assert reopened.get_importance("new") == pytest.approx(memory.get_importance("new"))
+
+        top, expected = reopened.get_top_keywords(5), memory.get_top_keywords(5)
+        assert [k for k, _ in top] == [k for k, _ in expected]
+        assert [v for _, v in top] == pytest.approx([v for _, v in expected])
+
+
+
+def test_sqlite_tracker_never_rewrites_rows(tmp_path):
+    """
+    FEATURE: SQLite tracker log-space scale
+
+    Test that decaying far beyond the range of a float scale never rewrites every row.
+    """
+    memory = KeywordTracker()
+    statements = []
+
+    with SQLiteKeywordTracker(str(tmp_path / "keywords.db"), batch_size=100) as tracker:
+        tracker._connection.set_trace_callback(statements.append)
+
+        # When 5000 updates decay the scores by 0.5 each (a scale of 2 ** -5000)
+        for i in range(5000):
+            memory.update_keyword(f"keyword{i % 50}", 1.0, 0.5)
+            tracker.update_keyword(f"keyword{i % 50}", 1.0, 0.5)
+
+        # Then the in-memory tracker renormalized but no statement rewrote every row
+        assert not any(statement.lstrip().upper().startswith("UPDATE KEYWORDS") for statement in statements)
+        assert tracker.keywords == pytest.approx(memory.keywords, rel=1e-9)
+        top, expected = tracker.get_top_keywords(5), memory.get_top_keywords(5)
+        assert [k for k, _ in top] == [k for k, _ in expected]
+
+        # And negative and zero decay factors still apply
+        for decay_factor in (-0.5, 0.0, 0.9):
+            memory.update_keyword("flask", 2.0, decay_factor)
+            tracker.update_keyword("flask", 2.0, decay_factor)
+            assert tracker.keywords == pytest.approx(memory.keywords, rel=1e-9)
+            assert tracker.get_top_keywords(1)[0][0] == memory.get_top_keywords(1)[0][0]
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,118 @@
+"""
+Tests for bounded-memory heavy hitter keyword mining
+"""
+import os
+import pytest
+from collections import Counter
+from conversation_extractor import KeywordGenerator, load_conversation
+from conversation_extractor.extractor import find_conversation_files
+from conversation_extractor.sketches import (
+    CountMinSketch,
+    SpaceSaving,
+    HeavyHitterKeywordMiner,
+    mine_corpus_keywords
+)
+
+
+SAMPLE_FILE = os.path.join(os.path.dirname(__file__), "data", "coding_buddy_conversation.txt")
+
+# A skewed stream: "a" is a heavy hitter among many rare items
+STREAM = ["a"] * 50 + ["b"] * 20 + [f"rare{i}" for i in range(100)] + ["a"] * 30
+
+
+def test_count_min_sketch():
+    """
+    FEATURE: Count-Min frequency estimates
+
+    Test that estimates never undercount and that merged sketches add up.
+    """
+    # Given two sketches over halves of the stream
+    first, second = CountMinSketch.from_error(0.01, 0.01), CountMinSketch.from_error(0.01, 0.01)
+    for item in STREAM[:85]:
+        first.add(item)
+    for item in STREAM[85:]:
+        second.add(item)
+    first.merge(second)
+
+    # Then estimates are upper bounds within the error bound
+    exact = Counter(STREAM)
+    for item, count in exact.items():
+        assert count <= first.estimate(item) <= count + 0.01 * len(STREAM)
+    assert first.total == len(STREAM)
+
+    # And sketches of different sizes cannot be merged
+    with pytest.raises(ValueError):
+        first.merge(CountMinSketch(10, 2))
+
+
+def test_space_saving():
+    """
+    FEATURE: Space-Saving heavy hitters
+
+    Test that heavy hitters are kept in bounded memory, also after merging.
+    """
+    # Given a small summary over the skewed stream
+    summary = SpaceSaving(capacity=10)
+    for item in STREAM:
+        summary.add(item)
+
+    # Then memory stays bounded and the heavy hitters lead with upper-bound counts
+    assert len(summary.counts) == 10
+    top = summary.most_common(2)
+    assert [item for item, _ in top] == ["a", "b"]
+    assert top[0][1] >= 80 and top[0][1] - summary.errors["a"] <= 80
+
+    # And merged summaries keep the heavy hitters of both parts
+    other = SpaceSaving(capacity=10)
+    for item in ["c"] * 200:
+        other.add(item)
+    summary.merge(other)
+    assert summary.most_common(1)[0][0] == "c"
+    assert "a" in summary.counts
+    assert summary.total == len(STREAM) + 200
+
+
+def test_heavy_hitter_miner_matches_exact_keywords():
+    """
+    FEATURE: Streaming keyword mining
+
+    Test that the miner returns the same keywords as generate_dynamic_keywords when nothing is evicted.
+    """
+    # Given a conversation and a generator
+    conversation = load_conversation(SAMPLE_FILE)
+    generator = KeywordGenerator(tokenizer="fast")
+
+    # When we mine it with ample capacity
+    miner = HeavyHitterKeywordMiner(threshold=0.05, generator=generator)
+    miner.feed(conversation)
+
+    # Then single words and marker words match the exact generator
+    expected = generator.generate(conversation, threshold=0.05)
+    assert {k for k in miner.keywords() if " " not in k} == {k for k in expected if " " not in k}
+
+
+def test_mine_corpus_keywords_parallel(tmp_path):
+    """
+    FEATURE: Mergeable corpus mining
+
+    Test that mining a directory in parallel merges to the same keywords as mining it serially.
+    """
+    # Given a directory of conversation files
+    conversation = load_conversation(SAMPLE_FILE)
+    for i in range(4):
+        (tmp_path / f"conversation_{i}.txt").write_text(conversation, encoding="utf-8")
+    file_paths = list(find_conversation_files([str(tmp_path)]))
+    generator = KeywordGenerator(tokenizer="fast")
+
+    # When we mine serially and in parallel
+    serial = mine_corpus_keywords(file_paths, threshold=0.05, generator=generator, files_per_task=1)
+    parallel = mine_corpus_keywords(file_paths, threshold=0.05, generator=generator, workers=2, files_per_task=1)
+
+    # Then both give the same ranked keywords
+    assert serial.documents == parallel.documents == 4
+    assert serial.keywords() == parallel.keywords()
+    assert len(serial.keywords()) > 5
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
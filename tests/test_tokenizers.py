@@ -0,0 +1,156 @@
+"""
+Tests for the NLTK-free fast tokenizer
+"""
+import os
+import pickle
+import pytest
+from conversation_extractor import KeywordGenerator, load_conversation, dynamic_keywords
+from conversation_extractor.tokenizers import FastTokenizer, split_chunks
+
+
+CHAT = """USER: How do I read a CSV? I tried pandas.read_csv already!
+ASSISTANT: Here's an example from https://pandas.pydata.org/docs/index.html that works.
+
+```python
+import pandas as pd
+df = pd.read_csv("data.csv")
+```
+
+USER: Thanks, that's what I didn't get."""
+
+
+def test_fast_sentence_tokenize():
+    """
+    FEATURE: Chat-aware sentence splitting
+
+    Test that speaker labels are removed, code lines stay separate and dotted names are not split.
+    """
+    sentences = FastTokenizer().sent_tokenize(CHAT)
+
+    assert sentences == [
+        "How do I read a CSV?",
+        "I tried pandas.read_csv already!",
+        "Here's an example from https://pandas.pydata.org/docs/index.html that works.",
+        "import pandas as pd",
+        'df = pd.read_csv("data.csv")',
+        "Thanks, that's what I didn't get.",
+    ]
+
+
+def test_fast_word_tokenize():
+    """
+    FEATURE: Chat-aware word splitting
+
+    Test that URLs and dotted names stay whole and contractions are split like NLTK's word_tokenize.
+    """
+    tokenizer = FastTokenizer()
+
+    assert tokenizer.word_tokenize("See https://example.com/a.b?c=1 now") == \
+        ["See", "https://example.com/a.b?c=1", "now"]
+    assert tokenizer.word_tokenize("Read https://x.org/a. Or (https://x.org/b), then stop") == \
+        ["Read", "https://x.org/a", ".", "Or", "(", "https://x.org/b", ")", ",", "then", "stop"]
+    assert tokenizer.word_tokenize("Edit app.py and call os.path.join.") == \
+        ["Edit", "app.py", "and", "call", "os.path.join", "."]
+    assert tokenizer.word_tokenize("I didn't know it's here.") == \
+        ["I", "did", "n't", "know", "it", "'s", "here", "."]
+
+
+def test_importance_labels_are_kept():
+    """
+    FEATURE: Importance marker labels
+
+    Test that labels like "IMPORTANT:" survive tokenization so the sentences they mark are boosted.
+    """
+    text = "USER: hi there.\nIMPORTANT: always close files.\nContext managers handle cleanup automatically."
+
+    # Speaker labels are removed, importance labels are kept when asked for
+    assert FastTokenizer().sent_tokenize(text)[1] == "always close files."
+    assert FastTokenizer(keep_labels=["important"]).sent_tokenize(text)[:2] == \
+        ["hi there.", "IMPORTANT: always close files."]
+
+    # And the fast backend finds the marked keywords like the default backend
+    keywords = KeywordGenerator(tokenizer="fast").generate(text, threshold=5)
+    assert sorted(keywords) == ["Context", "automatically", "cleanup", "handle", "managers"]
+
+
+def test_keyword_generator_fast_backend():
+    """
+    FEATURE: Selectable tokenizer backend
+
+    Test that the fast backend generates keywords without NLTK tokenizer data.
+    """
+    # Given a real conversation
+    sample_file = os.path.join(os.path.dirname(__file__), "data", "coding_buddy_conversation.txt")
+    conversation = load_conversation(sample_file)
+
+    # When we generate keywords with the fast tokenizer
+    generator = KeywordGenerator(tokenizer="fast")
+    keywords = generator.generate(conversation, threshold=0.05)
+
+    # Then we get keywords and the backend is reported
+    assert generator.config == {"tokenizer": "fast"}
+    assert len(keywords) > 5, "Should generate keywords with the fast tokenizer"
+
+    # And unknown backends are rejected
+    with pytest.raises(ValueError):
+        KeywordGenerator(tokenizer="unknown")
+
+
+def test_split_chunks():
+    """
+    FEATURE: Chunking for parallel tokenization
+
+    Test that chunks end at speaker turns or blank lines, never inside code blocks, and join back into the text.
+    """
+    chunks = list(split_chunks(CHAT, chunk_size=10))
+
+    assert "".join(chunks) == CHAT
+    assert chunks[0] == "USER: How do I read a CSV? I tried pandas.read_csv already!\n"
+    assert any(chunk.lstrip().startswith("```python") and chunk.rstrip().endswith("```") for chunk in chunks), \
+        "Code blocks should stay in one chunk"
+    assert list(split_chunks(CHAT)) == [CHAT]
+
+
+def test_parallel_tokenize(monkeypatch):
+    """
+    FEATURE: Parallel tokenization
+
+    Test that tokenizing chunks in a process pool gives the same sentences, words and keywords in order.
+    """
+    # Given a long conversation
+    text = load_conversation(os.path.join(os.path.dirname(__file__), "data", "coding_buddy_conversation.txt")) * 3
+
+    # When we tokenize it serially and with two workers
+    serial = KeywordGenerator(tokenizer="fast")
+    parallel = KeywordGenerator(tokenizer="fast", workers=2, chunk_size=2000)
+
+    # Then the results are identical
+    assert parallel.tokenize(text) == serial.tokenize(text)
+    assert list(parallel.iter_sentences(text)) == list(zip(*serial.tokenize(text)))
+    assert set(parallel.generate(text, threshold=0.05)) == set(serial.generate(text, threshold=0.05))
+
+    # And every call reuses the generator's process pool until it is closed
+    executor = parallel._executor
+    assert executor is not None
+    parallel.tokenize(text)
+    assert parallel._executor is executor
+    parallel.close()
+    assert parallel._executor is None
+
+    # And since chunking cannot change fast tokenizer results, the cache configuration ignores it,
+    # while backends whose sentences can span chunk boundaries record the chunk size
+    assert parallel.config == serial.config
+    chunked = KeywordGenerator(tokenizer="auto", workers=2, chunk_size=2000)
+    assert chunked.config["chunk_size"] == 2000
+    assert chunked.config != KeywordGenerator(tokenizer="auto").config
+
+    # And copies sent to worker processes keep the configuration and chunking, without starting pools
+    expected = chunked.tokenize(text)
+    copy = pickle.loads(pickle.dumps(chunked))
+    assert copy.config == chunked.config
+    monkeypatch.setattr(dynamic_keywords, "tokenize_parallel", None)
+    assert copy.tokenize(text) == expected
+    chunked.close()
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -7,6 +7,7 @@ import logging
 from conversation_extractor import (
     load_conversation, 
     extract_topics, 
+    extract_topics_batch,
     DEFAULT_TOPIC_CATEGORIES
 )
 
@@ -240,5 +241,85 @@ def test_topic_categorization(mixed_conversation):
     logger.info("✅ Successfully verified correct topic categorization")
 
 
+def test_extract_topics_deduplicates_lines():
+    """
+    FEATURE: Line-level deduplication of topic matches
+    
+    Test that a line matched by several keywords of a category is reported once.
+    """
+    logger.info("Testing deduplication of topic matches by line")
+    
+    # Given: A line that matches several keywords of one category
+    conversation = "USER: My Flask API returns a bad HTTP response.\nASSISTANT: Check the Flask route."
+    categories = {"Web": ["Flask", "API", "HTTP", "response", "route"]}
+    
+    # When: We extract topics
+    topic_results = extract_topics(conversation, topic_categories=categories, context_lines=0,
+                                   enable_dynamic=False)
+    
+    # Then: Each line is reported once with all of its keywords
+    matches = topic_results["Web"]
+    logger.info(f"Found matches: {matches}")
+    assert [match.line_number for match in matches] == [0, 1], "Each line should be reported once"
+    assert matches[0].keywords == ["Flask", "API", "HTTP", "response"]
+    assert matches[1].keywords == ["Flask", "route"]
+    
+    # And: Matches still unpack as (keyword, matched_line, context)
+    keyword, matched_line, context = matches[0]
+    assert keyword == "Flask" and context == [matched_line]
+    assert matches[0] == (keyword, matched_line, context)
+
+    # And: Matches can be collected in sets
+    assert len(set(matches + matches)) == 2
+    
+    logger.info("✅ Successfully deduplicated topic matches by line")
+
+
+def test_extract_topics_batch(mixed_conversation, sample_file):
+    """
+    FEATURE: Batch topic extraction
+    
+    Test that batch extraction accepts texts and paths and matches extract_topics.
+    """
+    logger.info("Testing batch topic extraction over texts and paths")
+    
+    # Given: A mix of conversation texts and file paths
+    conversations = [mixed_conversation, sample_file, str(sample_file)]
+    
+    # When: We extract topics in a batch
+    batch_results = list(extract_topics_batch(conversations, context_lines=1, enable_dynamic=False))
+    
+    # Then: Each result should match a single extract_topics call
+    expected = extract_topics(mixed_conversation, context_lines=1, enable_dynamic=False)
+    logger.info(f"Batch produced {len(batch_results)} results")
+    assert len(batch_results) == 3, "Should yield one result per conversation"
+    for results in batch_results:
+        assert dict(results) == dict(expected), "Batch results should match extract_topics"
+    
+    logger.info("✅ Successfully extracted topics in a batch")
+
+
+def test_extract_topics_batch_with_workers(mixed_conversation, sample_file):
+    """
+    FEATURE: Parallel batch topic extraction
+    
+    Test that a process pool yields results in input order.
+    """
+    logger.info("Testing batch topic extraction with worker processes")
+    
+    # Given: Conversations with different topics
+    conversations = [mixed_conversation, "USER: How do I debug this traceback?", sample_file] * 3
+    
+    # When: We extract topics with and without worker processes
+    serial = list(extract_topics_batch(conversations, enable_dynamic=False))
+    parallel = list(extract_topics_batch(conversations, enable_dynamic=False, workers=2, max_pending=2))
+    
+    # Then: The results should be identical and in input order
+    assert [dict(r) for r in parallel] == [dict(r) for r in serial], "Parallel results should match serial results"
+    assert "Debugging" in parallel[1] and "Web Development" not in parallel[1]
+    
+    logger.info("✅ Successfully extracted topics with worker processes")
+
+
 if __name__ == "__main__":
     pytest.main(["-v", __file__])
@@ -0,0 +1,48 @@
+"""
+Tests for token interning and token ID stream counting
+"""
+import pytest
+from collections import Counter
+from conversation_extractor import vocabulary
+from conversation_extractor.vocabulary import Vocabulary, filter_ids, count_ids, count_id_bigrams
+from conversation_extractor.dynamic_keywords import count_ngrams
+
+
+TOKENS = "the flask app uses the flask route and the app logs the route".split()
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_id_stream_counts_match_counters(monkeypatch, use_numpy):
+    """
+    FEATURE: Counting over compact token ID streams
+
+    Test that interned streams give the same counts, in the same order, as Counters over the strings.
+    """
+    if not use_numpy:
+        monkeypatch.setattr(vocabulary, "np", None)
+    elif vocabulary.np is None:
+        pytest.skip("NumPy is not installed")
+
+    # Given an interned token stream
+    vocab = Vocabulary()
+    stream = vocab.encode(TOKENS)
+    assert stream.typecode == "I"
+    assert vocab.decode(stream) == TOKENS
+    assert vocab.get("flask") == 1 and vocab.get("missing") is None
+
+    # When we filter stopwords and count words and bigrams
+    filtered = filter_ids(stream, vocab.flags({"the", "and"}))
+    words = {vocab.tokens[i]: count for i, count in count_ids(filtered, len(vocab)).items()}
+    bigrams = {(vocab.tokens[a], vocab.tokens[b]): count
+               for (a, b), count in count_id_bigrams(stream, len(vocab)).items()}
+
+    # Then the counts and their order match counting the strings
+    expected = count_ngrams(TOKENS)
+    assert list(Counter(words).most_common()) == \
+        Counter(word for word in TOKENS if word not in {"the", "and"}).most_common()
+    assert list(bigrams.items()) == list(expected.bigrams.items())
+    assert len(filtered) == 8
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])